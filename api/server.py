@@ -0,0 +1,293 @@
+import asyncio
+import io
+import os
+from contextlib import asynccontextmanager
+from datetime import date
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI, File, HTTPException, UploadFile
+from pydantic import BaseModel, Field
+
+from core import artefacts
+from core.bunk_plan import bunk_plan_for_date, is_test_day, precompute_bunk_plan
+from core.forecast import forecast
+from core.priority import compute_priority
+from core.registry import default_registry
+from core.schedule import TIMETABLE_DAYS
+from core.skip_planner import skip_impact
+from utils.attendance_parser import parse_attendance
+from utils.pdf_reader import attendance_pdf_to_df
+from utils.schema import SchemaError, normalize_attendance
+from utils.subject_map import is_lab_subject, subject_name
+
+# ==============================
+# HEADLESS ATTENDANCE SERVICE
+# ==============================
+# Run locally with:
+#   uvicorn api.server:app --port 8000
+#
+# ATTENDWISE_API_CONCURRENCY   max requests computing at once (default: 4)
+
+MAX_CONCURRENCY = int(os.environ.get("ATTENDWISE_API_CONCURRENCY", "4"))
+
+
+# ==============================
+# REQUEST MODELS
+# ==============================
+
+class SubjectCounts(BaseModel):
+    code: str
+    attended: int = Field(ge=0)
+    total: int = Field(ge=0)
+
+
+class AttendanceRequest(BaseModel):
+    subjects: List[SubjectCounts]
+
+
+class CohortRequest(AttendanceRequest):
+    # programme / semester default to the app's cohort (core.artefacts)
+    programme: Optional[str] = None
+    semester: Optional[str] = None
+    group: str = "Group A"
+
+
+class SkipImpactRequest(CohortRequest):
+    from_date: date
+    till_date: date
+    skip_labs: bool = True
+
+
+class ForecastRequest(AttendanceRequest):
+    steps: int = Field(default=15, ge=1, le=200)
+
+
+class BunkPlanRequest(CohortRequest):
+    day: date
+    start: Optional[date] = None
+
+
+# ==============================
+# HELPERS
+# ==============================
+
+def attendance_frame(subjects):
+    """
+    JSON counts → the parsed attendance layout (code, total, attended, percent).
+    """
+
+    att = pd.DataFrame(
+        [s.model_dump() for s in subjects],
+        columns=["code", "total", "attended"]
+    )
+
+    try:
+        return normalize_attendance(att)
+    except SchemaError as error:
+        raise HTTPException(422, str(error))
+
+
+def parse_upload(filename, data):
+    """
+    Attendance Excel/PDF bytes → parsed attendance frame.
+    """
+
+    if not filename.endswith((".xlsx", ".pdf")):
+        raise HTTPException(415, "Unsupported file type. Upload Excel or Attendance PDF.")
+
+    try:
+        if filename.endswith(".xlsx"):
+            return parse_attendance(io.BytesIO(data))
+        return attendance_pdf_to_df(io.BytesIO(data))
+    except SchemaError as error:
+        raise HTTPException(422, f"Invalid attendance data: {error}")
+
+
+def records(df):
+    # float32 columns (utils.schema percentages) are widened and rounded
+    # back to their 2 decimals, so 83.33 is sent as 83.33 and not
+    # 83.33000183105469
+    df = df.assign(**{
+        column: df[column].astype(np.float64).round(2)
+        for column in df.columns[df.dtypes == np.float32]
+    })
+
+    # numpy scalars → plain Python values for the JSON encoder
+    return [
+        {key: (value.item() if isinstance(value, np.generic) else value) for key, value in row.items()}
+        for row in df.to_dict(orient="records")
+    ]
+
+
+def priority_table(att):
+    rows = []
+
+    for code, attended, total in att[["code", "attended", "total"]].itertuples(index=False):
+        subject = subject_name(code)
+        info = compute_priority(int(attended), int(total), is_lab_subject(code))
+
+        rows.append({
+            "code": code,
+            "subject": subject,
+            "percent": info["percent"],
+            "needed": info["needed"],
+            "bunk_budget": info["bunk_budget"],
+            "priority": info["priority"]
+        })
+
+    return rows
+
+
+def cohort_entry(programme, semester, group):
+    try:
+        return artefacts.cohort(group, programme, semester)
+    except KeyError:
+        raise HTTPException(404, f"Unknown cohort: {programme or 'default'} / {semester or 'default'} / {group}")
+
+
+# ==============================
+# APP
+# ==============================
+
+def create_app(max_concurrency=MAX_CONCURRENCY):
+    """
+    Builds the FastAPI app. Calendars and timetables come from the
+    shared cohort registry; the default cohort's groups are loaded at
+    startup and other cohorts on first request. CPU work runs in worker
+    threads behind a semaphore.
+    """
+
+    @asynccontextmanager
+    async def lifespan(app):
+        for group in artefacts.groups():
+            artefacts.cohort(group)
+        app.state.limit = asyncio.Semaphore(max_concurrency)
+        yield
+
+    app = FastAPI(title="AttendWise", lifespan=lifespan)
+
+    async def run(fn, *args):
+        async with app.state.limit:
+            return await asyncio.to_thread(fn, *args)
+
+    async def load_cohort(request):
+        # A registry miss reads files, so keep it off the event loop
+        return await run(cohort_entry, request.programme, request.semester, request.group)
+
+    @app.get("/health")
+    async def health():
+        programme, semester = artefacts.default_cohort()
+        return {
+            "status": "ok",
+            "default": {"programme": programme, "semester": semester},
+            "groups": artefacts.groups(),
+            "cohorts": [
+                {"programme": p, "semester": s, "group": g}
+                for p, s, g in default_registry().cohorts()
+            ],
+            "registry": default_registry().stats()
+        }
+
+    @app.get("/calendar")
+    async def calendar(group: str = "Group A", programme: Optional[str] = None, semester: Optional[str] = None):
+        cal = (await run(cohort_entry, programme, semester, group))["calendar"]
+        in_semester = (
+            (cal["dates"] >= np.datetime64(cal["SEMESTER_START"].date(), "D")) &
+            (cal["dates"] <= np.datetime64(cal["SEMESTER_END"].date(), "D"))
+        )
+
+        return [
+            {
+                "date": str(d),
+                "teaching": bool(t),
+                "timetable_day": TIMETABLE_DAYS[i] if i >= 0 else None
+            }
+            for d, t, i in zip(
+                cal["dates"][in_semester],
+                cal["teaching"][in_semester].tolist(),
+                cal["timetable_day"][in_semester].tolist()
+            )
+        ]
+
+    @app.post("/attendance/parse")
+    async def parse(file: UploadFile = File(...)):
+        att = await run(parse_upload, file.filename or "", await file.read())
+
+        if att.empty:
+            raise HTTPException(422, "Could not extract attendance data.")
+
+        return {"subjects": records(att)}
+
+    @app.post("/priority")
+    async def priority(request: AttendanceRequest):
+        return {"subjects": await run(priority_table, attendance_frame(request.subjects))}
+
+    @app.post("/priority/upload")
+    async def priority_upload(file: UploadFile = File(...)):
+        att = await run(parse_upload, file.filename or "", await file.read())
+
+        if att.empty:
+            raise HTTPException(422, "Could not extract attendance data.")
+
+        return {"subjects": await run(priority_table, att)}
+
+    @app.post("/skip-impact")
+    async def skip(request: SkipImpactRequest):
+        if request.from_date > request.till_date:
+            raise HTTPException(422, "from_date cannot be after till_date")
+
+        entry = await load_cohort(request)
+        result = await run(
+            skip_impact,
+            attendance_frame(request.subjects),
+            entry["timetable"],
+            request.from_date,
+            request.till_date,
+            request.skip_labs,
+            entry["calendar"]
+        )
+
+        return {
+            "academic_days": result["academic_days"],
+            "classes_skipped": result["classes_skipped"],
+            "subjects": records(result["table"])
+        }
+
+    @app.post("/forecast")
+    async def forecast_all(request: ForecastRequest):
+        # Subjects with no delivered classes have nothing to forecast from
+        def compute():
+            return {
+                s.code: forecast(s.attended, s.total, request.steps)
+                for s in request.subjects
+                if s.total > 0
+            }
+
+        return {"steps": request.steps, "forecast": await run(compute)}
+
+    @app.post("/bunk-plan")
+    async def bunk_plan(request: BunkPlanRequest):
+        att = attendance_frame(request.subjects)
+        start = request.start or request.day
+
+        if request.day < start:
+            raise HTTPException(422, "day cannot be before start")
+
+        entry = await load_cohort(request)
+        try:
+            plan = await run(precompute_bunk_plan, att, entry["timetable"], start, None, entry["calendar"])
+        except SchemaError as error:
+            raise HTTPException(422, f"Invalid timetable: {error}")
+
+        return {
+            "day": request.day.isoformat(),
+            "test_day": is_test_day(plan, request.day, entry["calendar"]),
+            "classes": bunk_plan_for_date(plan, request.day)
+        }
+
+    return app
+
+
+app = create_app()
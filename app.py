@@ -1,19 +1,21 @@
 import streamlit as st
 import pandas as pd
-import re
+import numpy as np
 import math
 import warnings
 import pytz
+import uuid
 from pathlib import Path
 
 from core.attendance_logic import bunk_allowed
 from core.budget import bunk_budget
 from core.warnings import warning
 from core.prediction import predict, group_weekly
-from utils.subject_map import SUBJECT_MAP
-from utils.pdf_reader import attendance_pdf_to_df
+from utils.subject_map import subject_name, subject_names, is_lab_subject
+from utils import perf, profiling, upload_jobs
+from utils.history_store import default_store as history_store
+from utils.schema import SchemaError
 from datetime import datetime
-from core.attendance_logic import get_subject_total_classes
 from PIL import Image
 from core.what_if import what_if
 from core.priority import compute_priority
@@ -22,9 +24,21 @@ from core.health import attendance_health_score
 from core.daily_verdict import daily_verdict
 from core.forecast import forecast
 from datetime import datetime, timedelta
-from collections import defaultdict
-from core.calendar_logic import get_effective_timetable_day, is_holiday
 from core.attendance_logic import get_day_subjects_from_timetable
+from core import artefacts
+from core.schedule import weekly_class_matrix, day_subject_counts
+from core.day_planner import simulate_day_plan, day_plan_impact, day_plan_trajectory, bulk_update, BULK_ACTIONS
+from core.skip_planner import skip_impact
+from core.recovery import recovery_dates
+from core.monte_carlo import remaining_schedule, monte_carlo_forecast, PERCENTILES
+from core.bunk_plan import precompute_bunk_plan, bunk_plan_for_date, is_test_day
+from core.planner_state import (
+    new_planner_state,
+    get_decisions,
+    set_decisions,
+    serialize_planner_state,
+    restore_planner_state
+)
 
 
 # -----------------------------
@@ -57,6 +71,29 @@ st.set_page_config(
     layout="wide"
 )
 
+# -----------------------------
+# Rerun Profiling (opt-in)
+# -----------------------------
+# ATTENDWISE_PROFILE=1 (or ?profile=1, if ATTENDWISE_PROFILE_ALLOW_QUERY=1)
+# profiles the whole script run.
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex[:12]
+
+if "profile_rerun" not in st.session_state:
+    st.session_state.profile_rerun = 0
+
+# A profiler still running here means the previous rerun ended in st.stop()
+if "active_profiler" in st.session_state:
+    st.session_state.last_profile = profiling.stop_profile(
+        st.session_state.pop("active_profiler"),
+        st.session_state.session_id,
+        st.session_state.profile_rerun
+    )
+
+if profiling.requested(st.query_params.get("profile")):
+    st.session_state.profile_rerun += 1
+    st.session_state.active_profiler = profiling.start_profile()
+
 # -----------------------------
 # Global CSS Loader
 # -----------------------------
@@ -85,6 +122,15 @@ if "attendance_file" not in st.session_state:
 if "group" not in st.session_state:
     st.session_state.group = None
 
+if "perf_history" not in st.session_state:
+    st.session_state.perf_history = perf.new_history()
+
+# Stage timers: ATTENDWISE_PERF=1 or ?perf=1
+perf.start_rerun(perf.ENV_ENABLED or st.query_params.get("perf") == "1")
+
+if "dayplanner_grid_version" not in st.session_state:
+    st.session_state.dayplanner_grid_version = 0
+
 
 # -----------------------------
 # Runtime Assets
@@ -94,31 +140,21 @@ warnings.filterwarnings("ignore", message="Could not get FontBBox")
 logo = Image.open("assets/logo.png")
 
 # -----------------------------
-# PERMANENT TIMETABLE LOADER
+# Helpers
 # -----------------------------
 
 @st.cache_data
-def load_timetables():
-    return {
-        "Group A": pd.read_excel("data/timetable_group_A.xlsx"),
-        "Group B": pd.read_excel("data/timetable_group_B.xlsx",)
-    }
-@st.cache_data
-def load_saturday_calendar():
-    df = pd.read_csv("data/saturday_teaching_days.csv")
-    df["Date"] = pd.to_datetime(df["Date"])
-    return df
+def cached_bunk_plan(att, timetable, start, group):
+    return precompute_bunk_plan(att, timetable, start, calendar=artefacts.cohort(group)["calendar"])
 
 
-# -----------------------------
-# Helpers
-# -----------------------------
+@st.cache_data
+def cached_monte_carlo(att, timetable, start, group):
+    schedule = remaining_schedule(att, timetable, start, calendar=artefacts.cohort(group)["calendar"])
+    result = monte_carlo_forecast(att["attended"], att["total"], schedule["counts"], n_paths=10_000, seed=0)
+    result["steps"] = schedule["steps"]
+    return result
 
-def extract_course_code(text):
-    if pd.isna(text):
-        return None
-    match = re.match(r"(25[A-Z]{3}-\d+)", str(text))
-    return match.group(1) if match else None
 
 def class_card(time, subject, verdict, percent, level):
     card_cls = {
@@ -139,44 +175,112 @@ def class_card(time, subject, verdict, percent, level):
     )
 
 
-def sync_holiday_attend_toggle(attend_key, holiday_key):
+def attendance_parse_job(att_file):
+    # One background parse per session, keyed by the uploaded file.
+    # A different file cancels the parse still in flight.
+    key = getattr(att_file, "file_id", None) or id(att_file)
+    job = st.session_state.get("parse_job")
+
+    if job is None or job.key != key:
+        job = upload_jobs.submit_parse(key, att_file.name, att_file.getvalue(), previous=job)
+        st.session_state.parse_job = job
+
+    return job
+
+
+@st.fragment(run_every=0.2)
+def parse_progress(job):
+    # Polled on its own; only this block reruns while the parse is in flight
+    if job.done():
+        st.rerun()
+
+    st.progress(job.progress, text=job.stage)
+
+
+def history_student():
+    # Attendance history is opt-in and tied to the signed-in account
+    # (st.login, set up under [auth] in .streamlit/secrets.toml), so a
+    # session can only ever see its own uploads
+    if not st.user.get("is_logged_in"):
+        return None
+    return st.user.get("email")
+
+
+def login_available():
+    try:
+        return "auth" in st.secrets
+    except FileNotFoundError:
+        return False
+
+
+def sync_holiday_attend_toggle(d):
+    # Copy the toggles into the stored decision for `d`.
     # Keep decisions consistent: holiday means no attendance on that day.
-    if st.session_state.get(holiday_key, False):
-        st.session_state[attend_key] = False
+    holiday = st.session_state[f"dayplanner_holiday_toggle_{d}"]
+    attend = st.session_state[f"dayplanner_attend_toggle_{d}"] and not holiday
+    store_planner_decisions([d], [attend], [holiday])
+
+
+PLANNER_WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+
+
+def planner_decisions(dates):
+    # Attend/holiday decisions for `dates` as two bool arrays.
+    return get_decisions(st.session_state.dayplanner_state, dates)
+
 
+def store_planner_decisions(dates, attend, holiday):
+    set_decisions(st.session_state.dayplanner_state, dates, attend, holiday)
 
-DAY_MAP = {
-    "Monday": "Mon",
-    "Tuesday": "Tue",
-    "Wednesday": "Wed",
-    "Thursday": "Thu",
-    "Friday": "Fri"
-}
 
-def saturday_classes_for_subject(subject_code, timetable, sat_calendar):
-    count = 0
+def restore_planner_upload():
+    plan_file = st.session_state.dayplanner_restore_file
+    if plan_file is None:
+        return
 
-    for _, row in sat_calendar.iterrows():
-        followed = row["Timetable Followed"]
+    current = st.session_state.dayplanner_state
 
-        # Skip test-only Saturdays
-        if "Test" in followed:
-            continue
+    try:
+        restored = restore_planner_state(plan_file.getvalue().decode("ascii"))
+    except (ValueError, UnicodeDecodeError):
+        st.session_state.dayplanner_restore_error = True
+        return
 
-        weekday = followed.split()[0]   # "Monday"
-        day_code = DAY_MAP.get(weekday)
+    # Only plans saved for this semester can be restored
+    if restored["start"] != current["start"] or len(restored["attend"]) != len(current["attend"]):
+        st.session_state.dayplanner_restore_error = True
+        return
 
-        if not day_code:
-            continue
+    st.session_state.dayplanner_state = restored
+    st.session_state.dayplanner_grid_version += 1
+
+
+def apply_planner_grid_edits(editor_key, dates):
+    # data_editor only reports row deltas; fold them into the decision state
+    # and start a fresh editor so stale deltas are never re-applied.
+    attend, holiday = planner_decisions(dates)
+
+    for row, changes in st.session_state[editor_key]["edited_rows"].items():
+        if "Attend" in changes:
+            attend[int(row)] = changes["Attend"]
+        if "Holiday" in changes:
+            holiday[int(row)] = changes["Holiday"]
+
+    store_planner_decisions(dates, attend, holiday)
+    st.session_state.dayplanner_grid_version += 1
+
+
+def apply_planner_bulk_action(dates):
+    # "All Fridays" -> 4, "Every day" -> None
+    day_label = st.session_state.dayplanner_bulk_day
+    weekday = None if day_label == "Every day" else PLANNER_WEEKDAYS.index(day_label[4:-1])
+
+    attend, holiday = planner_decisions(dates)
+    attend, holiday = bulk_update(dates, attend, holiday, weekday, st.session_state.dayplanner_bulk_action)
+    store_planner_decisions(dates, attend, holiday)
+    st.session_state.dayplanner_grid_version += 1
 
-        # If subject appears on that weekday, it gets a class
-        if not timetable[
-            (timetable["day"] == day_code) &
-            (timetable["code"] == subject_code)
-        ].empty:
-            count += 1
 
-    return count
 
 
 def setup_screen():
@@ -201,17 +305,32 @@ def setup_screen():
 
         group = st.selectbox(
             "Select group",
-            ["Group A", "Group B"]
+            artefacts.groups()
         )
 
         submitted = st.form_submit_button("Continue →", use_container_width=True)
 
+    student = history_student()
+
+    if student:
+        st.caption(f"Signed in as **{student}**. Your uploads are kept, so next time you can continue without one.")
+        if st.button("Sign out"):
+            st.logout()
+    elif login_available():
+        if st.button("Sign in to keep your attendance history"):
+            st.login()
+
     if submitted:
-        if attendance_file is None:
+        if attendance_file is None and not (student and not history_store().latest(student).empty):
             st.warning("Please select a file first.")
         else:
             st.session_state.attendance_file = attendance_file
             st.session_state.group = group
+
+            # Start parsing now so it overlaps with the rerun
+            if attendance_file is not None and upload_jobs.is_supported(attendance_file.name):
+                attendance_parse_job(attendance_file)
+
             st.session_state.setup_done = True
             st.rerun()
 
@@ -223,8 +342,19 @@ st.toast("Setup loaded from session", icon="✅")
     
 group = st.session_state.group
 att_file = st.session_state.attendance_file
-timetables = load_timetables()
-sat_calendar = load_saturday_calendar()
+student = history_student()
+
+# Every date range and calendar lookup follows the selected cohort's semester
+semester = artefacts.cohort(group)["calendar"]
+
+# Decisions are per day of one semester: start over when the setup
+# switches to a cohort with another calendar
+planner_key = (group, semester["SEMESTER_START"], semester["SEMESTER_END"], semester.get("hash"))
+
+if st.session_state.get("dayplanner_key") != planner_key:
+    st.session_state.dayplanner_state = new_planner_state(calendar=semester)
+    st.session_state.dayplanner_key = planner_key
+    st.session_state.dayplanner_grid_version += 1
 
 
 with st.sidebar:
@@ -250,7 +380,7 @@ with st.sidebar:
                 st.warning("Upload a timetable file to continue.")
                 st.stop()
         else:
-            timetable = timetables[group]
+            timetable = artefacts.raw_timetable(group)
 
         st.divider()
 
@@ -273,30 +403,41 @@ st.markdown("""
 # MAIN LOGIC
 # -----------------------------
 
-if att_file:
+if att_file or student:
 
     # -----------------------------
     # Attendance Parsing
     # -----------------------------
 
-    if att_file.name.endswith(".xlsx"):
-        att_raw = pd.read_excel(att_file, engine="openpyxl")
+    if att_file is None:
+        # Signed-in student without an upload: latest stored snapshot
+        with perf.stage("history"):
+            att = history_store().latest(student)
+    else:
+        if not upload_jobs.is_supported(att_file.name):
+            st.error("Unsupported file type. Upload Excel or Attendance PDF.")
+            st.stop()
 
-        att = att_raw[[
-            "Course Code",
-            "Eligible Delivered",
-            "Eligible Attended",
-            "Eligible Percentage"
-        ]].copy()
+        with perf.stage("parse"):
+            parse_job = attendance_parse_job(att_file)
 
-        att.columns = ["code", "total", "attended", "percent"]
+            if not parse_job.done():
+                # End this run; the fragment polls the job and reruns the app once it is done
+                parse_progress(parse_job)
+                st.stop()
 
-    elif att_file.name.endswith(".pdf"):
-        att = attendance_pdf_to_df(att_file)
+            try:
+                # Parsed once per upload; copy so later steps can't modify the stored frame
+                att = parse_job.result().copy()
+            except SchemaError as error:
+                st.error(f"The attendance file has invalid data: {error}")
+                st.stop()
 
-    else:
-        st.error("Unsupported file type. Upload Excel or Attendance PDF.")
-        st.stop()
+        # Keep the upload for next time (once per parsed file)
+        if student and not att.empty and st.session_state.get("history_ingested") != parse_job.key:
+            with perf.stage("history"):
+                history_store().ingest(student, att, att_file.getvalue(), now, att_file.name)
+            st.session_state.history_ingested = parse_job.key
 
     if att.empty:
         st.error(
@@ -305,26 +446,16 @@ if att_file:
         )
         st.stop()
 
+    # Subject name per attendance row, looked up once per rerun
+    att_subjects = subject_names(att["code"])
+
     # -----------------------------
     # Timetable Parsing (Permanent)
     # -----------------------------
 
-    time_raw = timetables[group]
-
-    days = ["Mon", "Tue", "Wed", "Thu", "Fri"]
-    schedule = []
-
-    for _, row in time_raw.iterrows():
-        for day in days:
-            code = extract_course_code(row.get(day))
-            if code:
-                schedule.append({
-                    "day": day,
-                    "time": row["Timing"],
-                    "code": code
-                })
-
-    timetable = pd.DataFrame(schedule)
+    # Parsed once per process and shared by all sessions (read-only)
+    with perf.stage("timetable"):
+        timetable = artefacts.group_timetable(group)
 
     # -----------------------------
     # Navigation Menu
@@ -339,10 +470,14 @@ if att_file:
             "📈 Attendance Forecast"
         ])
 
-    priority_rows = []
+        if student:
+            history = history_store().trend(student)
 
-    def classes_per_week(subject_code, timetable):
-        return timetable[timetable["code"] == subject_code].shape[0]
+            if len(history) > 1:
+                with st.expander("📈 Attendance history"):
+                    st.line_chart(history.rename(columns=dict(zip(history.columns, subject_names(history.columns)))))
+
+    priority_rows = []
 
     def friendly_status(priority):
         return {
@@ -352,77 +487,62 @@ if att_file:
             "Not Started": "🟢 Not Started"
         }.get(priority, priority)
 
-    for _, row in att.iterrows():
-        code = row["code"]
-        subject = SUBJECT_MAP.get(code, code)
+    perf.count("subjects", len(att))
 
-        attended = int(row["attended"])
-        total = int(row["total"])
+    with perf.stage("priority"):
+        # Exact date each subject gets back to 75% if every class is attended
+        recovery = recovery_dates(att, timetable, effective_date, calendar=semester)
 
-        is_lab = "lab" in subject.lower()
-        info = compute_priority(attended, total, is_lab)
+        for i, (_, row) in enumerate(att.iterrows()):
+            code = row["code"]
+            subject = subject_name(code)
 
-        # Days to recover (semester-calendar aware, includes Saturdays)
-        if isinstance(info["needed"], int) and info["needed"] > 0:
+            attended = int(row["attended"])
+            total = int(row["total"])
 
-            weekly_classes = classes_per_week(code, timetable)
+            is_lab = is_lab_subject(code)
+            info = compute_priority(attended, total, is_lab)
 
-            extra_saturday_classes = saturday_classes_for_subject(
-                code,
-                timetable,
-                sat_calendar
+            # UI-friendly recovery text
+            recovery_classes_ui = (
+                f"Attend {info['needed']} classes"
+                if isinstance(info["needed"], int) and info["needed"] > 0
+                else "—"
             )
 
-            total_classes_available = weekly_classes + extra_saturday_classes
-
-            if total_classes_available > 0:
-                weeks_needed = math.ceil(info["needed"] / total_classes_available)
-                days_needed = weeks_needed * 7
+            if not isinstance(info["needed"], int) or info["needed"] <= 0:
+                recovery_days_ui = "—"
+            elif recovery["reachable"][i]:
+                recovery_date = recovery["date"][i].item()
+                recovery_days_ui = f"{recovery['days'][i]} days (by {recovery_date:%d %b})"
             else:
-                days_needed = "—"
-
-        else:
-            days_needed = "—"
-
+                recovery_days_ui = "Unreachable this semester"
 
-        # UI-friendly recovery text
-        recovery_classes_ui = (
-            f"Attend {info['needed']} classes"
-            if isinstance(info["needed"], int) and info["needed"] > 0
-            else "—"
-        )
+            priority_rows.append({
+                "Subject": subject,
+                "Attendance %": round(info["percent"], 2),
 
-        recovery_days_ui = (
-            f"~{days_needed} days"
-            if isinstance(days_needed, int)
-            else "—"
-        )
-
-        priority_rows.append({
-            "Subject": subject,
-            "Attendance %": round(info["percent"], 2),
-
-            # internal logic
-            "Recovery Needed": info["needed"],
+                # internal logic
+                "Recovery Needed": info["needed"],
             
-            # UI
-            "Recovery (Classes)": recovery_classes_ui,
-            "Recovery (Days)": recovery_days_ui,
-            "Bunk Budget": (
-                info["bunk_budget"]
-                if isinstance(info["bunk_budget"], int)
-                else None
-            ),
-            "Priority": info["priority"],
-            "Status": friendly_status(info["priority"])
-        })
-
-    # Build dataframe
-    df_priority = pd.DataFrame(priority_rows)
-    # UI-only formatting for Bunk Budget
-    df_priority["Bunk Budget (UI)"] = df_priority["Bunk Budget"].apply(
-    lambda x: "∞" if pd.isna(x) else int(x)
-    )
+                # UI
+                "Recovery (Classes)": recovery_classes_ui,
+                "Recovery (Days)": recovery_days_ui,
+                "Bunk Budget": (
+                    info["bunk_budget"]
+                    if isinstance(info["bunk_budget"], int)
+                    else None
+                ),
+                "Priority": info["priority"],
+                "Status": friendly_status(info["priority"])
+            })
+
+        # Build dataframe
+        df_priority = pd.DataFrame(priority_rows)
+        # UI-only formatting for Bunk Budget
+        df_priority["Bunk Budget (UI)"] = df_priority["Bunk Budget"].apply(
+        lambda x: "∞" if pd.isna(x) else int(x)
+        )
 
 
 
@@ -432,7 +552,8 @@ if att_file:
         # -----------------------------
         
         # Calculate overall health
-        health = attendance_health_score(df_priority)
+        with perf.stage("health"):
+            health = attendance_health_score(df_priority)
         if health >= 85:
             status_cls, status_text = "status-safe", "Safe"
             health_msg = "You're on track."
@@ -489,64 +610,56 @@ f"""<div class="dash-card">
     <div class="card-title">Today's Smart Bunk Plan</div>""", unsafe_allow_html=True
             )
             
-            today_short = get_effective_timetable_day(effective_date)
-            if today_short is None:
-                st.markdown("<div class='msg-test-day'>📝 Today is a test day. No bunk decisions.</div>", unsafe_allow_html=True)
-            else:
-                today_rows = timetable[
-                    timetable["day"]
-                    .astype(str)
-                    .str.strip()
-                    .str.lower()
-                    .str.startswith(today_short)
-                ]
-
-                bunk_counter = defaultdict(int)
-
-                if today_rows.empty:
-                    st.markdown("<div class='msg-no-classes'>No classes scheduled 🎉</div>", unsafe_allow_html=True)
+            # Verdicts for every remaining day are precomputed once per upload
+            with perf.stage("bunk_plan"):
+                try:
+                    bunk_plan = cached_bunk_plan(att, timetable, effective_date, group)
+                except SchemaError as error:
+                    bunk_plan = None
+                    st.error(f"Could not build the bunk plan: {error}")
+
+            if bunk_plan is not None:
+                plan_date = st.date_input(
+                    "Plan for",
+                    value=effective_date,
+                    min_value=effective_date,
+                    max_value=max(effective_date, semester["SEMESTER_END"].date()),
+                    format="DD/MM/YYYY",
+                    key="bunk_plan_date"
+                )
+                day_label = "Today" if plan_date == effective_date else plan_date.strftime("%d/%m/%Y")
+
+                if is_test_day(bunk_plan, plan_date, semester):
+                    st.markdown(f"<div class='msg-test-day'>📝 {day_label} is a test day. No bunk decisions.</div>", unsafe_allow_html=True)
                 else:
-                    for _, row in today_rows.iterrows():
-                        code = row["code"]
-                        subject = SUBJECT_MAP.get(code, code)
-
-                        record = att[att["code"] == code]
-                        if record.empty:
-                            continue
-
-                        attended = int(record["attended"].values[0])
-                        delivered = int(record["total"].values[0])
-
-                        bunk_counter[code] += 1
-                        bunked_so_far = bunk_counter[code]
-
-                        if delivered > 0:
-                            bunk_percent = round((attended / (delivered + bunked_so_far)) * 100, 2)
-                        else:
-                            bunk_percent = 0.0
-
-                        if bunk_percent >= 80:
-                            status_text = "Safe Bunk"
-                            dot_cls = "dot-green"
-                            desc = f"Attendance drops to {bunk_percent}% if skipped."
-                        elif bunk_percent >= 75:
-                            status_text = "Risky"
-                            dot_cls = "dot-yellow"
-                            desc = f"Caution: Skipping drops you to {bunk_percent}%."
-                        else:
-                            status_text = "Critical"
-                            dot_cls = "dot-red"
-                            desc = f"Must attend! Skipping drops you to {bunk_percent}%."
-                            
-                        subj_short = (subject[:25] + '..') if len(subject) > 25 else subject
-
-                        st.markdown(
+                    plan_classes = bunk_plan_for_date(bunk_plan, plan_date)
+
+                    if not plan_classes:
+                        st.markdown("<div class='msg-no-classes'>No classes scheduled 🎉</div>", unsafe_allow_html=True)
+                    else:
+                        for cls in plan_classes:
+                            subject = subject_name(cls["code"])
+                            bunk_percent = cls["percent"]
+
+                            if cls["verdict"] == "Safe Bunk":
+                                dot_cls = "dot-green"
+                                desc = f"Attendance drops to {bunk_percent}% if skipped."
+                            elif cls["verdict"] == "Risky":
+                                dot_cls = "dot-yellow"
+                                desc = f"Caution: Skipping drops you to {bunk_percent}%."
+                            else:
+                                dot_cls = "dot-red"
+                                desc = f"Must attend! Skipping drops you to {bunk_percent}%."
+
+                            subj_short = (subject[:25] + '..') if len(subject) > 25 else subject
+
+                            st.markdown(
 f"""<div class="option-card">
-    <div class="option-title"><div class="option-dot {dot_cls}"></div>{row['time']} - {subj_short}</div>
+    <div class="option-title"><div class="option-dot {dot_cls}"></div>{cls['time']} - {subj_short}</div>
     <div class="option-desc">{desc}</div>
 </div>""", unsafe_allow_html=True
-                        )
-            
+                            )
+
             st.markdown("</div>", unsafe_allow_html=True)
 
     
@@ -707,89 +820,21 @@ f"""<div class="subject-row">
                     st.error("❌ From date cannot be after Till date.")
                     st.stop()
 
-                bunked_classes = defaultdict(int)
-                academic_days = 0
-
-                current_date = from_date
-
-                while current_date <= till_date:
-
-                    # Same resolution used in Smart Bunk
-                    day_short = get_effective_timetable_day(current_date)
-
-                    if day_short is not None:
-
-                        day_rows = timetable[
-                            timetable["day"]
-                            .astype(str)
-                            .str.strip()
-                            .str.lower()
-                            .str.startswith(day_short.lower())
-                        ]
-
-                        if not day_rows.empty:
-                            academic_days += 1
-
-                        for _, row in day_rows.iterrows():
-                            code = row["code"]
-                            subject_name = SUBJECT_MAP.get(code, code).lower()
+                with perf.stage("planner"):
+                    skip_result = skip_impact(att, timetable, from_date, till_date, skip_labs, calendar=semester)
 
-                            if not skip_labs and "lab" in subject_name:
-                                continue
-
-                            bunked_classes[code] += 1
-
-                    current_date += timedelta(days=1)
+                academic_days = skip_result["academic_days"]
 
                 # --- Output ---
                 if academic_days == 0:
                     st.info("📭 No academic classes fall within the selected date range.")
                 else:
-                    rows = []
-
-                    for code, bunk_count in bunked_classes.items():
-
-                        record = att[att["code"] == code]
-                        if record.empty:
-                            continue
-
-                        subject = SUBJECT_MAP.get(code, code)
-
-                        attended = int(record["attended"].values[0])
-                        delivered = int(record["total"].values[0])
-
-                        current_percent = (
-                            round((attended / delivered) * 100, 2)
-                            if delivered > 0 else 0
-                        )
-
-                        new_total = delivered + bunk_count
-                        new_percent = round((attended / new_total) * 100, 2)
-
-                        # Classes needed to recover to 75%
-                        if new_percent < 75:
-                            needed = math.ceil(
-                                (0.75 * new_total - attended) / (1 - 0.75)
-                            )
-                        else:
-                            needed = 0
-
-                        rows.append({
-                            "Subject": subject,
-                            "Current %": current_percent,
-                            "Classes Skipped": bunk_count,
-                            "After Skip %": new_percent,
-                            "Classes Needed for 75%": needed if needed > 0 else "—",
-                            "Status": "⚠️ Below 75%" if new_percent < 75 else "✅ Safe"
-                        })
-
-
-                    impact_df = pd.DataFrame(rows)
+                    impact_df = skip_result["table"]
 
                     # --- Summary ---
                     colA, colB, colC = st.columns(3)
                     colA.metric("📅 Days Skipped", academic_days)
-                    colB.metric("📚 Classes Skipped", sum(bunked_classes.values()))
+                    colB.metric("📚 Classes Skipped", skip_result["classes_skipped"])
                     colC.metric(
                         "⚠️ Subjects < 75%",
                         (impact_df["After Skip %"] < 75).sum()
@@ -832,257 +877,298 @@ f"""<div class="subject-row">
 </div>""", unsafe_allow_html=True
         )
 
-        col_left, col_right = st.columns([1.2, 1], gap="large")
+        @st.fragment
+        def day_planner(att, timetable, effective_date):
+            col_left, col_right = st.columns([1.2, 1], gap="large")
 
-        with col_left:
-            st.markdown(
+            with col_left:
+                st.markdown(
 """<div class="dash-card">
     <div class="card-title">Plan Your Days</div>""", unsafe_allow_html=True
-            )
+                )
 
-            # -----------------------------
-            # Date range selection
-            # -----------------------------
-            col1, col2 = st.columns(2)
+                # -----------------------------
+                # Date range selection
+                # -----------------------------
+                # Decisions are stored per semester day, so the range stays inside the semester.
+                semester_first = semester["SEMESTER_START"].date()
+                semester_last = semester["SEMESTER_END"].date()
+                planner_default = min(max(effective_date, semester_first), semester_last)
+
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    planner_from = st.date_input(
+                        "From date",
+                        value=planner_default,
+                        min_value=semester_first,
+                        max_value=semester_last,
+                        format="DD/MM/YYYY"
+                    )
 
-            with col1:
-                planner_from = st.date_input(
-                    "From date",
-                    value=effective_date,
-                    format="DD/MM/YYYY"
+                with col2:
+                    planner_till = st.date_input(
+                        "Till date",
+                        value=planner_default,
+                        min_value=semester_first,
+                        max_value=semester_last,
+                        format="DD/MM/YYYY"
+                    )
+
+                if planner_from > planner_till:
+                    st.error("❌ From date cannot be after Till date.")
+                    return
+
+                # -----------------------------
+                # Build date list
+                # -----------------------------
+                planner_dates = []
+                current = planner_from
+                while current <= planner_till:
+                    planner_dates.append(current)
+                    current += timedelta(days=1)
+
+                # -----------------------------
+                # Plan your days (UI)
+                # -----------------------------
+                planner_counts = day_subject_counts(
+                    planner_dates,
+                    weekly_class_matrix(timetable, att["code"].tolist()),
+                    calendar=semester
                 )
+                planner_academic = planner_counts.sum(axis=1) > 0
+                planner_attend, planner_holiday = planner_decisions(planner_dates)
 
-            with col2:
-                planner_till = st.date_input(
-                    "Till date",
-                    value=effective_date,
-                    format="DD/MM/YYYY"
+                # Large ranges default to the compact, paginated grid
+                compact_mode = st.toggle(
+                    "Compact mode (weekly pages)",
+                    value=len(planner_dates) > 14
                 )
 
-            if planner_from > planner_till:
-                st.error("❌ From date cannot be after Till date.")
-                st.stop()
+                # -----------------------------
+                # Bulk actions (whole range)
+                # -----------------------------
+                bulk_col1, bulk_col2, bulk_col3 = st.columns([2, 2, 1.5], vertical_alignment="bottom")
 
-            # -----------------------------
-            # Build date list
-            # -----------------------------
-            planner_dates = []
-            current = planner_from
-            while current <= planner_till:
-                planner_dates.append(current)
-                current += timedelta(days=1)
-
-            # -----------------------------
-            # Plan your days (UI)
-            # -----------------------------
-            day_decisions = {}
-            for d in planner_dates:
-                weekday = d.strftime("%a")  # Mon, Tue, Wed, Thu, Fri, Sat, Sun
-
-                # Use effective academic calendar day so working Saturdays are mapped correctly.
-                effective_day_short = get_effective_timetable_day(d)
-                if weekday == "Sun" or effective_day_short is None:
-                    is_academic = False
-                else:
-                    is_academic = not timetable[
-                        timetable["day"]
-                        .astype(str)
-                        .str.strip()
-                        .str.lower()
-                        .str.startswith(effective_day_short.lower())
-                    ].empty
-
-                is_weekend = weekday in ["Sat", "Sun"]
-                attend_key = f"dayplanner_attend_{d}"
-                holiday_key = f"dayplanner_holiday_{d}"
-                default_holiday = is_holiday(datetime.combine(d, datetime.min.time()))
-
-                if holiday_key not in st.session_state:
-                    st.session_state[holiday_key] = default_holiday
-                if attend_key not in st.session_state:
-                    st.session_state[attend_key] = not is_weekend
-                if st.session_state[holiday_key]:
-                    st.session_state[attend_key] = False
-
-                col_date, col_day, col_status, col_action = st.columns([2, 1, 2, 3])
-
-                with col_date:
-                    st.write(d.strftime("%d/%m/%Y"))
-
-                with col_day:
-                    st.write(weekday.upper())
-
-                with col_status:
-                    if is_academic:
-                        if st.session_state[holiday_key]:
-                            st.markdown(
-                                "<span class='planner-status-holiday'>Holiday</span>",
-                                unsafe_allow_html=True
-                            )
-                        else:
-                            st.markdown(
-                                "<span class='planner-status-academic'>Academic</span>",
-                                unsafe_allow_html=True
-                            )
-                    else:
-                        if weekday == "Sun":
-                            st.markdown(
-                                "<span class='planner-status-sun'>Sun</span>",
-                                unsafe_allow_html=True
-                            )
-                        else:
-                            st.markdown(
-                                "<span class='planner-status-none'>No Class</span>",
-                                unsafe_allow_html=True
-                            )
+                with bulk_col1:
+                    st.selectbox("Bulk action", BULK_ACTIONS, key="dayplanner_bulk_action")
 
-                with col_action:
-                    if is_academic:
-                        action_col1, action_col2 = st.columns(2)
+                with bulk_col2:
+                    st.selectbox(
+                        "On",
+                        ["Every day"] + [f"All {name}s" for name in PLANNER_WEEKDAYS],
+                        key="dayplanner_bulk_day"
+                    )
 
-                        with action_col1:
-                            attend = st.toggle(
-                                "Attend",
-                                key=attend_key,
-                                disabled=st.session_state[holiday_key]
-                            )
+                with bulk_col3:
+                    st.button(
+                        "Apply",
+                        use_container_width=True,
+                        on_click=apply_planner_bulk_action,
+                        args=(planner_dates,)
+                    )
 
-                        with action_col2:
-                            holiday_selected = st.toggle(
-                                "Holiday",
-                                key=holiday_key,
-                                on_change=sync_holiday_attend_toggle,
-                                args=(attend_key, holiday_key)
+                if compact_mode:
+                    # -----------------------------
+                    # Compact grid: one data_editor per page of weeks
+                    # -----------------------------
+                    weeks_per_page = 4
+                    week_starts = sorted({d - timedelta(days=d.weekday()) for d in planner_dates})
+                    page_count = math.ceil(len(week_starts) / weeks_per_page)
+
+                    page = 0
+                    if page_count > 1:
+                        page = st.select_slider(
+                            "Weeks",
+                            options=list(range(page_count)),
+                            format_func=lambda p: (
+                                f"{week_starts[p * weeks_per_page].strftime('%d/%m')} – "
+                                f"{(week_starts[min(len(week_starts), (p + 1) * weeks_per_page) - 1] + timedelta(days=6)).strftime('%d/%m')}"
                             )
+                        )
+
+                    page_from = week_starts[page * weeks_per_page]
+                    page_till = page_from + timedelta(weeks=weeks_per_page)
 
-                        day_decisions[d] = {
-                            "attend": attend,
-                            "holiday": holiday_selected
-                        }
+                    page_idx = [
+                        i for i, d in enumerate(planner_dates)
+                        if page_from <= d < page_till and planner_academic[i] and d.weekday() != 6
+                    ]
+                    page_dates = [planner_dates[i] for i in page_idx]
+
+                    if page_dates:
+                        page_attend, page_holiday = planner_decisions(page_dates)
+                        grid_key = f"dayplanner_grid_{page}_{st.session_state.dayplanner_grid_version}"
+
+                        st.data_editor(
+                            pd.DataFrame({
+                                "Date": [d.strftime("%d/%m/%Y") for d in page_dates],
+                                "Day": [d.strftime("%a").upper() for d in page_dates],
+                                "Classes": planner_counts[page_idx].sum(axis=1),
+                                "Attend": page_attend,
+                                "Holiday": page_holiday
+                            }),
+                            key=grid_key,
+                            on_change=apply_planner_grid_edits,
+                            args=(grid_key, page_dates),
+                            disabled=["Date", "Day", "Classes"],
+                            hide_index=True,
+                            use_container_width=True
+                        )
                     else:
-                        st.write("—")
+                        st.info("No academic days on this page.")
 
-            st.caption("🟢 Attend · 🔴 Skip · 🟡 Holiday (holiday days are excluded)")
+                else:
+                    for i, d in enumerate(planner_dates):
+                        weekday = d.strftime("%a")  # Mon, Tue, Wed, Thu, Fri, Sat, Sun
+
+                        # Academic = any class on the effective timetable day (working Saturdays mapped).
+                        is_academic = weekday != "Sun" and bool(planner_academic[i])
+
+                        # Toggles get their own keys so the stored decisions
+                        # survive while the toggles are not rendered.
+                        holiday_on = bool(planner_holiday[i])
+                        attend_key = f"dayplanner_attend_toggle_{d}"
+                        holiday_key = f"dayplanner_holiday_toggle_{d}"
+                        if is_academic:
+                            st.session_state[attend_key] = bool(planner_attend[i])
+                            st.session_state[holiday_key] = holiday_on
+
+                        col_date, col_day, col_status, col_action = st.columns([2, 1, 2, 3])
+
+                        with col_date:
+                            st.write(d.strftime("%d/%m/%Y"))
+
+                        with col_day:
+                            st.write(weekday.upper())
+
+                        with col_status:
+                            if is_academic:
+                                if holiday_on:
+                                    st.markdown(
+                                        "<span class='planner-status-holiday'>Holiday</span>",
+                                        unsafe_allow_html=True
+                                    )
+                                else:
+                                    st.markdown(
+                                        "<span class='planner-status-academic'>Academic</span>",
+                                        unsafe_allow_html=True
+                                    )
+                            else:
+                                if weekday == "Sun":
+                                    st.markdown(
+                                        "<span class='planner-status-sun'>Sun</span>",
+                                        unsafe_allow_html=True
+                                    )
+                                else:
+                                    st.markdown(
+                                        "<span class='planner-status-none'>No Class</span>",
+                                        unsafe_allow_html=True
+                                    )
+
+                        with col_action:
+                            if is_academic:
+                                action_col1, action_col2 = st.columns(2)
+
+                                with action_col1:
+                                    st.toggle(
+                                        "Attend",
+                                        key=attend_key,
+                                        disabled=holiday_on,
+                                        on_change=sync_holiday_attend_toggle,
+                                        args=(d,)
+                                    )
+
+                                with action_col2:
+                                    st.toggle(
+                                        "Holiday",
+                                        key=holiday_key,
+                                        on_change=sync_holiday_attend_toggle,
+                                        args=(d,)
+                                    )
+
+                            else:
+                                st.write("—")
+
+                st.caption("🟢 Attend · 🔴 Skip · 🟡 Holiday (holiday days are excluded)")
+
+                with st.expander("💾 Save / restore plan"):
+                    st.download_button(
+                        "⬇️ Download plan",
+                        serialize_planner_state(st.session_state.dayplanner_state),
+                        file_name="day_plan.txt",
+                        mime="text/plain"
+                    )
+                    st.file_uploader(
+                        "Restore plan",
+                        type=["txt"],
+                        key="dayplanner_restore_file",
+                        on_change=restore_planner_upload
+                    )
+                    if st.session_state.pop("dayplanner_restore_error", False):
+                        st.error("Could not restore this plan file for the current semester.")
             
-            # -----------------------------
-            # Simulation trigger
-            # -----------------------------
-            simulate_day_plan = st.button("📊 Simulate Attendance Impact", use_container_width=True)
-            st.markdown("</div>", unsafe_allow_html=True)
+                # -----------------------------
+                # Simulation trigger
+                # -----------------------------
+                run_day_plan = st.button("📊 Simulate Attendance Impact", use_container_width=True)
+                st.markdown("</div>", unsafe_allow_html=True)
 
-        with col_right:
-            st.markdown(
+            with col_right:
+                st.markdown(
 """<div class="dash-card">
     <div class="card-title">Attendance Impact</div>""", unsafe_allow_html=True
-            )
-            # -----------------------------
-            # Simulation logic
-            # -----------------------------
-            if simulate_day_plan:
-                attended_extra = defaultdict(int)
-                bunked_extra = defaultdict(int)
-
-                for d, decision in day_decisions.items():
-                    if decision["holiday"]:
-                        continue
-
-                    day_short = get_effective_timetable_day(d)
-                    if day_short is None:
-                        continue
-
-                    day_rows = timetable[
-                        timetable["day"]
-                        .astype(str)
-                        .str.strip()
-                        .str.lower()
-                        .str.startswith(day_short.lower())
-                    ]
-
-                    for _, row in day_rows.iterrows():
-                        code = row["code"]
-
-                        if decision["attend"]:
-                            attended_extra[code] += 1
-                        else:
-                            bunked_extra[code] += 1
-
+                )
                 # -----------------------------
-                # Build result table
+                # Simulation logic
                 # -----------------------------
-                rows = []
-                base_total_attended = 0
-                base_total_conducted = 0
-
-                for _, row in att.iterrows():
-
-                    code = row["code"]
-                    subject = SUBJECT_MAP.get(code, code)
-
-                    base_attended = int(row["attended"])
-                    base_total = int(row["total"])
-                    base_total_attended += base_attended
-                    base_total_conducted += base_total
-
-                    attended = base_attended + attended_extra.get(code, 0)
-                    total = base_total + attended_extra.get(code, 0) + bunked_extra.get(code, 0)
-
-                    percent = round((attended / total) * 100, 2) if total > 0 else 0
-
-                    # Classes needed to reach 75%
-                    if percent < 75:
-                        needed = math.ceil((0.75 * total - attended) / 0.25)
-                    else:
-                        needed = 0
-
-                    rows.append({
-                        "Subject": subject,
-                        "Attended (Planned)": attended_extra.get(code, 0),
-                        "Skipped (Planned)": bunked_extra.get(code, 0),
-                        "Final %": percent,
-                        "Classes Needed for 75%": needed if needed > 0 else "—",
-                        "Status": "⚠️ Below 75%" if percent < 75 else "✅ Safe"
-                    })
-
-                total_attended_planned = sum(attended_extra.values())
-                total_skipped_planned = sum(bunked_extra.values())
-                overall_attended = base_total_attended + total_attended_planned
-                overall_total = base_total_conducted + total_attended_planned + total_skipped_planned
-                overall_percent = round((overall_attended / overall_total) * 100, 2) if overall_total > 0 else 0
-                overall_needed = (
-                    math.ceil((0.75 * overall_total - overall_attended) / 0.25)
-                    if overall_percent < 75 else 0
-                )
+                if run_day_plan:
+                    # Decisions as two boolean vectors over the planner days
+                    attend_vec, holiday_vec = planner_decisions(planner_dates)
+
+                    with perf.stage("planner"):
+                        plan_result = simulate_day_plan(
+                            planner_counts,
+                            attend_vec,
+                            holiday_vec,
+                            att["attended"].to_numpy(dtype=int),
+                            att["total"].to_numpy(dtype=int)
+                        )
 
-                rows.append({
-                    "Subject": "Overall Attendance",
-                    "Attended (Planned)": total_attended_planned,
-                    "Skipped (Planned)": total_skipped_planned,
-                    "Final %": overall_percent,
-                    "Classes Needed for 75%": overall_needed if overall_needed > 0 else "—",
-                    "Status": "⚠️ Below 75%" if overall_percent < 75 else "✅ Safe"
-                })
+                        # -----------------------------
+                        # Build result table
+                        # -----------------------------
+                        result_df = day_plan_impact(att, plan_result)
 
-                result_df = pd.DataFrame(rows)
+                    # -----------------------------
+                    # Highlight risky subjects
+                    # -----------------------------
+                    def highlight(row):
+                        return (
+                            ["background-color: #3b0a0a"] * len(row)
+                            if row["Final %"] < 75
+                            else ["" for _ in row]
+                        )
 
-                # -----------------------------
-                # Highlight risky subjects
-                # -----------------------------
-                def highlight(row):
-                    return (
-                        ["background-color: #3b0a0a"] * len(row)
-                        if row["Final %"] < 75
-                        else ["" for _ in row]
+                    st.dataframe(
+                        result_df.style.apply(highlight, axis=1),
+                        use_container_width=True,
+                        hide_index=True
                     )
 
-                st.dataframe(
-                    result_df.style.apply(highlight, axis=1),
-                    use_container_width=True,
-                    hide_index=True
-                )
-            else:
-                st.info("Configure your day plan and click 'Simulate Attendance Impact' to see the results.")
+                    # -----------------------------
+                    # Day-by-day trajectory
+                    # -----------------------------
+                    st.line_chart(day_plan_trajectory(att, planner_dates, plan_result))
+                    st.caption("📈 Cumulative attendance % after each planned day (holidays keep it flat).")
+                else:
+                    st.info("Configure your day plan and click 'Simulate Attendance Impact' to see the results.")
                 
-            st.markdown("</div>", unsafe_allow_html=True)
+                st.markdown("</div>", unsafe_allow_html=True)
+
+        # Widgets inside a fragment rerun only the fragment, not the parse/priority above
+        with perf.stage("day_planner"):
+            day_planner(att, timetable, effective_date)
 
     elif current_page == "🔮 What-If Attendance":
         # -----------------------------
@@ -1096,66 +1182,71 @@ f"""<div class="subject-row">
 </div>""", unsafe_allow_html=True
         )
 
-        col_left, col_right = st.columns([1, 1], gap="large")
+        @st.fragment
+        def what_if_page(att, att_subjects):
+            col_left, col_right = st.columns([1, 1], gap="large")
         
-        with col_left:
-            st.markdown(
+            with col_left:
+                st.markdown(
 """<div class="dash-card">
     <div class="card-title">Configuration</div>""", unsafe_allow_html=True
-            )
+                )
             
-            w_subj = st.selectbox(
-                "Choose Subject",
-                att["code"].map(lambda x: SUBJECT_MAP.get(x, x)).unique()
-            )
+                w_subj = st.selectbox(
+                    "Choose Subject",
+                    pd.unique(att_subjects)
+                )
 
-            w_row = att[att["code"].map(lambda x: SUBJECT_MAP.get(x, x)) == w_subj].iloc[0]
+                w_row = att[att_subjects == w_subj].iloc[0]
 
-            w_attended = int(w_row["attended"])
-            w_total = int(w_row["total"])
+                w_attended = int(w_row["attended"])
+                w_total = int(w_row["total"])
 
-            w_col1, w_col2 = st.columns(2)
+                w_col1, w_col2 = st.columns(2)
 
-            with w_col1:
-                attend_more = st.number_input(
-                    "Attend next classes",
-                    min_value=0,
-                    step=1
-                )
+                with w_col1:
+                    attend_more = st.number_input(
+                        "Attend next classes",
+                        min_value=0,
+                        step=1
+                    )
 
-            with w_col2:
-                bunk_more = st.number_input(
-                    "Bunk next classes",
-                    min_value=0,
-                    step=1
-                )
-            st.markdown("</div>", unsafe_allow_html=True)
+                with w_col2:
+                    bunk_more = st.number_input(
+                        "Bunk next classes",
+                        min_value=0,
+                        step=1
+                    )
+                st.markdown("</div>", unsafe_allow_html=True)
 
-        with col_right:
-            st.markdown(
+            with col_right:
+                st.markdown(
 """<div class="dash-card">
     <div class="card-title">Forecast Result</div>""", unsafe_allow_html=True
-            )
-
-            w_result = what_if(w_attended, w_total, attend_more, bunk_more)
-            w_cls = "whatif-safe" if "Safe" in w_result["status"] else "whatif-warn" if "Risky" in w_result["status"] else "whatif-crit"
+                )
 
-            st.markdown(f"""
-            <div class="whatif-result {w_cls}">
-                <div class="whatif-label">Projected Attendance</div>
-                <div class="whatif-percent">{w_result['percent']}%</div>
-                <div class="whatif-status">Status: {w_result['status']}</div>
-            </div>
-            """, unsafe_allow_html=True)
+                w_result = what_if(w_attended, w_total, attend_more, bunk_more)
+                w_cls = "whatif-safe" if "Safe" in w_result["status"] else "whatif-warn" if "Risky" in w_result["status"] else "whatif-crit"
 
-            if w_result["needed"] is not None and w_result["needed"] > 0:
                 st.markdown(f"""
-                <div class="whatif-needed">
-                    ⚠️ You must legitimately attend <b>{w_result['needed']} consecutive classes</b> from now to reach 75%.
+                <div class="whatif-result {w_cls}">
+                    <div class="whatif-label">Projected Attendance</div>
+                    <div class="whatif-percent">{w_result['percent']}%</div>
+                    <div class="whatif-status">Status: {w_result['status']}</div>
                 </div>
                 """, unsafe_allow_html=True)
+
+                if w_result["needed"] is not None and w_result["needed"] > 0:
+                    st.markdown(f"""
+                    <div class="whatif-needed">
+                        ⚠️ You must legitimately attend <b>{w_result['needed']} consecutive classes</b> from now to reach 75%.
+                    </div>
+                    """, unsafe_allow_html=True)
                 
-            st.markdown("</div>", unsafe_allow_html=True)
+                st.markdown("</div>", unsafe_allow_html=True)
+
+        with perf.stage("what_if"):
+            what_if_page(att, att_subjects)
         
     elif current_page == "📈 Attendance Forecast":
         # -----------------------------
@@ -1169,69 +1260,112 @@ f"""<div class="subject-row">
 </div>""", unsafe_allow_html=True
         )
 
-        col_left, col_right = st.columns([1, 2], gap="large")
+        @st.fragment
+        def forecast_page(att, att_subjects, timetable, group, effective_date):
+            col_left, col_right = st.columns([1, 2], gap="large")
 
-        with col_left:
-            st.markdown(
+            with col_left:
+                st.markdown(
 """<div class="dash-card">
     <div class="card-title">Configuration</div>""", unsafe_allow_html=True
-            )
+                )
 
-            subject = st.selectbox(
-                "Select subject for forecast",
-                att["code"].map(lambda x: SUBJECT_MAP.get(x, x)).unique(),
-                key="forecast_subject"
-            )
+                subject = st.selectbox(
+                    "Select subject for forecast",
+                    pd.unique(att_subjects),
+                    key="forecast_subject"
+                )
 
-            # Get subject code
-            row_att = att[att["code"].map(lambda x: SUBJECT_MAP.get(x, x)) == subject].iloc[0]
-            row_code = row_att["code"]
+                # Get subject code
+                row_att = att[att_subjects == subject].iloc[0]
+                row_code = row_att["code"]
 
-            attended = int(row_att["attended"])
-            conducted = int(row_att["total"])
+                attended = int(row_att["attended"])
+                conducted = int(row_att["total"])
 
-            # Semester-aware total classes
-            semester_total = get_subject_total_classes(
-                row_code,
-                timetable
-            )
+                # Semester-aware total classes
+                semester_total = artefacts.subject_totals(group).get(row_code)
 
-            remaining_classes = max(0, semester_total - conducted)
+                remaining_classes = max(0, semester_total - conducted)
 
-            if remaining_classes == 0:
-                st.info("No future classes left for this subject 📭")
-                steps = 0
-            else:
-                steps = st.slider(
-                    "Future classes to simulate",
-                    min_value=1,
-                    max_value=remaining_classes,
-                    value=min(15, remaining_classes)
+                mode = st.radio(
+                    "Forecast mode",
+                    ["Scenarios", "Probabilistic (Monte Carlo)"],
+                    key="forecast_mode",
+                    help="Probabilistic mode simulates 10,000 semesters from your attendance so far."
                 )
 
-            st.markdown("</div>", unsafe_allow_html=True)
+                if mode != "Scenarios":
+                    steps = 0
+                elif remaining_classes == 0:
+                    st.info("No future classes left for this subject 📭")
+                    steps = 0
+                else:
+                    steps = st.slider(
+                        "Future classes to simulate",
+                        min_value=1,
+                        max_value=remaining_classes,
+                        value=min(15, remaining_classes)
+                    )
 
-        with col_right:
-            st.markdown(
+                st.markdown("</div>", unsafe_allow_html=True)
+
+            with col_right:
+                st.markdown(
 """<div class="dash-card">
     <div class="card-title">Forecast Trend</div>""", unsafe_allow_html=True
-            )
+                )
 
-            if remaining_classes > 0 and steps > 0:
-                data = forecast(attended, conducted, steps)
+                if mode != "Scenarios":
+                    with perf.stage("monte_carlo"):
+                        mc = cached_monte_carlo(att, timetable, effective_date, group)
 
-                chart_df = pd.DataFrame({
-                    "Attend All": data["attend_all"],
-                    "Strategic": data["strategic"],
-                    "Bunk All": data["bunk_all"]
-                })
+                    i = att.index.get_loc(row_att.name)
+                    median = PERCENTILES.index(50)
 
-                st.line_chart(chart_df)
-                st.caption("⚠️ The simulation assumes the target minimum attendance is 75%. Keep your trajectory above the danger threshold.")
-            else:
-                st.write("No projection available.")
+                    m1, m2 = st.columns(2)
+                    m1.metric("Chance of ending below 75%", f"{mc['p_below'][i]:.0%}")
+                    m2.metric("Any subject below 75%", f"{mc['p_any_below']:.0%}")
+
+                    if len(mc["steps"]):
+                        bands_df = pd.DataFrame(
+                            {f"P{q}": mc["bands"][k, :, i] for k, q in enumerate(PERCENTILES)},
+                            index=pd.to_datetime(mc["steps"])
+                        )
+                        st.line_chart(bands_df)
+
+                    st.dataframe(
+                        pd.DataFrame({
+                            "Subject": att_subjects,
+                            "Attendance rate": np.round(mc["propensity"] * 100, 1),
+                            "Median final %": np.round(mc["final"][median], 1),
+                            f"P{PERCENTILES[0]}–P{PERCENTILES[-1]} final %": [
+                                f"{lo:.1f} – {hi:.1f}" for lo, hi in zip(mc["final"][0], mc["final"][-1])
+                            ],
+                            "P(below 75%)": np.round(mc["p_below"] * 100, 1)
+                        }),
+                        use_container_width=True,
+                        hide_index=True
+                    )
+                    st.caption("🎲 Each simulated semester follows the real remaining timetable and calendar, attending each class at the rate your history suggests. Bands are percentiles of attendance % week by week.")
+                elif remaining_classes > 0 and steps > 0:
+                    data = forecast(attended, conducted, steps)
+
+                    chart_df = pd.DataFrame({
+                        "Attend All": data["attend_all"],
+                        "Strategic": data["strategic"],
+                        "Bunk All": data["bunk_all"]
+                    })
+
+                    st.line_chart(chart_df)
+                    st.caption("⚠️ The simulation assumes the target minimum attendance is 75%. Keep your trajectory above the danger threshold.")
+                else:
+                    st.write("No projection available.")
                 
-            st.markdown("</div>", unsafe_allow_html=True)
+                st.markdown("</div>", unsafe_allow_html=True)
+
+        with perf.stage("forecast"):
+            forecast_page(att, att_subjects, timetable, group, effective_date)
 
 
 # -----------------------------
@@ -1243,3 +1377,38 @@ st.markdown("""
     <p>&copy; 2026 Akshat N & Akshat D. All rights reserved.</p>
 </div>
 """, unsafe_allow_html=True)
+
+
+# -----------------------------
+# Performance Panel (opt-in)
+# -----------------------------
+
+if perf.finish_rerun(st.session_state.perf_history, st.session_state.session_id):
+    with st.sidebar.expander("⏱️ Performance", expanded=True):
+        st.caption("Wall time per stage: this rerun and rolling p50/p95.")
+        st.dataframe(
+            perf.summarize(st.session_state.perf_history),
+            use_container_width=True,
+            hide_index=True
+        )
+
+
+# -----------------------------
+# Rerun Profile (opt-in)
+# -----------------------------
+
+if "active_profiler" in st.session_state:
+    st.session_state.last_profile = profiling.stop_profile(
+        st.session_state.pop("active_profiler"),
+        st.session_state.session_id,
+        st.session_state.profile_rerun
+    )
+
+if st.session_state.get("last_profile") and Path(st.session_state.last_profile).exists():
+    with st.sidebar:
+        st.download_button(
+            "⬇️ Download profile",
+            Path(st.session_state.last_profile).read_bytes(),
+            file_name=Path(st.session_state.last_profile).name,
+            key="download_profile"
+        )
@@ -0,0 +1,116 @@
+"""
+Interaction latency of the Streamlit pages, driven headless with AppTest.
+
+AppTest always reruns the whole script; it cannot rerun a fragment on
+its own. The times reported at the end of the run (utils.perf rerun
+totals) are therefore full-rerun costs, not what a fragment-scoped
+rerun costs in the browser.
+"""
+
+import io
+from datetime import timedelta
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from benchmarks import synthetic
+from benchmarks.conftest import ROOT
+from core import artefacts
+
+APP = str(ROOT / "app.py")
+GROUP = "Group A"
+ROUNDS = 5
+
+
+class _Upload(io.BytesIO):
+    name = "attendance.xlsx"
+
+
+def _app(page):
+    codes = list(dict.fromkeys(artefacts.group_timetable(GROUP)["code"]))
+
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.query_params["perf"] = "1"
+    at.session_state["setup_done"] = True
+    at.session_state["group"] = GROUP
+    at.session_state["attendance_file"] = _Upload(synthetic.attendance_xlsx(codes=codes))
+    at.run()
+
+    # The first run ends while the upload is parsed in the background.
+    # AppTest does not run the progress fragment's timer, so wait for
+    # the parse and rerun the way that fragment would.
+    at.session_state["parse_job"].result()
+    at.run()
+
+    [navigation] = [radio for radio in at.sidebar.radio if radio.label == "Navigation"]
+    navigation.set_value(page).run()
+    return at
+
+
+class _Counted:
+    """
+    Wraps an interaction and counts calls, so the report picks exactly
+    the reruns pytest-benchmark timed (one when benchmarks are disabled).
+    """
+
+    def __init__(self, interact):
+        self.interact = interact
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        self.interact()
+
+
+def _report(latency_report, at, interaction, counted):
+    records = list(at.session_state["perf_history"])[-counted.calls:]
+    latency_report.append((interaction, sorted(record["total"] * 1000 for record in records)))
+
+
+def bench_day_planner_toggle(benchmark, latency_report):
+    at = _app("🗓️ Day Planner")
+
+    # One week, one toggle per academic day
+    start = at.date_input[0].value
+    at.date_input[1].set_value(start + timedelta(days=6)).run()
+    toggle = next(t for t in at.toggle if t.key and t.key.startswith("dayplanner_attend_toggle_"))
+    key = toggle.key
+
+    def interact():
+        current = at.toggle(key=key)
+        current.set_value(not current.value).run()
+
+    counted = _Counted(interact)
+    benchmark.pedantic(counted, rounds=ROUNDS)
+    assert not at.exception
+    _report(latency_report, at, "Day Planner toggle", counted)
+
+
+def bench_what_if_input(benchmark, latency_report):
+    at = _app("🔮 What-If Attendance")
+
+    def interact():
+        at.number_input[0].increment().run()
+
+    counted = _Counted(interact)
+    benchmark.pedantic(counted, rounds=ROUNDS)
+    assert not at.exception
+    _report(latency_report, at, "What-If input", counted)
+
+
+@pytest.mark.parametrize("mode", ["Scenarios", "Probabilistic (Monte Carlo)"])
+def bench_forecast_subject(benchmark, latency_report, mode):
+    at = _app("📈 Attendance Forecast")
+    at.radio(key="forecast_mode").set_value(mode).run()
+    subjects = at.selectbox(key="forecast_subject").options
+
+    state = {"i": 0}
+
+    def interact():
+        state["i"] += 1
+        at.selectbox(key="forecast_subject").set_value(subjects[state["i"] % len(subjects)]).run()
+
+    counted = _Counted(interact)
+    benchmark.pedantic(counted, rounds=ROUNDS)
+    assert not at.exception
+    _report(latency_report, at, f"Forecast subject ({mode})", counted)
@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from core.attendance_logic import calculate_total_classes_datewise, get_subject_total_classes
+from core.calendar_logic import build_calendar, get_all_teaching_days
+from core.recompute import CohortViews
+
+
+def bench_get_all_teaching_days(benchmark, semester):
+    days = benchmark(get_all_teaching_days)
+    assert days
+
+
+def bench_calculate_total_classes_datewise(benchmark, semester, timetable):
+    totals = benchmark(calculate_total_classes_datewise, timetable)
+    assert totals
+
+
+def bench_get_subject_total_classes(benchmark, semester, timetable):
+    code = timetable["code"].iloc[0]
+    total = benchmark(get_subject_total_classes, code, timetable)
+    assert total > 0
+
+
+def bench_cohort_views_add_holiday(benchmark, n_students, semester, timetable):
+    # One new holiday mid-semester, patched into an existing cohort's views
+    codes = list(pd.unique(timetable["code"]))
+    rng = np.random.default_rng(0)
+    total = rng.integers(10, 60, (n_students, len(codes)))
+    attended = (total * rng.uniform(0.5, 1.0, total.shape)).astype(int)
+
+    old = build_calendar(semester)
+    holiday = (semester["SEMESTER_START"] + timedelta(weeks=8, days=2)).strftime("%Y-%m-%d")
+    new = build_calendar(dict(semester, HOLIDAYS=semester["HOLIDAYS"] | {holiday}))
+
+    def setup():
+        views = CohortViews(codes, attended, total, timetable, old, semester["SEMESTER_START"].date())
+        return (views, new), {}
+
+    result = benchmark.pedantic(CohortViews.apply_change, setup=setup, rounds=5)
+    assert len(result["cells"]) > 0
@@ -0,0 +1,229 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks import synthetic
+from core.bunk_plan import precompute_bunk_plan, slot_subject_matrix
+from core.daily_verdict import DAY_VERDICTS, at_risk_report, daily_verdict, daily_verdicts, status_codes
+from core.day_planner import simulate_day_plan
+from core.forecast import forecast
+from core.health import attendance_health_score
+from core.monte_carlo import cohort_below_probability, monte_carlo_forecast, remaining_schedule
+from core.prediction import group_weekly, group_weekly_index
+from core.priority import compute_priority
+from core.risk_model import risk_features, score, train_risk_model
+from core.recovery import recovery_dates
+from core.schedule import day_subject_counts, weekly_class_matrix
+
+
+def _rounds(n_students):
+    # Keep big cohorts to a handful of rounds so the suite stays runnable
+    return max(1, min(20, 2000 // max(n_students, 1)))
+
+
+def _cohort_arrays(n_students, n_subjects=9):
+    cohort = synthetic.cohort_frame(n_students, n_subjects)
+    attended = cohort["attended"].to_numpy().reshape(n_students, n_subjects)
+    total = cohort["total"].to_numpy().reshape(n_students, n_subjects)
+    return cohort, attended, total
+
+
+# ==============================
+# PER-STUDENT ENGINES × COHORT
+# ==============================
+
+def bench_compute_priority(benchmark, n_students):
+    cohort, _, _ = _cohort_arrays(n_students)
+    pairs = list(zip(cohort["attended"].tolist(), cohort["total"].tolist()))
+
+    def run():
+        return [compute_priority(a, t) for a, t in pairs]
+
+    result = benchmark.pedantic(run, rounds=_rounds(n_students))
+    assert len(result) == len(pairs)
+
+
+def bench_attendance_health_score(benchmark, n_students):
+    cohort, _, _ = _cohort_arrays(n_students)
+
+    frames = []
+    for _, student in cohort.groupby("student", sort=False):
+        rows = [compute_priority(a, t) for a, t in zip(student["attended"], student["total"])]
+        frames.append(pd.DataFrame({
+            "Attendance %": [r["percent"] for r in rows],
+            "Recovery Needed": [r["needed"] for r in rows],
+            "Priority": [r["priority"] for r in rows]
+        }))
+
+    def run():
+        return [attendance_health_score(df) for df in frames]
+
+    scores = benchmark.pedantic(run, rounds=_rounds(n_students))
+    assert len(scores) == n_students
+
+
+def bench_forecast(benchmark, n_students):
+    cohort, _, _ = _cohort_arrays(n_students)
+    pairs = list(zip(cohort["attended"].tolist(), cohort["total"].tolist()))
+
+    def run():
+        return [forecast(a, t, 15) for a, t in pairs]
+
+    result = benchmark.pedantic(run, rounds=_rounds(n_students))
+    assert len(result) == len(pairs)
+
+
+# ==============================
+# PLANNERS
+# ==============================
+
+@pytest.fixture(scope="module")
+def semester_dates():
+    return list(pd.date_range("2026-01-05", "2026-05-05").date)
+
+
+def bench_simulate_day_plan(benchmark, semester_dates, timetable, attendance):
+    counts = day_subject_counts(semester_dates, weekly_class_matrix(timetable, attendance["code"].tolist()))
+    rng = np.random.default_rng(0)
+    attend = rng.random(len(semester_dates)) < 0.7
+    holiday = rng.random(len(semester_dates)) < 0.05
+
+    result = benchmark(
+        simulate_day_plan,
+        counts,
+        attend,
+        holiday,
+        attendance["attended"].to_numpy(),
+        attendance["total"].to_numpy()
+    )
+    assert result["subject_path"].shape == counts.shape
+
+
+def bench_precompute_bunk_plan(benchmark, timetable, attendance):
+    plan = benchmark(precompute_bunk_plan, attendance, timetable, date(2026, 1, 5))
+    assert plan["verdict"].shape[0] == len(plan["dates"])
+
+
+def bench_recovery_dates(benchmark, semester, timetable, attendance):
+    result = benchmark(recovery_dates, attendance, timetable, semester["SEMESTER_START"])
+    assert len(result["date"]) == len(attendance)
+
+
+def bench_monte_carlo_forecast(benchmark, semester, timetable, attendance):
+    # 10k paths over the whole semester, week by week
+    counts = remaining_schedule(attendance, timetable, semester["SEMESTER_START"])["counts"]
+
+    result = benchmark(
+        monte_carlo_forecast, attendance["attended"], attendance["total"], counts, 10_000, 0
+    )
+    assert result["bands"].shape[1:] == counts.shape
+
+
+def bench_cohort_below_probability(benchmark, n_students, semester, timetable, attendance):
+    _, attended, total = _cohort_arrays(n_students)
+    remaining = remaining_schedule(attendance, timetable, semester["SEMESTER_START"])["counts"].sum(axis=0)
+
+    result = benchmark.pedantic(
+        cohort_below_probability,
+        args=(attended, total, remaining, 1_000, 0),
+        rounds=_rounds(n_students)
+    )
+    assert result.shape == attended.shape
+
+
+def bench_cohort_daily_verdicts(benchmark, n_students, timetable):
+    rng = np.random.default_rng(0)
+    codes = rng.integers(-1, 3, (n_students, 100, 7)).astype(np.int8)
+
+    verdict, _ = benchmark.pedantic(daily_verdicts, args=(codes,), rounds=_rounds(n_students))
+    assert verdict.shape == (n_students, 100)
+
+
+def _class_statuses(n_students, days=("Mon", "Tue", "Wed", "Thu", "Fri", "Sat"), slots=7):
+    # One class verdict row per (student, day, slot), student-major
+    rng = np.random.default_rng(0)
+    n_rows = n_students * len(days) * slots
+
+    return {
+        "student": np.repeat(np.arange(n_students), len(days) * slots),
+        "day": np.tile(np.repeat(days, slots), n_students),
+        "status": np.array(["SAFE", "RISKY", "MUST ATTEND"])[rng.integers(0, 3, n_rows)]
+    }
+
+
+def _weekly_verdicts_dicts(rows, n_students):
+    # The app's path: a dict per class, grouped by day, tallied per day
+    verdicts = [[] for _ in range(n_students)]
+    for student, day, status in zip(rows["student"].tolist(), rows["day"].tolist(), rows["status"].tolist()):
+        verdicts[student].append({"day": day, "status": status})
+
+    return {
+        day: [daily_verdict(classes)["status"] for classes in by_day]
+        for day, by_day in _transpose([group_weekly(v) for v in verdicts]).items()
+    }
+
+
+def _transpose(weekly):
+    # [{day: classes}] per student -> {day: [classes per student]}
+    return {day: [student[day] for student in weekly] for day in weekly[0]}
+
+
+def _weekly_verdicts_arrays(rows, n_students):
+    # Status codes grouped by day index arrays; every student has the
+    # same slots per day, so each group reshapes to students × slots
+    codes = status_codes(rows["status"])
+
+    return {
+        day: daily_verdicts(codes[idx].reshape(n_students, -1))[0]
+        for day, idx in group_weekly_index(rows["day"]).items()
+    }
+
+
+@pytest.mark.parametrize("layout", ["dicts", "arrays"])
+def bench_cohort_weekly_verdicts(benchmark, n_students, layout):
+    rows = _class_statuses(n_students)
+    run = _weekly_verdicts_dicts if layout == "dicts" else _weekly_verdicts_arrays
+
+    result = benchmark.pedantic(run, args=(rows, n_students), rounds=_rounds(n_students))
+    if layout == "arrays":
+        result = {day: [DAY_VERDICTS[v] for v in verdict] for day, verdict in result.items()}
+    assert result == _weekly_verdicts_dicts(rows, n_students)
+
+
+def bench_at_risk_report(benchmark, n_students, timetable):
+    _, attended, total = _cohort_arrays(n_students)
+    codes = synthetic.subject_codes(9)
+    slots = list(pd.unique(timetable["time"]))
+    day_subjects = slot_subject_matrix(timetable, codes, slots)[0]
+
+    report = benchmark.pedantic(
+        at_risk_report,
+        args=(np.arange(n_students), attended, total, day_subjects),
+        rounds=_rounds(n_students)
+    )
+    assert len(report) <= n_students
+
+
+# ==============================
+# RISK MODEL
+# ==============================
+
+def bench_train_risk_model(benchmark, n_students):
+    history = synthetic.semester_history(max(n_students, 20))
+
+    model = benchmark.pedantic(train_risk_model, args=(history,), rounds=_rounds(n_students))
+    assert hasattr(model, "predict_proba")
+
+
+def bench_score_risk_model(benchmark, n_students):
+    model = train_risk_model(synthetic.semester_history(1000))
+    history = synthetic.semester_history(n_students, seed=1)
+
+    def run():
+        features = risk_features(history["attended"], history["total"], history["remaining"], history["is_lab"])
+        return score(model, features)
+
+    risk = benchmark.pedantic(run, rounds=_rounds(n_students))
+    assert risk.shape == (len(history),)
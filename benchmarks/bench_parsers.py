@@ -0,0 +1,37 @@
+import io
+
+import pytest
+
+from benchmarks import synthetic
+from utils.attendance_parser import parse_attendance
+from utils.pdf_reader import attendance_pdf_to_df
+from utils.timetable_parser import parse_timetable
+
+
+@pytest.fixture(scope="module", params=[9, 60])
+def n_subjects(request):
+    return request.param
+
+
+def _fresh(data):
+    # Parsers consume the stream, so every round gets a new one
+    return lambda: ((io.BytesIO(data),), {})
+
+
+def bench_attendance_pdf_to_df(benchmark, n_subjects):
+    data = synthetic.attendance_pdf(n_subjects)
+    df = benchmark.pedantic(attendance_pdf_to_df, setup=_fresh(data), rounds=10)
+    assert len(df) == n_subjects
+
+
+def bench_parse_attendance_xlsx(benchmark, n_subjects):
+    data = synthetic.attendance_xlsx(n_subjects)
+    df = benchmark.pedantic(parse_attendance, setup=_fresh(data), rounds=10)
+    assert len(df) == n_subjects
+
+
+@pytest.mark.parametrize("n_slots", [7, 40])
+def bench_parse_timetable(benchmark, n_slots):
+    data = synthetic.timetable_xlsx(n_slots=n_slots)
+    df = benchmark.pedantic(parse_timetable, setup=_fresh(data), rounds=10)
+    assert not df.empty
@@ -0,0 +1,72 @@
+"""
+Compact frame schema (utils.schema): cost of normalizing one upload, and
+memory / groupby / merge of a cohort's attendance in the object layout
+the parsers used to return versus the compact one.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks import synthetic
+from utils.schema import COUNT_DTYPE, PERCENT_DTYPE, code_dtype, normalize_attendance, normalize_timetable
+
+LAYOUTS = ["object", "compact"]
+
+
+def _cohort(n_students, layout):
+    cohort = synthetic.cohort_frame(n_students)
+
+    if layout == "compact":
+        cohort = cohort.astype({
+            "student": np.int32,
+            "code": code_dtype(cohort["code"].unique()),
+            "total": COUNT_DTYPE,
+            "attended": COUNT_DTYPE,
+            "percent": PERCENT_DTYPE
+        })
+
+    return cohort
+
+
+def _subjects(cohort):
+    # Per-subject lookup table sharing the cohort's code dtype
+    codes = cohort["code"].drop_duplicates().reset_index(drop=True)
+    return pd.DataFrame({"code": codes, "remaining": np.arange(len(codes), dtype=np.int16) + 10})
+
+
+def bench_normalize_attendance(benchmark, attendance):
+    att = benchmark(normalize_attendance, attendance)
+    assert len(att) == len(attendance)
+
+
+def bench_normalize_timetable(benchmark, timetable):
+    tt = benchmark(normalize_timetable, timetable)
+    assert len(tt) == len(timetable)
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def bench_cohort_groupby(benchmark, n_students, layout):
+    cohort = _cohort(n_students, layout)
+    benchmark.extra_info["memory_bytes"] = int(cohort.memory_usage(deep=True).sum())
+
+    result = benchmark(lambda: cohort.groupby("code", observed=True)[["attended", "total"]].sum())
+    assert int(result["total"].sum()) == int(cohort["total"].to_numpy().sum(dtype=np.int64))
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def bench_cohort_merge(benchmark, n_students, layout):
+    cohort = _cohort(n_students, layout)
+    subjects = _subjects(cohort)
+
+    result = benchmark(cohort.merge, subjects, on="code", how="left")
+    assert len(result) == len(cohort)
+
+
+def bench_cohort_memory(n_students):
+    # Not timed: the compact layout must stay several times smaller
+    before = _cohort(n_students, "object").memory_usage(deep=True).sum()
+    after = _cohort(n_students, "compact").memory_usage(deep=True).sum()
+
+    if n_students >= 100:
+        assert after * 3 < before
@@ -0,0 +1,99 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Benchmarks import the app packages (core, utils) from the repo root
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks import synthetic  # noqa: E402
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--students",
+        default="1,100,10000",
+        help="Comma-separated cohort sizes for the cohort benchmarks (default: 1,100,10000)"
+    )
+    parser.addoption(
+        "--semester-weeks",
+        default="17",
+        help="Comma-separated semester lengths in weeks for the calendar benchmarks (default: 17)"
+    )
+
+
+def _int_list(text):
+    return [int(x) for x in text.split(",") if x.strip()]
+
+
+def pytest_generate_tests(metafunc):
+    if "n_students" in metafunc.fixturenames:
+        metafunc.parametrize("n_students", _int_list(metafunc.config.getoption("students")))
+
+    if "semester_weeks" in metafunc.fixturenames:
+        metafunc.parametrize("semester_weeks", _int_list(metafunc.config.getoption("semester_weeks")))
+
+
+@pytest.fixture
+def semester(monkeypatch, semester_weeks):
+    """
+    Installs a synthetic semester calendar into core.calendar_logic.
+    """
+
+    from core import calendar_logic
+
+    calendar = synthetic.semester_calendar(semester_weeks)
+    for name, value in calendar.items():
+        monkeypatch.setattr(calendar_logic, name, value)
+
+    compiled = calendar_logic.build_calendar(calendar)
+    compiled["hash"] = f"synthetic-{semester_weeks}"
+    monkeypatch.setattr(calendar_logic, "CALENDAR", compiled)
+
+    return calendar
+
+
+@pytest.fixture(scope="session")
+def timetable():
+    """
+    Parsed long-form timetable (day, time, code) for 9 subjects.
+    """
+
+    _, long = synthetic.timetable_frames()
+    return long
+
+
+@pytest.fixture(scope="session")
+def attendance():
+    return synthetic.attendance_frame()
+
+
+# ==============================
+# PAGE INTERACTION LATENCY
+# ==============================
+
+_LATENCY = pytest.StashKey()
+
+
+@pytest.fixture(scope="session")
+def latency_report(request):
+    """
+    (interaction, rerun ms) rows collected by bench_app, printed as a
+    table at the end of the run.
+    """
+
+    return request.config.stash.setdefault(_LATENCY, [])
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    rows = config.stash.get(_LATENCY, [])
+    if not rows:
+        return
+
+    terminalreporter.section("interaction latency (full script rerun, ms)")
+    terminalreporter.write_line(f"{'interaction':<48}{'median':>10}{'max':>10}")
+
+    for name, times in rows:
+        terminalreporter.write_line(f"{name:<48}{times[len(times) // 2]:>10.1f}{times[-1]:>10.1f}")
@@ -0,0 +1,203 @@
+"""
+Concurrent-session load test for app.py, for exam-week capacity planning.
+
+Starts N simulated sessions with Streamlit's AppTest, `--concurrency`
+at a time. Each session uploads its own attendance file: Group A/B,
+XLSX or PDF, and different counts per session. It then clicks through
+every page and interaction of benchmarks.page_latency for `--rounds`
+rounds.
+
+Sessions run in one of two modes:
+- process : each session in a fresh process
+- thread  : every session in this process, like one Streamlit server
+            serving many sessions
+
+A session's memory is the growth of its process' RSS from before its
+upload to after its last rerun, so the interpreter and the libraries
+imported up front are not counted. In thread mode concurrent sessions
+share the process, so their growth overlaps.
+
+    python -m benchmarks.load_test --sessions 40 --concurrency 8 --out load.json
+
+The report gives throughput (reruns/s), rerun latency p50/p95/max,
+and RSS (MB).
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import streamlit
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks import synthetic  # noqa: E402
+from benchmarks.page_latency import PAGES, open_page, setup_session  # noqa: E402
+
+GROUPS = ["Group A", "Group B"]
+FORMATS = [".xlsx", ".pdf"]
+
+
+def rss_mb():
+    """
+    Current resident set size of this process (peak RSS where
+    /proc is not available).
+    """
+
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KB on Linux, bytes on macOS
+        return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def session_file(session):
+    """
+    (name, bytes, group) of the attendance upload for session number
+    `session`: groups and formats alternate, counts vary by seed.
+    """
+
+    from core import artefacts
+
+    group = GROUPS[session % len(GROUPS)]
+    suffix = FORMATS[(session // len(GROUPS)) % len(FORMATS)]
+    codes = list(dict.fromkeys(artefacts.group_timetable(group)["code"]))
+
+    build = synthetic.attendance_pdf if suffix == ".pdf" else synthetic.attendance_xlsx
+    return f"student_{session}{suffix}", build(seed=session, codes=codes), group
+
+
+def run_session(session, rounds):
+    """
+    One simulated student. Returns their rerun latencies (ms), errors and
+    the process RSS before and after (MB).
+    """
+
+    name, data, group = session_file(session)
+    rss_before = rss_mb()
+    latencies = []
+    errors = []
+
+    def timed(action, *args):
+        start = time.perf_counter()
+        action(*args)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    try:
+        start = time.perf_counter()
+        at = setup_session(name, data, group)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        for _ in range(rounds):
+            for page, interactions in PAGES.items():
+                timed(open_page, at, page)
+                for _, interact in interactions:
+                    timed(interact, at)
+
+            if at.exception:
+                errors.append(at.exception[0].message)
+    except Exception as error:
+        errors.append(f"{type(error).__name__}: {error}")
+
+    return {
+        "session": session,
+        "group": group,
+        "file": name,
+        "latencies": latencies,
+        "errors": errors,
+        "rss_before_mb": rss_before,
+        "rss_after_mb": rss_mb()
+    }
+
+
+def _percentile(values, q):
+    return round(float(np.percentile(values, q)), 2) if len(values) else None
+
+
+def load_test(sessions, concurrency, rounds=1, mode="process"):
+    started = time.perf_counter()
+
+    if mode == "process":
+        # A fresh process per session, so sessions don't inherit each other's caches
+        pool = ProcessPoolExecutor(max_workers=concurrency, max_tasks_per_child=1)
+    else:
+        pool = ThreadPoolExecutor(max_workers=concurrency)
+
+    with pool:
+        results = list(pool.map(run_session, range(sessions), [rounds] * sessions))
+
+    wall = time.perf_counter() - started
+    latencies = np.concatenate([r["latencies"] for r in results]) if results else np.zeros(0)
+
+    per_session_rss = [r["rss_after_mb"] - r["rss_before_mb"] for r in results]
+
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "streamlit": streamlit.__version__,
+            "cpus": os.cpu_count(),
+            "mode": mode,
+            "sessions": sessions,
+            "concurrency": concurrency,
+            "rounds": rounds
+        },
+        "wall_s": round(wall, 2),
+        "reruns": int(len(latencies)),
+        "throughput_reruns_per_s": round(len(latencies) / wall, 2) if wall else None,
+        "latency_ms": {
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "max": _percentile(latencies, 100)
+        },
+        "rss_mb": {
+            "per_session_p50": _percentile(per_session_rss, 50),
+            "per_session_max": _percentile(per_session_rss, 100),
+            "process_end": round(rss_mb(), 1)
+        },
+        "errors": [
+            {"session": r["session"], "file": r["file"], "error": error}
+            for r in results for error in r["errors"]
+        ]
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for app.py.")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--rounds", type=int, default=1, help="Click-through rounds per session")
+    parser.add_argument("--mode", choices=["process", "thread"], default="process")
+    parser.add_argument("--out", type=Path, help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    report = load_test(args.sessions, args.concurrency, args.rounds, args.mode)
+
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    latency, rss = report["latency_ms"], report["rss_mb"]
+    print(
+        f"{args.sessions} sessions × {args.rounds} rounds ({args.mode}, concurrency {args.concurrency}): "
+        f"{report['reruns']} reruns in {report['wall_s']} s = {report['throughput_reruns_per_s']} reruns/s\n"
+        f"rerun latency p50 {latency['p50']} ms, p95 {latency['p95']} ms, max {latency['max']} ms\n"
+        f"RSS per session p50 {rss['per_session_p50']} MB, max {rss['per_session_max']} MB\n"
+        f"errors: {len(report['errors'])}"
+    )
+
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+"""
+End-to-end page latency of app.py with Streamlit's AppTest (headless,
+offline).
+
+Each iteration does the following for every bundled sample attendance file:
+- starts a fresh session
+- drives the setup screen (upload and group)
+- opens each page
+- replays that page's interactions (toggles, inputs, buttons)
+
+Every step is timed with the wall clock. The report is JSON, with
+p50/p95/mean per (sample, step), so runs can be compared:
+
+    python -m benchmarks.page_latency --iterations 10 --out latency.json
+    python -m benchmarks.page_latency --compare latency.json --fail-above 25
+
+The samples in benchmarks/samples/ come from synthetic.py and can be
+regenerated with --write-samples.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from collections import defaultdict
+from datetime import timedelta
+from pathlib import Path
+
+import numpy as np
+import streamlit
+from streamlit.testing.v1 import AppTest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks import synthetic  # noqa: E402
+
+APP = str(ROOT / "app.py")
+SAMPLES_DIR = Path(__file__).resolve().parent / "samples"
+
+# Sample file → group it is uploaded for (and whose course codes it uses)
+SAMPLES = {
+    "group_a.xlsx": "Group A",
+    "group_a.pdf": "Group A",
+    "group_b.xlsx": "Group B"
+}
+
+MIME_TYPES = {
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".pdf": "application/pdf"
+}
+
+TIMEOUT = 120
+
+
+# ==============================
+# SAMPLES
+# ==============================
+
+def write_samples(directory=SAMPLES_DIR):
+    from core import artefacts
+
+    directory.mkdir(parents=True, exist_ok=True)
+
+    for seed, (name, group) in enumerate(SAMPLES.items()):
+        codes = list(dict.fromkeys(artefacts.group_timetable(group)["code"]))
+        build = synthetic.attendance_pdf if name.endswith(".pdf") else synthetic.attendance_xlsx
+        (directory / name).write_bytes(build(seed=seed, codes=codes))
+
+
+# ==============================
+# SESSION DRIVER
+# ==============================
+
+def _widget(widgets, label):
+    return next(widget for widget in widgets if widget.label == label)
+
+
+def _check(at, step):
+    if at.exception:
+        raise RuntimeError(f"{step}: {at.exception[0].message}")
+
+
+def setup_session(name, data, group):
+    """
+    Fresh session taken through the setup screen with the attendance
+    file `name` (contents `data`); returns the AppTest on the Home page.
+    """
+
+    at = AppTest.from_file(APP, default_timeout=TIMEOUT)
+    at.run()
+
+    at.file_uploader[0].set_value((name, data, MIME_TYPES[Path(name).suffix]))
+    _widget(at.selectbox, "Select group").set_value(group)
+    _widget(at.button, "Continue →").click().run()
+
+    # AppTest does not run the parse progress fragment's timer; wait
+    # for the background parse and rerun the way that fragment would
+    at.session_state["parse_job"].result()
+    at.run()
+
+    return at
+
+
+def open_page(at, page):
+    _widget(at.sidebar.radio, "Navigation").set_value(page).run()
+
+
+def _home_plan_tomorrow(at):
+    plan_for = _widget(at.date_input, "Plan for")
+    plan_for.set_value(plan_for.value + timedelta(days=1)).run()
+
+
+def _skip_apply(at):
+    _widget(at.checkbox, "Apply skip to date range").check().run()
+
+
+def _skip_labs(at):
+    skip_labs = _widget(at.checkbox, "Skip lab classes too")
+    skip_labs.set_value(not skip_labs.value).run()
+
+
+def _planner_week(at):
+    start = _widget(at.date_input, "From date").value
+    _widget(at.date_input, "Till date").set_value(start + timedelta(days=6)).run()
+
+
+def _planner_toggle(at):
+    toggle = next(t for t in at.toggle if t.key and t.key.startswith("dayplanner_attend_toggle_"))
+    toggle.set_value(not toggle.value).run()
+
+
+def _planner_simulate(at):
+    _widget(at.button, "📊 Simulate Attendance Impact").click().run()
+
+
+def _what_if_attend(at):
+    _widget(at.number_input, "Attend next classes").increment().run()
+
+
+def _what_if_bunk(at):
+    _widget(at.number_input, "Bunk next classes").increment().run()
+
+
+def _forecast_subject(at):
+    subject = at.selectbox(key="forecast_subject")
+    subject.set_value(subject.options[-1]).run()
+
+
+def _forecast_monte_carlo(at):
+    at.radio(key="forecast_mode").set_value("Probabilistic (Monte Carlo)").run()
+
+
+PAGES = {
+    "🏠 Home": [("plan tomorrow", _home_plan_tomorrow)],
+    "📅 Skip College Planner": [("apply skip", _skip_apply), ("toggle labs", _skip_labs)],
+    "🗓️ Day Planner": [
+        ("one-week range", _planner_week),
+        ("attend toggle", _planner_toggle),
+        ("simulate", _planner_simulate)
+    ],
+    "🔮 What-If Attendance": [("attend +1", _what_if_attend), ("bunk +1", _what_if_bunk)],
+    "📈 Attendance Forecast": [("change subject", _forecast_subject), ("monte carlo", _forecast_monte_carlo)]
+}
+
+
+def _timed(timings, step, action, *args):
+    start = time.perf_counter()
+    action(*args)
+    timings[step].append((time.perf_counter() - start) * 1000)
+
+
+def measure(sample_path, group, iterations):
+    """
+    step → list of wall times (ms) over `iterations` fresh sessions.
+    Steps are "setup", "<page>" (navigating to it) and
+    "<page> › <interaction>".
+    """
+
+    timings = defaultdict(list)
+
+    for _ in range(iterations):
+        start = time.perf_counter()
+        at = setup_session(sample_path.name, sample_path.read_bytes(), group)
+        timings["setup"].append((time.perf_counter() - start) * 1000)
+        _check(at, "setup")
+
+        for page, interactions in PAGES.items():
+            _timed(timings, page, open_page, at, page)
+            _check(at, page)
+
+            for name, interact in interactions:
+                step = f"{page} › {name}"
+                _timed(timings, step, interact, at)
+                _check(at, step)
+
+    return timings
+
+
+# ==============================
+# REPORT
+# ==============================
+
+def summarize(samples):
+    return {
+        "p50": round(float(np.percentile(samples, 50)), 2),
+        "p95": round(float(np.percentile(samples, 95)), 2),
+        "mean": round(float(np.mean(samples)), 2),
+        "n": len(samples)
+    }
+
+
+def run(iterations, samples=None):
+    samples = samples or list(SAMPLES)
+    results = {}
+
+    for name in samples:
+        timings = measure(SAMPLES_DIR / name, SAMPLES[name], iterations)
+        results[name] = {step: summarize(values) for step, values in timings.items()}
+
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "streamlit": streamlit.__version__,
+            "machine": platform.machine(),
+            "iterations": iterations
+        },
+        "results": results
+    }
+
+
+def compare(report, baseline, fail_above=None):
+    """
+    Lines comparing p50 per (sample, step) against a baseline report,
+    and whether any step regressed by more than `fail_above` percent.
+    """
+
+    lines = [f"{'sample':<14}{'step':<48}{'base p50':>10}{'p50':>10}{'change':>9}"]
+    regressed = False
+
+    for sample, steps in report["results"].items():
+        for step, stats in steps.items():
+            base = baseline["results"].get(sample, {}).get(step)
+            if base is None:
+                continue
+
+            change = (stats["p50"] / base["p50"] - 1) * 100 if base["p50"] else 0.0
+            flag = fail_above is not None and change > fail_above
+            regressed |= flag
+
+            lines.append(
+                f"{sample:<14}{step:<48}{base['p50']:>10.1f}{stats['p50']:>10.1f}{change:>+8.1f}%"
+                + ("  ✗" if flag else "")
+            )
+
+    return lines, regressed
+
+
+def format_report(report):
+    lines = [f"{'sample':<14}{'step':<48}{'p50 ms':>10}{'p95 ms':>10}"]
+
+    for sample, steps in report["results"].items():
+        for step, stats in steps.items():
+            lines.append(f"{sample:<14}{step:<48}{stats['p50']:>10.1f}{stats['p95']:>10.1f}")
+
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Page latency of app.py with Streamlit AppTest.")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--samples", nargs="*", choices=list(SAMPLES), help="Sample files (default: all)")
+    parser.add_argument("--out", type=Path, help="Write the JSON report here")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON report to compare against")
+    parser.add_argument("--fail-above", type=float, help="Exit 1 if a step's p50 regresses by more than this %%")
+    parser.add_argument("--write-samples", action="store_true", help="Regenerate benchmarks/samples/ and exit")
+    args = parser.parse_args(argv)
+
+    if args.write_samples:
+        write_samples()
+        return 0
+
+    report = run(args.iterations, args.samples)
+
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    if args.compare:
+        lines, regressed = compare(report, json.loads(args.compare.read_text(encoding="utf-8")), args.fail_above)
+    else:
+        lines, regressed = format_report(report), False
+
+    print("\n".join(lines))
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""
+Synthetic data generators for the benchmark suite.
+
+Everything is seeded so repeated runs time identical inputs.
+"""
+
+import io
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri"]
+PREFIXES = ["CSH", "CST", "CSR", "MTT", "UCT", "DCP", "PHY", "ECE", "MEC", "BIO"]
+
+
+def subject_codes(n_subjects):
+    """
+    Course codes in the 2025-intake format, e.g. 25CSH-101.
+    """
+
+    return [f"25{PREFIXES[i % len(PREFIXES)]}-{101 + i}" for i in range(n_subjects)]
+
+
+# ==============================
+# ATTENDANCE
+# ==============================
+
+def attendance_frame(n_subjects=9, seed=0, codes=None):
+    """
+    One student's parsed attendance (columns: code, total, attended, percent).
+    `codes` overrides the generated course codes (e.g. a real timetable's).
+    """
+
+    codes = subject_codes(n_subjects) if codes is None else list(codes)
+    n_subjects = len(codes)
+    rng = np.random.default_rng(seed)
+    total = rng.integers(10, 60, n_subjects)
+    attended = np.minimum(total, (total * rng.uniform(0.55, 1.0, n_subjects)).astype(int))
+
+    return pd.DataFrame({
+        "code": codes,
+        "total": total,
+        "attended": attended,
+        "percent": np.round(attended / total * 100, 2)
+    })
+
+
+def cohort_frame(n_students, n_subjects=9, seed=0):
+    """
+    Long-form attendance for a cohort (student, code, total, attended, percent).
+    """
+
+    rng = np.random.default_rng(seed)
+    total = rng.integers(10, 60, (n_students, n_subjects))
+    attended = np.minimum(total, (total * rng.uniform(0.55, 1.0, (n_students, n_subjects))).astype(int))
+
+    return pd.DataFrame({
+        "student": np.repeat(np.arange(n_students), n_subjects),
+        "code": np.tile(subject_codes(n_subjects), n_students),
+        "total": total.ravel(),
+        "attended": attended.ravel(),
+        "percent": np.round(attended / total * 100, 2).ravel()
+    })
+
+
+def semester_history(n_students, n_subjects=9, seed=0):
+    """
+    Past-semester snapshots for training the risk model: cohort_frame
+    counts plus classes remaining, lab flag and the final counts, each
+    student attending the rest at roughly their rate so far.
+    """
+
+    rng = np.random.default_rng(seed)
+    history = cohort_frame(n_students, n_subjects, seed)
+
+    remaining = rng.integers(10, 40, len(history))
+    rate = np.clip(history["attended"] / history["total"] + rng.normal(0, 0.1, len(history)), 0, 1)
+
+    history["remaining"] = remaining
+    history["is_lab"] = np.tile(np.arange(n_subjects) % 4 == 3, n_students)
+    history["final_attended"] = history["attended"] + rng.binomial(remaining, rate)
+    history["final_total"] = history["total"] + remaining
+
+    return history
+
+
+def attendance_xlsx(n_subjects=9, seed=0, codes=None):
+    """
+    Attendance export in the ERP Excel layout, as bytes.
+    """
+
+    att = attendance_frame(n_subjects, seed, codes)
+    buffer = io.BytesIO()
+
+    pd.DataFrame({
+        "Course Code": att["code"],
+        "Eligible Delivered": att["total"],
+        "Eligible Attended": att["attended"],
+        "Eligible Percentage": att["percent"]
+    }).to_excel(buffer, index=False)
+
+    return buffer.getvalue()
+
+
+def attendance_pdf(n_subjects=9, seed=0, codes=None, detail_pages=0):
+    """
+    Attendance PDF laid out like the ERP report: a summary page with one
+    text line per course (…, delivered, attended, percent), then
+    `detail_pages` pages of per-date lines that repeat the course codes.
+    """
+
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    att = attendance_frame(n_subjects, seed, codes)
+
+    pages = [["Sr Course Code Course Name Delivered Attended Percentage"] + [
+        f"{i + 1} {row.code} Course {i + 1} {row.total} {row.attended} {row.percent:.2f}"
+        for i, row in enumerate(att.itertuples())
+    ]]
+    for page in range(detail_pages):
+        pages.append(["Date Course Code Slot Delivered Attended"] + [
+            f"{page + 1:02d}/02/2026 {row.code} {i + 1} 1 {(i + page) % 2}"
+            for i, row in enumerate(att.itertuples())
+        ])
+
+    buffer = io.BytesIO()
+    with PdfPages(buffer) as pdf:
+        for lines in pages:
+            fig = plt.figure(figsize=(8.27, max(11.69, 0.3 * len(lines) + 2)))
+            step = 1 / (len(lines) + 2)
+            for i, line in enumerate(lines):
+                fig.text(0.05, 1 - (i + 1) * step, line, fontsize=8)
+
+            pdf.savefig(fig)
+            plt.close(fig)
+
+    return buffer.getvalue()
+
+
+# ==============================
+# TIMETABLES
+# ==============================
+
+def timetable_frames(n_subjects=9, n_slots=7, seed=0):
+    """
+    Returns (raw, long):
+    - raw  : Excel-style grid (Timing, Mon … Fri, Sat, Sun)
+    - long : parsed long form (day, time, code)
+    """
+
+    rng = np.random.default_rng(seed)
+    codes = subject_codes(n_subjects)
+    start = datetime(2026, 1, 5, 9, 30)
+
+    raw_rows = []
+    long_rows = []
+
+    for slot in range(n_slots):
+        begin = start + timedelta(minutes=55 * slot)
+        timing = f"{begin:%I:%M}-{begin + timedelta(minutes=50):%I:%M %p}"
+        row = {"Timing": timing}
+
+        for day in WEEKDAYS:
+            # ~1 in 6 slots is free
+            if rng.random() < 1 / 6:
+                row[day] = np.nan
+                continue
+
+            code = codes[rng.integers(n_subjects)]
+            kind = "P" if rng.random() < 0.3 else "L"
+            row[day] = f"{code}:{kind} By Faculty {rng.integers(100)} at E-{rng.integers(100, 400)}"
+            long_rows.append({"day": day, "time": timing, "code": code})
+
+        row["Sat"] = np.nan
+        row["Sun"] = np.nan
+        raw_rows.append(row)
+
+    return pd.DataFrame(raw_rows), pd.DataFrame(long_rows, columns=["day", "time", "code"])
+
+
+def timetable_xlsx(n_subjects=9, n_slots=7, seed=0):
+    """
+    Raw timetable grid as Excel bytes.
+    """
+
+    raw, _ = timetable_frames(n_subjects, n_slots, seed)
+    buffer = io.BytesIO()
+    raw.to_excel(buffer, index=False)
+
+    return buffer.getvalue()
+
+
+# ==============================
+# SEMESTER CALENDARS
+# ==============================
+
+def semester_calendar(weeks=17, seed=0):
+    """
+    Calendar settings in the shape of core.calendar_logic's constants:
+    SEMESTER_START, SEMESTER_END, HOLIDAYS, WORKING_SATURDAYS, MID_SEM_DAYS.
+    """
+
+    rng = np.random.default_rng(seed)
+    start = datetime(2026, 1, 5)
+    end = start + timedelta(weeks=weeks) - timedelta(days=1)
+
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    weekdays = [d for d in days if d.weekday() < 5]
+    saturdays = [d for d in days if d.weekday() == 5]
+
+    picks = rng.permutation(len(weekdays))
+    holidays = {weekdays[i].strftime("%Y-%m-%d") for i in picks[:max(1, weeks // 3)]}
+    mid_sem = {weekdays[i].strftime("%Y-%m-%d") for i in picks[len(holidays):len(holidays) + max(1, weeks // 2)]}
+
+    working = {
+        d.strftime("%Y-%m-%d"): ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"][i % 5]
+        for i, d in enumerate(saturdays[::2])
+    }
+
+    return {
+        "SEMESTER_START": start,
+        "SEMESTER_END": end,
+        "HOLIDAYS": holidays,
+        "WORKING_SATURDAYS": working,
+        "MID_SEM_DAYS": mid_sem
+    }
@@ -0,0 +1,181 @@
+import os
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+from core.recompute import cells_frame, changed_cells
+from core.registry import default_registry
+from core.schedule import effective_day_indices, weekly_class_matrix
+
+# ==============================
+# SHARED READ-ONLY ARTEFACTS
+# ==============================
+# Built once per cohort and shared by every Streamlit session and the
+# API. Timetables and calendars come from the cohort registry
+# (core.registry); artefacts derived from them are built on first use
+# and stored on the registry entry, so they are evicted with it.
+# Arrays are read-only and mappings are MappingProxyType, so callers
+# use them directly instead of copying. Treat the DataFrames as
+# immutable too.
+#
+# ATTENDWISE_PROGRAMME / ATTENDWISE_SEMESTER pick the cohort the app
+# serves (default: the first row of the cohort manifest).
+
+PROGRAMME = os.environ.get("ATTENDWISE_PROGRAMME")
+SEMESTER = os.environ.get("ATTENDWISE_SEMESTER")
+
+
+def default_cohort():
+    """
+    (programme, semester) used when a caller only names a group.
+    """
+
+    programme, semester, _ = default_registry().cohorts()[0]
+    return PROGRAMME or programme, SEMESTER or semester
+
+
+def groups(programme=None, semester=None):
+    default_programme, default_semester = default_cohort()
+    return default_registry().groups(programme or default_programme, semester or default_semester)
+
+
+def cohort(group, programme=None, semester=None):
+    """
+    Registry entry for `group` (KeyError if the cohort is unknown).
+    """
+
+    default_programme, default_semester = default_cohort()
+    return default_registry().get(programme or default_programme, semester or default_semester, group)
+
+
+def _derived(entry, name, build):
+    # Two sessions may race to build the same artefact; both results
+    # are identical and setdefault keeps the first.
+    try:
+        return entry["derived"][name]
+    except KeyError:
+        return entry["derived"].setdefault(name, build(entry))
+
+
+def _read_only(array):
+    array.flags.writeable = False
+    return array
+
+
+def clear():
+    default_registry().clear()
+
+
+# ==============================
+# TIMETABLES
+# ==============================
+
+def raw_timetable(group, programme=None, semester=None):
+    """
+    Timetable grid (Timing, Mon … Sun) for `group`.
+    """
+
+    return cohort(group, programme, semester)["raw_timetable"]
+
+
+def group_timetable(group, programme=None, semester=None):
+    """
+    Timetable for `group` in long form (day, time, code).
+    """
+
+    return cohort(group, programme, semester)["timetable"]
+
+
+# ==============================
+# CALENDAR
+# ==============================
+
+def teaching_days(group, programme=None, semester=None):
+    """
+    Every teaching day of the cohort's semester as a read-only datetime64[D] array.
+    """
+
+    return _derived(cohort(group, programme, semester), "teaching_days", _build_teaching_days)
+
+
+def _build_teaching_days(entry):
+    calendar = entry["calendar"]
+    return _read_only(calendar["dates"][calendar["teaching"]])
+
+
+# ==============================
+# PER-SUBJECT TOTALS
+# ==============================
+
+def subject_totals(group, programme=None, semester=None):
+    """
+    code → classes in the whole semester for `group`. Working Saturdays
+    count under the weekday they follow, as in every other engine
+    (core.schedule.effective_day_indices).
+    """
+
+    return _derived(cohort(group, programme, semester), "subject_totals", _build_subject_totals)
+
+
+def _build_subject_totals(entry):
+    timetable = entry["timetable"]
+    calendar = entry["calendar"]
+    codes = list(pd.unique(timetable["code"]))
+
+    # Teaching days per timetable day followed (Mon=0 … Sun=6); test-only
+    # days (-1) hold no classes
+    followed = effective_day_indices(_derived(entry, "teaching_days", _build_teaching_days), calendar)
+    per_day = np.bincount(followed[followed >= 0], minlength=7)
+
+    totals = per_day @ weekly_class_matrix(timetable, codes)
+
+    return MappingProxyType({
+        code: int(total) for code, total in zip(codes, totals) if total > 0
+    })
+
+
+# ==============================
+# CALENDAR / TIMETABLE EDITS
+# ==============================
+
+def apply_change(group, calendar=None, timetable=None, raw=None, programme=None, semester=None):
+    """
+    Switches a loaded cohort to an edited calendar and/or timetable (long
+    form, with its grid as `raw`). Subject totals are patched from the
+    changed (date, subject) cells instead of being rebuilt; other
+    derived artefacts are rebuilt on next use. The edited entry is pinned
+    in the registry, so the edit lasts until the process restarts; write
+    the files too to keep it beyond that.
+
+    Returns the changed cells as a (date, code, delta) frame.
+    """
+
+    entry = cohort(group, programme, semester)
+    totals = dict(subject_totals(group, programme, semester))
+
+    new_calendar = calendar or entry["calendar"]
+    new_timetable = entry["timetable"] if timetable is None else timetable
+
+    codes = list(pd.unique(pd.concat([entry["timetable"]["code"], new_timetable["code"]])))
+    dates, delta = changed_cells(
+        entry["calendar"], new_calendar,
+        weekly_class_matrix(entry["timetable"], codes), weekly_class_matrix(new_timetable, codes)
+    )
+
+    for code, change in zip(codes, delta.sum(axis=0)):
+        totals[code] = totals.get(code, 0) + int(change)
+
+    edits = {
+        "calendar": new_calendar,
+        "timetable": new_timetable,
+        "derived": {
+            "subject_totals": MappingProxyType({code: total for code, total in totals.items() if total > 0})
+        }
+    }
+    if raw is not None:
+        edits["raw_timetable"] = raw
+
+    default_registry().update(entry, **edits)
+
+    return cells_frame(dates, delta, codes)
@@ -50,7 +50,7 @@ def can_bunk(attended, total):
     future = attended / (total + 1) * 100
     return future >= 75, round(future, 2)
 
-from utils.subject_map import SUBJECT_MAP
+from utils.subject_map import subject_code
 
 def get_subject_total_classes(subject_or_code, timetable):
     """
@@ -69,9 +69,9 @@ def get_subject_total_classes(subject_or_code, timetable):
         return subject_totals[subject_or_code]
 
     # Case 2: subject name passed → reverse map to code
-    for code, name in SUBJECT_MAP.items():
-        if name == subject_or_code and code in subject_totals:
-            return subject_totals[code]
+    code = subject_code(subject_or_code)
+    if code in subject_totals:
+        return subject_totals[code]
 
     # Not found in timetable
     from datetime import datetime
@@ -0,0 +1,233 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from core import calendar_logic
+from core.schedule import DAY_INDEX, effective_day_indices, teaching_day_mask, weekly_class_matrix
+from utils.schema import SchemaError
+
+# ==============================
+# SMART BUNK PLAN (WHOLE SEMESTER)
+# ==============================
+# Verdict codes stored in the day × slot table (-1 = no class).
+
+VERDICTS = ["Safe Bunk", "Risky", "Critical"]
+SAFE_BUNK, RISKY, CRITICAL = 0, 1, 2
+NO_CLASS = -1
+
+
+def slot_subject_matrix(timetable_df, codes, slots):
+    """
+    weekday × slot matrix of subject indices (-1 = free slot).
+    Raises SchemaError if two timetable rows share a (day, time) slot.
+    """
+
+    matrix = np.full((len(DAY_INDEX), len(slots)), NO_CLASS, dtype=np.int16)
+
+    code_idx = {code: i for i, code in enumerate(codes)}
+    slot_idx = {slot: i for i, slot in enumerate(slots)}
+
+    for day, time, code in timetable_df[["day", "time", "code"]].itertuples(index=False):
+        w = DAY_INDEX.get(str(day).strip().lower()[:3])
+        if w is None or code not in code_idx:
+            continue
+
+        if matrix[w, slot_idx[time]] != NO_CLASS:
+            taken = codes[matrix[w, slot_idx[time]]]
+            raise SchemaError(f"timetable has two classes in the {day} {time} slot ({taken}, {code})")
+
+        matrix[w, slot_idx[time]] = code_idx[code]
+
+    return matrix
+
+
+def slot_occurrence(subject):
+    """
+    For a (..., slots) subject-index array, the 1-based occurrence of
+    each class's subject within its day (2 = second class of that
+    subject that day). Free slots get 0.
+    """
+
+    has_class = subject >= 0
+    occurrence = np.zeros(subject.shape, dtype=np.int64)
+
+    for j in range(subject.shape[-1]):
+        same = (subject[..., :j + 1] == subject[..., j:j + 1]) & has_class[..., :j + 1]
+        occurrence[..., j] = same.sum(axis=-1) * has_class[..., j]
+
+    return occurrence
+
+
+def bunk_percent(attended, delivered, occurrence):
+    """
+    Attendance % after bunking `occurrence` classes in a row
+    (0.0 when nothing has been delivered yet).
+    """
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(delivered > 0, np.round(attended / (delivered + occurrence) * 100, 2), 0.0)
+
+
+def bunk_verdict_codes(percent, has_class):
+    """
+    Maps bunk percentages to verdict codes (-1 where there is no class).
+    """
+
+    verdict = np.select([percent >= 80, percent >= 75], [SAFE_BUNK, RISKY], CRITICAL).astype(np.int8)
+    verdict[~has_class] = NO_CLASS
+    return verdict
+
+
+def precompute_bunk_plan(att, timetable_df, start, end=None, calendar=None):
+    """
+    Per-class bunk verdicts for every day in [start, end], assuming
+    every class before that day is attended. `end` defaults to the
+    end of the semester in `calendar` (default: the active semester).
+
+    Within a day, repeated classes of the same subject are bunked
+    sequentially (the 2nd bunk counts on top of the 1st).
+
+    Returns a dict with:
+    - dates   : datetime64[D] vector
+    - slots   : timetable time slots (column labels)
+    - codes   : subject codes (att order)
+    - subject : int16  days × slots subject index (-1 = no class)
+    - verdict : int8   days × slots verdict code (-1 = no class)
+    - percent : float32 days × slots % if that class is bunked
+    - test_day: bool vector, True when the calendar maps the day to a test
+    """
+
+    calendar = calendar or calendar_logic.CALENDAR
+    end = calendar["SEMESTER_END"] if end is None else end
+
+    start = start.date() if isinstance(start, datetime) else start
+    end = end.date() if isinstance(end, datetime) else end
+    n_days = max(0, (end - start).days + 1)
+    dates = [start + timedelta(days=i) for i in range(n_days)]
+
+    codes = att["code"].tolist()
+    slots = list(pd.unique(timetable_df["time"])) if not timetable_df.empty else []
+
+    teaching = teaching_day_mask(dates, calendar)
+    day_idx = effective_day_indices(dates, calendar)
+    test_day = day_idx < 0
+
+    # Subject sitting in each (day, slot); non-teaching days are empty
+    slot_subjects = np.vstack([
+        slot_subject_matrix(timetable_df, codes, slots),
+        np.full((1, len(slots)), NO_CLASS, dtype=np.int16)
+    ])
+    subject = slot_subjects[day_idx]
+    subject[~teaching] = NO_CLASS
+
+    # Running counts under "attend everything before this day"
+    weekly = np.vstack([weekly_class_matrix(timetable_df, codes), np.zeros((1, len(codes)), dtype=np.int32)])
+    counts = weekly[day_idx] * teaching[:, None]
+    attended_before = np.cumsum(counts, axis=0) - counts + att["attended"].to_numpy(dtype=np.int64)
+    delivered_before = np.cumsum(counts, axis=0) - counts + att["total"].to_numpy(dtype=np.int64)
+
+    has_class = subject >= 0
+    safe_subject = np.where(has_class, subject, 0).astype(np.intp)
+
+    attended = np.take_along_axis(attended_before, safe_subject, axis=1)
+    delivered = np.take_along_axis(delivered_before, safe_subject, axis=1)
+
+    percent = bunk_percent(attended, delivered, slot_occurrence(subject))
+    verdict = bunk_verdict_codes(percent, has_class)
+    percent = np.where(has_class, percent, np.nan).astype(np.float32)
+
+    return {
+        "dates": np.array(dates, dtype="datetime64[D]"),
+        "slots": slots,
+        "codes": codes,
+        "subject": subject,
+        "verdict": verdict,
+        "percent": percent,
+        "test_day": test_day
+    }
+
+
+# ==============================
+# LOOKUPS
+# ==============================
+
+def cohort_class_verdicts(attended, total, subject):
+    """
+    Bunk verdicts for many students at once, using each student's
+    current counts.
+
+    attended, total : students × subjects
+    subject         : days × slots subject indices (-1 = free slot)
+
+    Returns (verdict int8, percent float32), both students × days × slots.
+    """
+
+    attended = np.asarray(attended)
+    total = np.asarray(total)
+
+    has_class = subject >= 0
+    safe_subject = np.where(has_class, subject, 0).astype(np.intp)
+
+    percent = bunk_percent(
+        attended[:, safe_subject],
+        total[:, safe_subject],
+        slot_occurrence(subject)[None, :, :]
+    )
+    verdict = bunk_verdict_codes(percent, np.broadcast_to(has_class, percent.shape))
+
+    return verdict, np.where(has_class, percent, np.nan).astype(np.float32)
+
+
+def bunk_plan_for_date(plan, day):
+    """
+    Classes on `day` as a list of dicts (time, code, verdict, percent),
+    in slot order. Empty list if the day has no classes or is outside the plan.
+    """
+
+    i = np.searchsorted(plan["dates"], np.datetime64(day, "D"))
+    if i >= len(plan["dates"]) or plan["dates"][i] != np.datetime64(day, "D"):
+        return []
+
+    return [
+        {
+            "time": plan["slots"][j],
+            "code": plan["codes"][plan["subject"][i, j]],
+            "verdict": VERDICTS[plan["verdict"][i, j]],
+            "percent": round(float(plan["percent"][i, j]), 2)
+        }
+        for j in np.flatnonzero(plan["subject"][i] >= 0)
+    ]
+
+
+def is_test_day(plan, day, calendar=None):
+    """
+    True if the calendar maps `day` to a test (no timetable).
+    Days outside the plan are looked up in `calendar`
+    (default: the active semester).
+    """
+
+    i = np.searchsorted(plan["dates"], np.datetime64(day, "D"))
+    if i < len(plan["dates"]) and plan["dates"][i] == np.datetime64(day, "D"):
+        return bool(plan["test_day"][i])
+
+    return bool(effective_day_indices([day], calendar)[0] < 0)
+
+
+def bunk_plan_frame(plan):
+    """
+    Long-form table (date, time, code, verdict, percent) of every
+    scheduled class in the plan, for notification jobs and exports.
+    """
+
+    day_i, slot_j = np.nonzero(plan["subject"] >= 0)
+    codes = np.array(plan["codes"], dtype=object)
+    slots = np.array(plan["slots"], dtype=object)
+
+    return pd.DataFrame({
+        "date": plan["dates"][day_i],
+        "time": slots[slot_j],
+        "code": codes[plan["subject"][day_i, slot_j]],
+        "verdict": pd.Categorical.from_codes(plan["verdict"][day_i, slot_j], VERDICTS),
+        "percent": plan["percent"][day_i, slot_j]
+    })
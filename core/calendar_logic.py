@@ -1,48 +1,180 @@
-from datetime import datetime, timedelta
+import csv
+import hashlib
+import io
+import os
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
 
 # ==============================
-# SEMESTER CONFIG (Even Sem 2025–26)
+# SEMESTER CALENDAR FILE
 # ==============================
+# One CSV per semester in data/calendars/ (columns: date, kind, follows, note).
+#
+#   semester_start / semester_end   exactly one row each
+#   holiday                         no classes
+#   working_saturday                follows = weekday timetable (e.g. Monday) or Test
+#   mid_sem                         test day, no classes
+#
+# Set ATTENDWISE_CALENDAR=<path> to run another semester; no code change needed.
 
-SEMESTER_START = datetime(2026, 1, 5)
-SEMESTER_END = datetime(2026, 5, 5)
+DEFAULT_CALENDAR = Path(__file__).resolve().parent.parent / "data" / "calendars" / "2025-26-even.csv"
+CALENDAR_PATH = Path(os.environ.get("ATTENDWISE_CALENDAR", DEFAULT_CALENDAR))
 
-HOLIDAYS = {
-    "2026-01-14",  # Makar Sankranti
-    "2026-01-26",  # Republic Day
-    "2026-03-04",  # Holi
-    "2026-03-20",  # Eid ul Fitr
-    "2026-03-27",  # Ram Navmi
-    "2026-04-14",  # Dr. Ambedkar Jayanti
-    "2026-05-27",  # Bakrid (outside teaching range, safety)
-}
+CALENDAR_KINDS = ("semester_start", "semester_end", "holiday", "working_saturday", "mid_sem")
+WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
 
-# ==============================
-# WORKING SATURDAYS (with timetable mapping)
-# ==============================
+# Compiled calendars by file content hash
+_compiled = {}
+
+
+def load_calendar(path=CALENDAR_PATH, cache=True):
+    """
+    Reads and compiles a semester calendar file. Compiled calendars are
+    cached by content hash, so an unchanged file is only compiled once.
+    Pass cache=False when the caller manages the calendar's lifetime
+    (e.g. core.registry).
+    """
+
+    data = Path(path).read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+
+    # Uncached callers get their own copy, never the shared one
+    if cache and digest in _compiled:
+        return _compiled[digest]
+
+    calendar = compile_calendar(data.decode("utf-8-sig"), source=str(path))
+    calendar["hash"] = digest
+
+    if cache:
+        _compiled[digest] = calendar
+
+    return calendar
+
+
+def compile_calendar(text, source="calendar"):
+    """
+    Parses calendar CSV text into the semester settings
+    (SEMESTER_START, SEMESTER_END, HOLIDAYS, WORKING_SATURDAYS,
+    MID_SEM_DAYS) plus the per-day index from build_calendar().
+    Raises ValueError on a malformed file.
+    """
+
+    settings = {
+        "SEMESTER_START": None,
+        "SEMESTER_END": None,
+        "HOLIDAYS": set(),
+        "WORKING_SATURDAYS": {},
+        "MID_SEM_DAYS": set()
+    }
+
+    for line_no, row in enumerate(csv.DictReader(io.StringIO(text)), start=2):
+        where = f"{source}:{line_no}"
+        kind = (row.get("kind") or "").strip()
+        follows = (row.get("follows") or "").strip()
+
+        try:
+            day = datetime.strptime((row.get("date") or "").strip(), "%Y-%m-%d")
+        except ValueError:
+            raise ValueError(f"{where}: date must be YYYY-MM-DD, got {row.get('date')!r}")
+
+        day_str = day.strftime("%Y-%m-%d")
+
+        if kind in ("semester_start", "semester_end"):
+            key = "SEMESTER_START" if kind == "semester_start" else "SEMESTER_END"
+            if settings[key] is not None:
+                raise ValueError(f"{where}: more than one {kind} row")
+            settings[key] = day
+
+        elif kind == "holiday":
+            settings["HOLIDAYS"].add(day_str)
 
-WORKING_SATURDAYS = {
-    "2026-01-24": "Monday",
-    "2026-01-31": "Wednesday",
-    "2026-02-14": "Friday",
-    "2026-02-28": "Wednesday",
-    "2026-03-14": "Thursday",
-    "2026-03-28": "Friday",
-    "2026-04-11": "Test",      # Mid-sem test day
-    "2026-04-25": "Tuesday",
-}
+        elif kind == "working_saturday":
+            if day.weekday() != 5:
+                raise ValueError(f"{where}: {day_str} is a {WEEKDAY_NAMES[day.weekday()]}, not a Saturday")
+            if follows != "Test" and follows not in WEEKDAY_NAMES[:5]:
+                raise ValueError(f"{where}: follows must be a weekday name or Test, got {follows!r}")
+            settings["WORKING_SATURDAYS"][day_str] = follows
 
-MID_SEM_DAYS = {
-    # 1st MST
-    "2026-02-17", "2026-02-18", "2026-02-19", "2026-02-20",
+        elif kind == "mid_sem":
+            settings["MID_SEM_DAYS"].add(day_str)
 
-    # Lab MST week
-    "2026-03-23", "2026-03-24", "2026-03-25",
-    "2026-03-26", "2026-03-28",
+        else:
+            raise ValueError(f"{where}: unknown kind {kind!r} (expected one of {', '.join(CALENDAR_KINDS)})")
 
-    # 2nd MST
-    "2026-04-08", "2026-04-09", "2026-04-10", "2026-04-11",
-}
+    for key in ("SEMESTER_START", "SEMESTER_END"):
+        if settings[key] is None:
+            raise ValueError(f"{source}: missing {key.lower()} row")
+
+    if settings["SEMESTER_START"] > settings["SEMESTER_END"]:
+        raise ValueError(f"{source}: semester_start is after semester_end")
+
+    return build_calendar(settings)
+
+
+def build_calendar(settings):
+    """
+    Adds a read-only per-day index to the semester settings, covering
+    the semester and every dated entry:
+    - dates         : datetime64[D] vector
+    - teaching      : bool, same rule as is_teaching_day
+    - timetable_day : int8 weekday followed (0 = Mon … 6 = Sun, -1 = test only)
+    """
+
+    listed = [
+        datetime.strptime(d, "%Y-%m-%d")
+        for group in ("HOLIDAYS", "WORKING_SATURDAYS", "MID_SEM_DAYS")
+        for d in settings[group]
+    ]
+    first = min([settings["SEMESTER_START"]] + listed)
+    last = max([settings["SEMESTER_END"]] + listed)
+
+    dates = np.arange(
+        np.datetime64(first.date(), "D"),
+        np.datetime64(last.date(), "D") + 1
+    )
+    day_strs = dates.astype(str)
+    # Day 0 of datetime64[D] (1970-01-01) was a Thursday
+    weekday = ((dates.view("int64") + 3) % 7).astype(np.int8)
+
+    timetable_day = weekday.copy()
+    working = np.zeros(len(dates), dtype=bool)
+
+    for day_str, followed in settings["WORKING_SATURDAYS"].items():
+        i = int((np.datetime64(day_str, "D") - dates[0]).astype(int))
+        timetable_day[i] = -1 if followed == "Test" else WEEKDAY_NAMES.index(followed)
+        working[i] = followed != "Test" and weekday[i] == 5
+
+    in_semester = (
+        (dates >= np.datetime64(settings["SEMESTER_START"].date(), "D")) &
+        (dates <= np.datetime64(settings["SEMESTER_END"].date(), "D"))
+    )
+    teaching = (
+        in_semester &
+        (weekday != 6) &
+        ~np.isin(day_strs, list(settings["HOLIDAYS"])) &
+        ~np.isin(day_strs, list(settings["MID_SEM_DAYS"])) &
+        ((weekday < 5) | working)
+    )
+
+    for array in (dates, teaching, timetable_day):
+        array.flags.writeable = False
+
+    return dict(settings, dates=dates, teaching=teaching, timetable_day=timetable_day)
+
+
+# ==============================
+# ACTIVE SEMESTER
+# ==============================
+
+CALENDAR = load_calendar()
+
+SEMESTER_START = CALENDAR["SEMESTER_START"]
+SEMESTER_END = CALENDAR["SEMESTER_END"]
+HOLIDAYS = CALENDAR["HOLIDAYS"]
+WORKING_SATURDAYS = CALENDAR["WORKING_SATURDAYS"]
+MID_SEM_DAYS = CALENDAR["MID_SEM_DAYS"]
 
 
 # ==============================
@@ -139,12 +271,5 @@ def get_all_teaching_days():
     valid teaching days in the semester.
     Saturdays are INCLUDED if they pass the rules.
     """
-    days = []
-    current = SEMESTER_START
-
-    while current <= SEMESTER_END:
-        if is_teaching_day(current):
-            days.append(current)
-        current += timedelta(days=1)
 
-    return days
+    return CALENDAR["dates"][CALENDAR["teaching"]].astype("datetime64[us]").tolist()
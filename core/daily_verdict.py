@@ -1,3 +1,9 @@
+import numpy as np
+import pandas as pd
+
+from core.bunk_plan import cohort_class_verdicts
+
+
 def daily_verdict(today_classes):
     if not today_classes:
         return None
@@ -35,3 +41,79 @@ def daily_verdict(today_classes):
         "status": "SAFE",
         "reason": f"{votes['SAFE']} class(es) voted SAFE."
     }
+
+
+# ==============================
+# ARRAY-BACKED VERDICTS
+# ==============================
+# Class status codes line up with core.bunk_plan verdict codes:
+# 0 = SAFE, 1 = RISKY, 2 = MUST ATTEND / NOT SAFE, -1 = no class.
+
+STATUS_CODES = {"SAFE": 0, "RISKY": 1, "MUST ATTEND": 2}
+DAY_VERDICTS = ["SAFE", "RISKY", "NOT SAFE"]
+
+
+def status_codes(statuses):
+    """
+    Converts class status strings to codes.
+    Anything that is not MUST ATTEND or RISKY counts as SAFE,
+    same as daily_verdict.
+    """
+
+    return pd.Series(statuses, dtype=object).map(STATUS_CODES).fillna(0).to_numpy(dtype=np.int8)
+
+
+def daily_verdicts(class_codes):
+    """
+    Majority verdict over the last axis of a (..., classes) code array,
+    e.g. students × days × slots. Danger wins ties, then RISKY.
+
+    Returns (verdict codes, votes) where verdict is -1 for days
+    without classes and votes has a trailing axis of size 3
+    (SAFE, RISKY, NOT SAFE counts).
+    """
+
+    class_codes = np.asarray(class_codes)
+
+    votes = np.stack([(class_codes == code).sum(axis=-1) for code in range(3)], axis=-1)
+    safe, risky, not_safe = votes[..., 0], votes[..., 1], votes[..., 2]
+
+    verdict = np.where(
+        not_safe >= np.maximum(risky, safe),
+        2,
+        np.where(risky >= safe, 1, 0)
+    ).astype(np.int8)
+    verdict[votes.sum(axis=-1) == 0] = -1
+
+    return verdict, votes
+
+
+def at_risk_report(students, attended, total, day_subjects):
+    """
+    Cohort "who is at risk on this day" report.
+
+    students     : student ids (len = n_students)
+    attended     : students × subjects current attended counts
+    total        : students × subjects current delivered counts
+    day_subjects : slots vector of subject indices for that day (-1 = free)
+
+    Returns students whose day verdict is RISKY or NOT SAFE,
+    most at risk first.
+    """
+
+    class_codes, _ = cohort_class_verdicts(attended, total, np.asarray(day_subjects)[None, :])
+    verdict, votes = daily_verdicts(class_codes[:, 0, :])
+
+    at_risk = verdict >= 1
+    report = pd.DataFrame({
+        "student": np.asarray(students)[at_risk],
+        "verdict": pd.Categorical.from_codes(verdict[at_risk], DAY_VERDICTS),
+        "not_safe_classes": votes[at_risk, 2],
+        "risky_classes": votes[at_risk, 1]
+    })
+
+    return report.sort_values(
+        ["verdict", "not_safe_classes", "risky_classes"],
+        ascending=False,
+        kind="stable"
+    ).reset_index(drop=True)
@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+
+from utils.subject_map import subject_names
+
+
+# ==============================
+# DAY PLAN SIMULATION
+# ==============================
+
+def simulate_day_plan(counts, attend, holiday, base_attended, base_total):
+    """
+    Simulates a day-by-day attend/skip plan.
+
+    counts        : days × subjects class-count matrix
+    attend        : bool vector over days (True = attend)
+    holiday       : bool vector over days (True = no classes held)
+    base_attended : per-subject attended so far (aligned to counts columns)
+    base_total    : per-subject delivered so far
+
+    Returns a dict of per-subject extras and per-day cumulative
+    percentages (days × subjects, plus an overall vector).
+    """
+
+    counts = np.asarray(counts)
+    held = ~np.asarray(holiday, dtype=bool)
+    attend_vec = np.asarray(attend, dtype=bool) & held
+    skip_vec = held & ~attend_vec
+
+    attended_extra = attend_vec.astype(counts.dtype) @ counts
+    skipped_extra = skip_vec.astype(counts.dtype) @ counts
+
+    # Per-day trajectory: running totals after each planned day
+    cum_attended = np.cumsum(counts * attend_vec[:, None], axis=0)
+    cum_total = np.cumsum(counts * held[:, None], axis=0)
+
+    attended_path = np.asarray(base_attended) + cum_attended
+    total_path = np.asarray(base_total) + cum_total
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        subject_path = np.where(total_path > 0, attended_path / total_path * 100, 0.0)
+
+        overall_att = attended_path.sum(axis=1)
+        overall_tot = total_path.sum(axis=1)
+        overall_path = np.where(overall_tot > 0, overall_att / overall_tot * 100, 0.0)
+
+    return {
+        "attended_extra": attended_extra,
+        "skipped_extra": skipped_extra,
+        "subject_path": subject_path.round(2),
+        "overall_path": overall_path.round(2)
+    }
+
+
+def _impact_columns(attended, total):
+    percent = np.where(total > 0, np.round(attended / np.maximum(total, 1) * 100, 2), 0.0)
+
+    # Classes needed to reach 75%: 3·total − 4·attended
+    needed = np.where(percent < 75, 3 * total - 4 * attended, 0)
+
+    return percent, needed
+
+
+def day_plan_impact(att, result):
+    """
+    Builds the "Attendance Impact" table (one row per subject
+    plus an Overall Attendance row) from simulate_day_plan output.
+    `att` must be aligned with the counts columns.
+    """
+
+    base_attended = att["attended"].to_numpy(dtype=np.int64)
+    base_total = att["total"].to_numpy(dtype=np.int64)
+    attended_extra = result["attended_extra"].astype(np.int64)
+    skipped_extra = result["skipped_extra"].astype(np.int64)
+
+    attended = np.append(base_attended + attended_extra, base_attended.sum() + attended_extra.sum())
+    total = np.append(
+        base_total + attended_extra + skipped_extra,
+        base_total.sum() + attended_extra.sum() + skipped_extra.sum()
+    )
+    percent, needed = _impact_columns(attended, total)
+
+    subjects = subject_names(att["code"]).tolist()
+
+    return pd.DataFrame({
+        "Subject": subjects + ["Overall Attendance"],
+        "Attended (Planned)": np.append(attended_extra, attended_extra.sum()),
+        "Skipped (Planned)": np.append(skipped_extra, skipped_extra.sum()),
+        "Final %": percent,
+        "Classes Needed for 75%": [int(n) if n > 0 else "—" for n in needed],
+        "Status": np.where(percent < 75, "⚠️ Below 75%", "✅ Safe")
+    })
+
+
+def day_plan_trajectory(att, dates, result):
+    """
+    Day-by-day cumulative attendance % (one column per subject
+    plus Overall), indexed by date. Ready for st.line_chart.
+    """
+
+    subjects = subject_names(att["code"]).tolist()
+
+    chart_df = pd.DataFrame(result["subject_path"], columns=subjects, index=pd.to_datetime(list(dates)))
+    chart_df.insert(0, "Overall", result["overall_path"])
+    chart_df.index.name = "Date"
+
+    return chart_df
+
+
+# ==============================
+# BULK ACTIONS
+# ==============================
+
+BULK_ACTIONS = ["Skip", "Attend", "Mark holiday", "Clear holiday"]
+
+
+def bulk_update(dates, attend, holiday, weekday, action):
+    """
+    Applies one bulk action to every date falling on `weekday`
+    (0 = Monday … 6 = Sunday, None = every day).
+    Returns new (attend, holiday) arrays; inputs are not modified.
+    """
+
+    attend = np.array(attend, dtype=bool)
+    holiday = np.array(holiday, dtype=bool)
+
+    weekdays = np.fromiter((d.weekday() for d in dates), dtype=np.int8, count=len(dates))
+    mask = np.ones(len(dates), dtype=bool) if weekday is None else weekdays == weekday
+
+    if action == "Skip":
+        attend[mask] = False
+    elif action == "Attend":
+        attend[mask & ~holiday] = True
+    elif action == "Mark holiday":
+        holiday[mask] = True
+        attend[mask] = False
+    elif action == "Clear holiday":
+        holiday[mask] = False
+    else:
+        raise ValueError(f"Unknown bulk action: {action}")
+
+    return attend, holiday
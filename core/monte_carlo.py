@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from core import calendar_logic
+from core.schedule import day_subject_counts, teaching_day_mask, weekly_class_matrix
+
+# ==============================
+# MONTE CARLO FORECAST
+# ==============================
+# Each subject's attendance propensity is Beta(attended + 1, missed + 1)
+# (the student's history with a uniform prior). A path draws a propensity
+# per subject, then the classes it attends in each step of the remaining
+# schedule as Binomial(classes, propensity).
+
+PERCENTILES = (10, 25, 50, 75, 90)
+THRESHOLD = 75
+
+
+def remaining_schedule(att, timetable_df, start, end=None, calendar=None, step_days=7):
+    """
+    Classes still to be held per subject, grouped into steps of
+    `step_days` from `start` (teaching days only, per `calendar`).
+
+    Returns a dict:
+    - steps  : datetime64[D] first day of each step
+    - counts : int64 steps × subjects (att order)
+    """
+
+    calendar = calendar or calendar_logic.CALENDAR
+    end = calendar["SEMESTER_END"] if end is None else end
+
+    start = start.date() if isinstance(start, datetime) else start
+    end = end.date() if isinstance(end, datetime) else end
+    n_days = max(0, (end - start).days + 1)
+    dates = [start + timedelta(days=i) for i in range(n_days)]
+
+    codes = att["code"].tolist()
+    daily = day_subject_counts(dates, weekly_class_matrix(timetable_df, codes), calendar)
+    daily = daily.astype(np.int64) * teaching_day_mask(dates, calendar)[:, None]
+
+    boundaries = np.arange(0, n_days, step_days)
+    counts = (
+        np.add.reduceat(daily, boundaries, axis=0)
+        if n_days else np.zeros((0, len(codes)), dtype=np.int64)
+    )
+
+    return {
+        "steps": np.datetime64(start, "D") + boundaries,
+        "counts": counts
+    }
+
+
+def _propensity_draws(attended, total, n_paths, rng):
+    missed = total - attended
+    return rng.beta(attended + 1, missed + 1, size=(n_paths,) + attended.shape)
+
+
+def monte_carlo_forecast(attended, total, step_counts, n_paths=10_000, seed=None):
+    """
+    Simulates `n_paths` semester paths for one student.
+
+    attended, total : per-subject counts so far, shape (S,)
+    step_counts     : classes held per step, shape (T, S)
+
+    Returns a dict:
+    - propensity : (S,) posterior mean attendance rate
+    - p_below    : (S,) probability of finishing below 75%
+    - p_any_below: probability that at least one subject finishes below 75%
+    - bands      : (len(PERCENTILES), T, S) percentiles of attendance %
+                   after each step
+    - final      : (len(PERCENTILES), S) percentiles of the final %
+    """
+
+    rng = np.random.default_rng(seed)
+
+    attended = np.asarray(attended, dtype=np.int64)
+    total = np.asarray(total, dtype=np.int64)
+    step_counts = np.asarray(step_counts, dtype=np.int64)
+
+    p = _propensity_draws(attended, total, n_paths, rng)                 # paths × S
+    attended_steps = rng.binomial(step_counts[None], p[:, None, :])     # paths × T × S
+
+    attended_path = attended + np.cumsum(attended_steps, axis=1, dtype=np.int64)
+    total_path = total + np.cumsum(step_counts, axis=0)                 # T × S
+
+    percent = attended_path / np.maximum(total_path, 1) * 100
+    final = (
+        percent[:, -1, :]
+        if len(step_counts) else
+        np.broadcast_to(attended / np.maximum(total, 1) * 100, p.shape)
+    )
+    below = final < THRESHOLD
+
+    return {
+        "propensity": (attended + 1) / (total + 2),
+        "p_below": below.mean(axis=0),
+        "p_any_below": float(below.any(axis=1).mean()),
+        "bands": np.percentile(percent, PERCENTILES, axis=0),
+        "final": np.percentile(final, PERCENTILES, axis=0)
+    }
+
+
+def cohort_below_probability(attended, total, remaining, n_paths=1_000, seed=None, chunk=1_000):
+    """
+    Probability of finishing below 75% for a whole cohort, per student
+    and subject. Only final totals are needed, so each path draws
+    Binomial(remaining, propensity) once per subject.
+
+    attended, total : (N, S) counts so far
+    remaining       : (S,) classes left in the semester
+    Returns (N, S) probabilities. Students are processed `chunk` at a time.
+    """
+
+    rng = np.random.default_rng(seed)
+
+    attended = np.asarray(attended, dtype=np.int64)
+    total = np.asarray(total, dtype=np.int64)
+    remaining = np.asarray(remaining, dtype=np.int64)
+
+    final_total = np.maximum(total + remaining, 1)
+    result = np.empty(attended.shape, dtype=np.float64)
+
+    for lo in range(0, len(attended), chunk):
+        a = attended[lo:lo + chunk]
+        p = _propensity_draws(a, total[lo:lo + chunk], n_paths, rng)    # paths × n × S
+        final = a + rng.binomial(remaining, p)
+        result[lo:lo + chunk] = (final / final_total[lo:lo + chunk] * 100 < THRESHOLD).mean(axis=0)
+
+    return result
@@ -0,0 +1,121 @@
+import base64
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from core import calendar_logic
+
+# ==============================
+# DAY PLANNER DECISION STATE
+# ==============================
+# One attend bit and one holiday bit per semester day, indexed by
+# day ordinal (0 = SEMESTER_START). Size is fixed per semester, so
+# session memory does not grow as users move the planner range.
+
+
+def _as_date(d):
+    return d.date() if isinstance(d, datetime) else d
+
+
+def new_planner_state(start=None, end=None, calendar=None):
+    """
+    Default decisions for every day in [start, end]:
+    attend Mon–Fri, skip weekends, calendar holidays marked holiday.
+
+    `calendar` is a compiled calendar (default: the active semester);
+    start and end default to its semester.
+    """
+
+    calendar = calendar or calendar_logic.CALENDAR
+    start = _as_date(calendar["SEMESTER_START"] if start is None else start)
+    end = _as_date(calendar["SEMESTER_END"] if end is None else end)
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+    holiday = np.isin([d.isoformat() for d in days], list(calendar["HOLIDAYS"]))
+    weekday = np.fromiter((d.weekday() for d in days), dtype=np.int8, count=len(days))
+    attend = (weekday < 5) & ~holiday
+
+    return {
+        "start": start,
+        "attend": attend,
+        "holiday": holiday
+    }
+
+
+def day_ordinals(state, dates):
+    """
+    Index of each date in the state arrays.
+    Raises ValueError for dates outside the semester.
+    """
+
+    start = state["start"].toordinal()
+    ordinals = np.fromiter((_as_date(d).toordinal() - start for d in dates), dtype=np.int64, count=len(dates))
+
+    if len(ordinals) and (ordinals.min() < 0 or ordinals.max() >= len(state["attend"])):
+        raise ValueError("Date outside the planner semester range")
+
+    return ordinals
+
+
+def get_decisions(state, dates):
+    """
+    Returns (attend, holiday) bool arrays for `dates`.
+    """
+
+    idx = day_ordinals(state, dates)
+    return state["attend"][idx], state["holiday"][idx]
+
+
+def set_decisions(state, dates, attend, holiday):
+    """
+    Stores decisions for `dates` in place.
+    Holiday always wins: a holiday day is never attended.
+    """
+
+    idx = day_ordinals(state, dates)
+    holiday = np.asarray(holiday, dtype=bool)
+
+    state["holiday"][idx] = holiday
+    state["attend"][idx] = np.asarray(attend, dtype=bool) & ~holiday
+
+
+# ==============================
+# SERIALIZE / RESTORE
+# ==============================
+
+def serialize_planner_state(state):
+    """
+    Packs the state into a short ASCII string:
+    "<start ISO date>:<day count>:<base64 bitset>"
+    """
+
+    n_days = len(state["attend"])
+    bits = np.packbits(np.concatenate([state["attend"], state["holiday"]]))
+
+    return f"{state['start'].isoformat()}:{n_days}:{base64.b64encode(bits.tobytes()).decode('ascii')}"
+
+
+def restore_planner_state(blob):
+    """
+    Inverse of serialize_planner_state.
+    Raises ValueError on malformed input.
+    """
+
+    try:
+        start_text, n_text, payload = blob.strip().split(":")
+        start = date.fromisoformat(start_text)
+        n_days = int(n_text)
+        bits = np.unpackbits(np.frombuffer(base64.b64decode(payload, validate=True), dtype=np.uint8))
+    except (AttributeError, ValueError, TypeError) as exc:
+        raise ValueError("Invalid planner state") from exc
+
+    if n_days <= 0 or len(bits) < 2 * n_days:
+        raise ValueError("Invalid planner state")
+
+    bits = bits[:2 * n_days].astype(bool)
+
+    return {
+        "start": start,
+        "attend": bits[:n_days].copy(),
+        "holiday": bits[n_days:].copy()
+    }
@@ -1,5 +1,8 @@
 from collections import defaultdict
-from utils.subject_map import SUBJECT_MAP
+
+import numpy as np
+
+from utils.subject_map import subject_name
 
 
 def predict(attended, total, weeks, classes_per_week):
@@ -18,7 +21,7 @@ def enrich_verdicts(verdicts):
         enriched.append({
             "day": v["day"],
             "time": v["time"],
-            "subject": SUBJECT_MAP.get(v.get("subject") or v.get("code"), v.get("subject") or v.get("code")),
+            "subject": subject_name(v.get("subject") or v.get("code")),
             "status": v["status"],
             "percent": v["percent"]
         })
@@ -31,3 +34,24 @@ def group_weekly(verdicts):
     for v in verdicts:
         weekly[v["day"]].append(v)
     return weekly
+
+
+# ==============================
+# ARRAY-BACKED VARIANTS
+# ==============================
+
+def group_weekly_index(days):
+    """
+    Groups verdict rows by day without copying them.
+    Returns {day: row indices}, each index array in original order,
+    to be used against column arrays (codes, statuses, percents).
+    """
+
+    days = np.asarray(days)
+    if len(days) == 0:
+        return {}
+
+    order = np.argsort(days, kind="stable")
+    keys, starts = np.unique(days[order], return_index=True)
+
+    return dict(zip(keys.tolist(), np.split(order, starts[1:])))
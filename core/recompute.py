@@ -0,0 +1,176 @@
+import numpy as np
+import pandas as pd
+
+from core.recovery import classes_needed
+from core.schedule import day_subject_counts, effective_day_indices, teaching_day_mask, weekly_class_matrix
+
+# ==============================
+# INCREMENTAL RECOMPUTE
+# ==============================
+# A calendar edit (new holiday, working Saturday now following another
+# weekday) or a timetable edit changes the class count of a few
+# (date, subject) cells. changed_cells() finds those cells by looking only
+# at the dates that can differ. CohortViews then patches the stored
+# totals and cumulative counts with them. It re-derives recovery dates
+# only for students whose date falls on or after the first changed day
+# of an affected subject.
+
+
+def class_counts(dates, weekly_matrix, calendar):
+    """
+    dates × subjects classes held, 0 on non-teaching days.
+    """
+
+    counts = day_subject_counts(dates, weekly_matrix, calendar).astype(np.int64)
+    return counts * teaching_day_mask(dates, calendar)[:, None]
+
+
+def _day_rows(dates, calendar):
+    # Timetable row each date follows, -2 when no classes are held
+    return np.where(teaching_day_mask(dates, calendar), effective_day_indices(dates, calendar), -2)
+
+
+def changed_cells(old_calendar, new_calendar, old_matrix, new_matrix):
+    """
+    Dates whose class counts differ between the old and new calendar /
+    weekly matrix (same subject columns), and the change new − old
+    (dates × subjects). Only candidate dates are evaluated: days whose
+    teaching flag or timetable day changed, and days following a
+    weekday whose timetable row changed.
+    """
+
+    first = min(old_calendar["dates"][0], new_calendar["dates"][0])
+    last = max(old_calendar["dates"][-1], new_calendar["dates"][-1])
+    dates = np.arange(first, last + 1)
+
+    old_rows = _day_rows(dates, old_calendar)
+    new_rows = _day_rows(dates, new_calendar)
+    edited = np.flatnonzero((old_matrix != new_matrix).any(axis=1))
+
+    candidates = dates[(old_rows != new_rows) | np.isin(old_rows, edited) | np.isin(new_rows, edited)]
+
+    delta = (
+        class_counts(candidates, new_matrix, new_calendar) -
+        class_counts(candidates, old_matrix, old_calendar)
+    )
+    keep = delta.any(axis=1)
+
+    return candidates[keep], delta[keep]
+
+
+def cells_frame(dates, delta, codes):
+    """
+    Long form of changed_cells output: one (date, code, delta) row per
+    changed cell.
+    """
+
+    day, subject = np.nonzero(delta)
+    return pd.DataFrame({
+        "date": dates[day],
+        "code": np.asarray(codes, dtype=object)[subject],
+        "delta": delta[day, subject]
+    })
+
+
+# ==============================
+# COHORT VIEWS
+# ==============================
+
+class CohortViews:
+    """
+    Calendar-dependent views of one group's attendance (N students × S
+    subjects, columns in `codes` order), from `start` to the end of the
+    semester:
+    - totals     : (S,) classes in the whole semester
+    - remaining  : (S,) classes from `start` on
+    - cumulative : (D, S) classes held from `start` through each date
+    - recovery   : (N, S) index into `dates` of each student's recovery
+                   date (-1 = nothing to recover, D = unreachable)
+    """
+
+    def __init__(self, codes, attended, total, timetable_df, calendar, start):
+        self.codes = list(codes)
+        self.needed = classes_needed(attended, total)
+        self.matrix = weekly_class_matrix(timetable_df, self.codes)
+        self.calendar = calendar
+        self.start = np.datetime64(start, "D")
+        self._build()
+
+    def _build(self):
+        end = np.datetime64(self.calendar["SEMESTER_END"].date(), "D")
+        self.dates = np.arange(self.start, max(self.start, end + 1))
+
+        self.totals = class_counts(self.calendar["dates"], self.matrix, self.calendar).sum(axis=0)
+        self.cumulative = np.cumsum(class_counts(self.dates, self.matrix, self.calendar), axis=0)
+        self.remaining = (
+            self.cumulative[-1].copy() if len(self.dates) else np.zeros(len(self.codes), dtype=np.int64)
+        )
+
+        self.recovery = np.full(self.needed.shape, -1, dtype=np.int32)
+        self._update_recovery(np.arange(len(self.needed)), range(len(self.codes)))
+
+    def _update_recovery(self, students, subjects):
+        for s in subjects:
+            rows = students[self.needed[students, s] > 0]
+            self.recovery[rows, s] = np.searchsorted(self.cumulative[:, s], self.needed[rows, s], side="left")
+
+    def recovery_dates(self):
+        """
+        (N, S) datetime64[D] recovery dates, NaT if nothing to recover or
+        unreachable.
+        """
+
+        padded = np.append(self.dates, np.datetime64("NaT")).astype("datetime64[D]")
+        index = np.where(self.recovery < 0, len(self.dates), self.recovery)
+        return padded[index]
+
+    def apply_change(self, calendar=None, timetable_df=None):
+        """
+        Switches to the new calendar and/or timetable, patching only the
+        affected cells and students.
+
+        Returns a dict: cells (changed_cells as a date, code, delta frame)
+        and students (rows whose recovery was re-derived).
+        """
+
+        new_calendar = calendar or self.calendar
+        new_matrix = self.matrix if timetable_df is None else weekly_class_matrix(timetable_df, self.codes)
+
+        dates, delta = changed_cells(self.calendar, new_calendar, self.matrix, new_matrix)
+        moved_end = new_calendar["SEMESTER_END"] != self.calendar["SEMESTER_END"]
+
+        self.calendar, self.matrix = new_calendar, new_matrix
+
+        if moved_end:
+            # The date axis itself changes; rebuild everything
+            self._build()
+            return {
+                "cells": cells_frame(dates, delta, self.codes),
+                "students": np.arange(len(self.needed))
+            }
+
+        self.totals = self.totals + delta.sum(axis=0)
+
+        in_view = (dates >= self.start) & (dates < self.start + len(self.dates))
+        offsets = (dates[in_view] - self.start).astype(np.int64)
+        view_delta = delta[in_view]
+
+        affected = []
+        for s in np.flatnonzero(view_delta.any(axis=0)):
+            changes = np.zeros(len(self.dates), dtype=np.int64)
+            np.add.at(changes, offsets, view_delta[:, s])
+
+            self.cumulative[:, s] += np.cumsum(changes)
+            self.remaining[s] = self.cumulative[-1, s]
+
+            # Dates before the first change keep their cumulative counts,
+            # so only later (or unreachable) recoveries can move
+            first = offsets[view_delta[:, s] != 0].min()
+            students = np.flatnonzero((self.needed[:, s] > 0) & (self.recovery[:, s] >= first))
+            self._update_recovery(students, [s])
+            affected.append(students)
+
+        return {
+            "cells": cells_frame(dates, delta, self.codes),
+            "students": np.unique(np.concatenate(affected)) if affected else np.zeros(0, dtype=np.int64)
+        }
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from core import calendar_logic
+from core.schedule import day_subject_counts, teaching_day_mask, weekly_class_matrix
+
+
+# ==============================
+# RECOVERY DATES
+# ==============================
+
+def classes_needed(attended, total):
+    """
+    Classes to attend in a row to reach 75% (3·total − 4·attended),
+    0 for subjects already at 75% or not started. Same rule as
+    compute_priority's "needed".
+    """
+
+    attended = np.asarray(attended, dtype=np.int64)
+    total = np.asarray(total, dtype=np.int64)
+
+    percent = np.round(attended / np.maximum(total, 1) * 100, 2)
+    needed = np.maximum(0, 3 * total - 4 * attended)
+
+    return np.where((total > 0) & (percent < 75), needed, 0)
+
+
+def recovery_dates(att, timetable_df, start, end=None, calendar=None):
+    """
+    For every subject in `att`, the first date in [start, end] by the end
+    of which attending every remaining class brings it back to 75%.
+    Holidays, mid-sem days and working Saturdays follow `calendar`
+    (default: the active semester); `end` defaults to its last day.
+
+    Returns a dict of arrays aligned with att rows:
+    - needed    : classes needed (0 = nothing to recover)
+    - date      : datetime64[D] recovery date (NaT if nothing to recover
+                  or unreachable)
+    - days      : calendar days from `start` to that date, inclusive (-1 if NaT)
+    - reachable : False when the semester runs out of classes first
+    """
+
+    calendar = calendar or calendar_logic.CALENDAR
+    end = calendar["SEMESTER_END"] if end is None else end
+
+    start = start.date() if isinstance(start, datetime) else start
+    end = end.date() if isinstance(end, datetime) else end
+    n_days = max(0, (end - start).days + 1)
+    dates = [start + timedelta(days=i) for i in range(n_days)]
+
+    codes = att["code"].tolist()
+    needed = classes_needed(att["attended"].to_numpy(), att["total"].to_numpy())
+
+    # Cumulative classes per subject over the remaining teaching days
+    counts = day_subject_counts(dates, weekly_class_matrix(timetable_df, codes), calendar)
+    counts = counts * teaching_day_mask(dates, calendar)[:, None]
+    cumulative = np.cumsum(counts, axis=0, dtype=np.int64)
+
+    # One binary search for all subjects: lay the (non-decreasing) columns
+    # end to end, each shifted above the previous one.
+    n_subjects = len(codes)
+    shift = (cumulative[-1].max() + 1) if n_days else 1
+    offsets = np.arange(n_subjects, dtype=np.int64) * shift
+    flat = (cumulative + offsets).T.ravel()
+
+    first = np.searchsorted(flat, needed + offsets, side="left") - np.arange(n_subjects) * n_days
+
+    reachable = (needed == 0) | (first < n_days)
+    has_date = (needed > 0) & reachable
+
+    date = np.full(n_subjects, np.datetime64("NaT"), dtype="datetime64[D]")
+    date[has_date] = np.datetime64(start, "D") + first[has_date]
+
+    return {
+        "codes": codes,
+        "needed": needed,
+        "date": date,
+        "days": np.where(has_date, first + 1, -1),
+        "reachable": reachable
+    }
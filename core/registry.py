@@ -0,0 +1,215 @@
+import csv
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+from core.calendar_logic import load_calendar
+from utils.timetable_parser import parse_timetable
+
+# ==============================
+# COHORT REGISTRY
+# ==============================
+# Calendars and timetables for every (programme, semester, group) the
+# deployment serves, listed in a manifest (data/cohorts.csv). Entries are
+# loaded on first use and kept in an LRU; the least recently used ones
+# are evicted once their estimated size exceeds the memory budget.
+# Entries edited in memory (update()) are pinned: reloading them from
+# disk would lose the edit.
+#
+# ATTENDWISE_COHORTS      manifest path (default: data/cohorts.csv)
+# ATTENDWISE_REGISTRY_MB  memory budget in MB (default: 256)
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+MANIFEST_PATH = Path(os.environ.get("ATTENDWISE_COHORTS", DATA_DIR / "cohorts.csv"))
+BUDGET_BYTES = int(float(os.environ.get("ATTENDWISE_REGISTRY_MB", "256")) * 1024 * 1024)
+
+MANIFEST_COLUMNS = ["programme", "semester", "group", "calendar", "timetable"]
+
+
+def read_manifest(path=MANIFEST_PATH):
+    """
+    (programme, semester, group) → {"calendar": Path, "timetable": Path}.
+    Relative paths are resolved against the manifest's directory.
+    Raises ValueError on missing columns or duplicate cohorts.
+    """
+
+    path = Path(path)
+    cohorts = {}
+
+    with open(path, newline="", encoding="utf-8-sig") as manifest_file:
+        reader = csv.DictReader(manifest_file)
+
+        missing = set(MANIFEST_COLUMNS) - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"{path}: missing columns {', '.join(sorted(missing))}")
+
+        for line_no, row in enumerate(reader, start=2):
+            key = (row["programme"].strip(), row["semester"].strip(), row["group"].strip())
+            if key in cohorts:
+                raise ValueError(f"{path}:{line_no}: duplicate cohort {key}")
+
+            cohorts[key] = {
+                "calendar": path.parent / row["calendar"].strip(),
+                "timetable": path.parent / row["timetable"].strip()
+            }
+
+    return cohorts
+
+
+def entry_nbytes(entry):
+    """
+    Rough memory footprint of a loaded cohort (arrays + frames).
+    """
+
+    calendar = entry["calendar"]
+    size = sum(calendar[name].nbytes for name in ("dates", "teaching", "timetable_day"))
+
+    for name in ("timetable", "raw_timetable"):
+        size += int(entry[name].memory_usage(deep=True).sum())
+
+    return size
+
+
+class CohortRegistry:
+    """
+    LRU of loaded cohorts. get() is a dict lookup once a cohort is loaded;
+    a miss loads it outside the lock, so other cohorts stay available.
+    """
+
+    def __init__(self, manifest_path=MANIFEST_PATH, budget_bytes=BUDGET_BYTES):
+        self.manifest = read_manifest(manifest_path)
+        self.budget_bytes = budget_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def cohorts(self):
+        return list(self.manifest)
+
+    def groups(self, programme, semester):
+        return [g for p, s, g in self.manifest if (p, s) == (programme, semester)]
+
+    def get(self, programme, semester, group):
+        """
+        Loaded cohort for the key, as a dict with calendar (compiled),
+        timetable (long form), raw_timetable (grid), derived (per-cohort
+        artefacts, see core.artefacts) and nbytes; edited entries also
+        carry pinned=True.
+        Raises KeyError for cohorts not in the manifest.
+        """
+
+        key = (programme, semester, group)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        files = self.manifest[key]
+        raw = pd.read_excel(files["timetable"])
+        entry = {
+            "key": key,
+            "calendar": load_calendar(files["calendar"], cache=False),
+            "timetable": parse_timetable(files["timetable"]),
+            "raw_timetable": raw,
+            "derived": {}
+        }
+        entry["nbytes"] = entry_nbytes(entry)
+
+        with self._lock:
+            # Another thread may have loaded it meanwhile; keep the first
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+            self.misses += 1
+            self._entries[key] = entry
+            self.nbytes += entry["nbytes"]
+
+            self._evict(keep=key)
+
+        return entry
+
+    def update(self, entry, **fields):
+        """
+        Replaces fields of a loaded entry in place (an in-memory edit),
+        refreshes its size and pins it, so it is never evicted.
+        """
+
+        key = entry["key"]
+
+        with self._lock:
+            # The entry may have been evicted (and reloaded) since the
+            # caller fetched it; the edited one replaces whatever is there
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous["nbytes"]
+
+            entry.update(fields)
+            entry["nbytes"] = entry_nbytes(entry)
+            entry["pinned"] = True
+
+            self._entries[key] = entry
+            self.nbytes += entry["nbytes"]
+
+            self._evict(keep=key)
+
+    def _evict(self, keep):
+        # Least recently used first, skipping pinned entries. `keep` (the
+        # entry just loaded or edited) stays even if it alone is over budget.
+        for key in list(self._entries):
+            if self.nbytes <= self.budget_bytes:
+                break
+
+            entry = self._entries[key]
+            if key == keep or entry.get("pinned"):
+                continue
+
+            del self._entries[key]
+            self.nbytes -= entry["nbytes"]
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "loaded": len(self._entries),
+                "cohorts": len(self.manifest),
+                "nbytes": self.nbytes,
+                "budget_bytes": self.budget_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_registry():
+    """
+    Process-wide registry built from MANIFEST_PATH.
+    """
+
+    global _default
+
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = CohortRegistry()
+
+    return _default
@@ -0,0 +1,151 @@
+import os
+from pathlib import Path
+
+import joblib
+import numpy as np
+import sklearn
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+# ==============================
+# COHORT RISK MODEL
+# ==============================
+# A small classifier for "finishes the semester below 75%", trained on
+# past semesters. Features are the priority engine's numbers per
+# (student, subject), computed for the whole cohort at once; scoring is
+# one predict_proba over the feature matrix.
+#
+# ATTENDWISE_RISK_MODEL   model file (default: data/models/risk_model.joblib)
+
+MODEL_PATH = Path(os.environ.get(
+    "ATTENDWISE_RISK_MODEL",
+    Path(__file__).resolve().parent.parent / "data" / "models" / "risk_model.joblib"
+))
+
+FEATURES = ["percent", "bunk_budget", "needed", "remaining", "is_lab"]
+HISTORY_COLUMNS = ["attended", "total", "remaining", "is_lab", "final_attended", "final_total"]
+
+
+# ==============================
+# FEATURES
+# ==============================
+
+def risk_features(attended, total, remaining, is_lab):
+    """
+    Feature matrix (n × len(FEATURES), float64), one row per
+    (student, subject). Same rules as compute_priority: percent is 0
+    and needed/bunk budget are 0 for subjects not started yet.
+    """
+
+    attended = np.asarray(attended, dtype=np.float64)
+    total = np.asarray(total, dtype=np.float64)
+    started = total > 0
+
+    percent = np.where(started, np.round(attended / np.maximum(total, 1) * 100, 2), 0.0)
+    needed = np.where(started & (percent < 75), np.maximum(0, np.ceil(3 * total - 4 * attended)), 0.0)
+    bunk_budget = np.where(started, np.maximum(0, np.floor(attended / 0.75 - total)), 0.0)
+
+    return np.column_stack([
+        percent,
+        bunk_budget,
+        needed,
+        np.broadcast_to(np.asarray(remaining, dtype=np.float64), percent.shape),
+        np.broadcast_to(np.asarray(is_lab, dtype=np.float64), percent.shape)
+    ])
+
+
+def history_labels(history):
+    """
+    1 where the subject finished below 75%, from a past-semester frame.
+    """
+
+    final_total = history["final_total"].to_numpy()
+    final_percent = history["final_attended"].to_numpy() / np.maximum(final_total, 1) * 100
+    return ((final_total > 0) & (final_percent < 75)).astype(np.int8)
+
+
+# ==============================
+# TRAINING
+# ==============================
+
+def train_risk_model(history):
+    """
+    Fits the classifier on past semesters.
+
+    `history` has one row per (student, subject) snapshot with
+    HISTORY_COLUMNS: the counts at snapshot time, classes remaining,
+    the lab flag, and the counts the semester actually ended with.
+    Raises ValueError on missing columns or a single-class history.
+    """
+
+    missing = set(HISTORY_COLUMNS) - set(history.columns)
+    if missing:
+        raise ValueError(f"history: missing columns {', '.join(sorted(missing))}")
+
+    labels = history_labels(history)
+    if len(np.unique(labels)) < 2:
+        raise ValueError("history: needs students both above and below 75%")
+
+    features = risk_features(
+        history["attended"], history["total"], history["remaining"], history["is_lab"]
+    )
+
+    model = make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000))
+    model.fit(features, labels)
+
+    return model
+
+
+def save_model(model, path=MODEL_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    joblib.dump({
+        "model": model,
+        "features": FEATURES,
+        "sklearn": sklearn.__version__
+    }, path)
+
+    return path
+
+
+def load_model(path=MODEL_PATH):
+    """
+    Model saved by save_model. Raises ValueError if it was trained on a
+    different feature set.
+    """
+
+    bundle = joblib.load(path)
+
+    if bundle.get("features") != FEATURES:
+        raise ValueError(f"{path}: trained on {bundle.get('features')}, expected {FEATURES}")
+
+    return bundle["model"]
+
+
+# ==============================
+# SCORING
+# ==============================
+
+def score(model, features):
+    """
+    Probability of finishing below 75% for every feature row.
+    """
+
+    return model.predict_proba(features)[:, 1]
+
+
+def score_cohort(model, cohort, remaining, is_lab):
+    """
+    Scores a long-form cohort frame (student, code, attended, total).
+    `remaining` and `is_lab` are aligned with its rows (e.g. mapped from
+    subject totals and the subject catalogue). Returns a copy with a
+    "risk" column.
+    """
+
+    features = risk_features(cohort["attended"], cohort["total"], remaining, is_lab)
+
+    scored = cohort.copy()
+    scored["risk"] = score(model, features)
+    return scored
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+from core import calendar_logic
+
+# ==============================
+# TIMETABLE INDEX
+# ==============================
+
+# Row order of the weekday × subject matrix.
+TIMETABLE_DAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+DAY_INDEX = {day: i for i, day in enumerate(TIMETABLE_DAYS)}
+
+
+def weekly_class_matrix(timetable_df, codes):
+    """
+    Builds a weekday × subject class-count matrix from the
+    long-form timetable (columns: day, time, code).
+
+    matrix[w, s] = classes of codes[s] on TIMETABLE_DAYS[w]
+    Timetable codes not present in `codes` are ignored.
+    """
+
+    matrix = np.zeros((len(TIMETABLE_DAYS), len(codes)), dtype=np.int32)
+
+    if timetable_df.empty:
+        return matrix
+
+    day_idx = _positions(timetable_df["day"], _day_index)
+    code_idx = _positions(timetable_df["code"], pd.Index(list(codes), dtype=object).get_indexer)
+
+    valid = (day_idx >= 0) & (code_idx >= 0)
+    np.add.at(matrix, (day_idx[valid], code_idx[valid]), 1)
+
+    return matrix
+
+
+def _day_index(days):
+    return (
+        pd.Series(days, dtype=object)
+        .astype(str)
+        .str.strip()
+        .str.lower()
+        .str[:3]
+        .map(DAY_INDEX)
+        .fillna(-1)
+        .to_numpy(dtype=np.intp)
+    )
+
+
+def _positions(values, lookup):
+    # lookup(labels) → position per label, -1 if unknown. Categorical
+    # columns (utils.schema) are looked up once per category.
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        table = np.append(lookup(values.cat.categories.astype(object)), -1).astype(np.intp)
+        return table[values.cat.codes.to_numpy()]
+
+    return np.asarray(lookup(values.astype(object)), dtype=np.intp)
+
+
+# ==============================
+# DATE → TIMETABLE DAY
+# ==============================
+
+def effective_day_indices(dates, calendar=None):
+    """
+    Maps each date to its row in TIMETABLE_DAYS using the
+    academic calendar (working Saturdays follow a weekday).
+    Test-only days map to -1.
+
+    `calendar` is a compiled calendar (default: the active semester).
+    """
+
+    days = np.array(dates, dtype="datetime64[D]")
+
+    # Outside the compiled calendar every date follows its own weekday
+    # (day 0 of datetime64[D], 1970-01-01, was a Thursday)
+    indices = ((days.view("int64") + 3) % 7).astype(np.int8)
+
+    calendar = calendar or calendar_logic.CALENDAR
+    offset = (days - calendar["dates"][0]).astype(np.int64)
+    known = (offset >= 0) & (offset < len(calendar["dates"]))
+    indices[known] = calendar["timetable_day"][offset[known]]
+
+    return indices
+
+
+def teaching_day_mask(dates, calendar=None):
+    """
+    Boolean vector, True where the date is a teaching day
+    (same rule as is_teaching_day).
+    """
+
+    days = np.array(dates, dtype="datetime64[D]")
+    calendar = calendar or calendar_logic.CALENDAR
+
+    offset = (days - calendar["dates"][0]).astype(np.int64)
+    known = (offset >= 0) & (offset < len(calendar["dates"]))
+
+    mask = np.zeros(len(days), dtype=bool)
+    mask[known] = calendar["teaching"][offset[known]]
+    return mask
+
+
+def day_subject_counts(dates, weekly_matrix, calendar=None):
+    """
+    Returns a days × subjects class-count matrix for the given dates.
+    Test-only days get an all-zero row.
+    """
+
+    # Extra zero row so that index -1 (test day) selects "no classes"
+    padded = np.vstack([weekly_matrix, np.zeros((1, weekly_matrix.shape[1]), dtype=weekly_matrix.dtype)])
+    return padded[effective_day_indices(dates, calendar)]
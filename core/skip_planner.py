@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from core.schedule import day_subject_counts, weekly_class_matrix
+from utils.subject_map import lab_mask, subject_names
+
+
+# ==============================
+# SKIP COLLEGE PLANNER
+# ==============================
+
+def skip_impact(att, timetable_df, from_date, till_date, skip_labs=True, calendar=None):
+    """
+    Impact of skipping every class between from_date and till_date
+    (inclusive), using the effective timetable day of each date
+    in `calendar` (default: the active semester).
+
+    Returns a dict:
+    - academic_days   : days in range with at least one class
+    - classes_skipped : total classes skipped
+    - table           : per-subject impact (only subjects that are skipped)
+    """
+
+    n_days = max(0, (till_date - from_date).days + 1)
+    dates = [from_date + timedelta(days=i) for i in range(n_days)]
+
+    codes = list(pd.unique(timetable_df["code"])) if not timetable_df.empty else []
+    counts = day_subject_counts(dates, weekly_class_matrix(timetable_df, codes), calendar)
+
+    academic_days = int((counts.sum(axis=1) > 0).sum())
+
+    skipped = counts.sum(axis=0)
+    if not skip_labs:
+        skipped = np.where(lab_mask(codes), 0, skipped)
+
+    # Classes skipped per attendance row (0 for codes not in the timetable)
+    index = pd.Index(codes, dtype=object).get_indexer(att["code"].astype(object))
+    per_row = np.append(skipped, 0)[index].astype(np.int64)
+
+    rows = att[per_row > 0]
+    bunk_count = per_row[per_row > 0]
+    attended = rows["attended"].to_numpy(dtype=np.int64)
+    delivered = rows["total"].to_numpy(dtype=np.int64)
+
+    current_percent = np.where(delivered > 0, np.round(attended / np.maximum(delivered, 1) * 100, 2), 0)
+    new_total = delivered + bunk_count
+    new_percent = np.round(attended / new_total * 100, 2)
+
+    # Classes needed to recover to 75%: 3·total − 4·attended
+    needed = np.where(new_percent < 75, 3 * new_total - 4 * attended, 0)
+
+    table = pd.DataFrame({
+        "Subject": subject_names(rows["code"]),
+        "Current %": current_percent,
+        "Classes Skipped": bunk_count,
+        "After Skip %": new_percent,
+        "Classes Needed for 75%": [int(n) if n > 0 else "—" for n in needed],
+        "Status": np.where(new_percent < 75, "⚠️ Below 75%", "✅ Safe")
+    })
+
+    return {
+        "academic_days": academic_days,
+        "classes_skipped": int(skipped.sum()),
+        "table": table
+    }
@@ -0,0 +1,104 @@
+"""
+The REST API driven offline with FastAPI's TestClient.
+
+    python -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from api.server import create_app  # noqa: E402
+from benchmarks import synthetic  # noqa: E402
+from core import artefacts  # noqa: E402
+from utils.schema import normalize_timetable  # noqa: E402
+
+GROUP = "Group A"
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(create_app()) as client:
+        yield client
+
+
+@pytest.fixture(scope="module")
+def codes():
+    return list(dict.fromkeys(artefacts.group_timetable(GROUP)["code"]))
+
+
+@pytest.mark.parametrize("name, build", [
+    ("attendance.xlsx", synthetic.attendance_xlsx),
+    ("attendance.pdf", synthetic.attendance_pdf)
+])
+def test_parse_upload(client, codes, name, build):
+    expected = synthetic.attendance_frame(codes=codes)
+
+    response = client.post("/attendance/parse", files={"file": (name, build(codes=codes))})
+
+    assert response.status_code == 200
+    subjects = response.json()["subjects"]
+    assert [s["code"] for s in subjects] == codes
+    assert [s["attended"] for s in subjects] == expected["attended"].tolist()
+    assert [s["total"] for s in subjects] == expected["total"].tolist()
+    assert [s["percent"] for s in subjects] == expected["percent"].tolist()
+
+
+def test_priority_upload(client, codes):
+    response = client.post(
+        "/priority/upload",
+        files={"file": ("attendance.xlsx", synthetic.attendance_xlsx(codes=codes))}
+    )
+
+    assert response.status_code == 200
+    assert {row["code"] for row in response.json()["subjects"]} == set(codes)
+
+
+def test_unsupported_upload(client):
+    response = client.post("/attendance/parse", files={"file": ("attendance.csv", b"code,total\n")})
+    assert response.status_code == 415
+
+
+def test_upload_without_attendance(client):
+    response = client.post("/attendance/parse", files={"file": ("attendance.pdf", synthetic.attendance_pdf(codes=[]))})
+    assert response.status_code == 422
+
+
+def test_attended_above_total(client):
+    response = client.post("/priority", json={
+        "subjects": [{"code": "25CSH-102", "attended": 31, "total": 30}]
+    })
+
+    assert response.status_code == 422
+    assert "attended cannot exceed total" in response.json()["detail"]
+
+
+def test_negative_counts(client):
+    response = client.post("/priority", json={
+        "subjects": [{"code": "25CSH-102", "attended": -1, "total": 30}]
+    })
+
+    assert response.status_code == 422
+
+
+def test_bunk_plan_timetable_clash(client, codes, monkeypatch):
+    # A second class in the first slot of the week
+    timetable = artefacts.group_timetable(GROUP)
+    other = next(code for code in codes if code != timetable["code"].iloc[0])
+    clash = pd.concat([timetable, timetable.iloc[[0]].assign(code=other)]).astype(object)
+    monkeypatch.setitem(artefacts.cohort(GROUP), "timetable", normalize_timetable(clash))
+
+    response = client.post("/bunk-plan", json={
+        "subjects": [{"code": code, "attended": 20, "total": 25} for code in codes],
+        "day": "2026-02-02"
+    })
+
+    assert response.status_code == 422
+    assert "two classes" in response.json()["detail"]
@@ -0,0 +1,89 @@
+"""
+utils.history_store keeps only the changes between a student's uploads,
+and the latest state follows the newest export whatever order files
+arrive in.
+"""
+
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from utils.history_store import HistoryStore  # noqa: E402
+from utils.schema import normalize_attendance  # noqa: E402
+
+STUDENT = "23BCS10001"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HistoryStore(tmp_path / "history.sqlite3")
+
+
+def _att(**counts):
+    return normalize_attendance(pd.DataFrame(
+        [(code, total, attended) for code, (attended, total) in counts.items()],
+        columns=["code", "total", "attended"]
+    ))
+
+
+def _counts(att):
+    return {code: (attended, total) for code, attended, total in zip(att["code"], att["attended"], att["total"])}
+
+
+def test_late_export_does_not_replace_newer(store):
+    store.ingest(STUDENT, _att(A=(8, 10)), b"feb-1", date(2026, 2, 1))
+    store.ingest(STUDENT, _att(A=(8, 10)), b"feb-8", date(2026, 2, 8))
+    outcome = store.ingest(STUDENT, _att(A=(9, 11)), b"feb-5", date(2026, 2, 5))
+
+    assert not outcome["latest"]
+    assert _counts(store.latest(STUDENT)) == {"A": (8, 10)}
+    assert _counts(store.latest(STUDENT, as_of=date(2026, 2, 6))) == {"A": (9, 11)}
+
+
+def test_same_day_exports_are_kept(store):
+    store.ingest(STUDENT, _att(A=(8, 10), B=(4, 5)), b"morning", datetime(2026, 2, 1, 9))
+    store.ingest(STUDENT, _att(A=(9, 11)), b"evening", datetime(2026, 2, 1, 18))
+
+    assert _counts(store.latest(STUDENT)) == {"A": (9, 11)}
+    assert _counts(store.latest(STUDENT, as_of=datetime(2026, 2, 1, 12))) == {"A": (8, 10), "B": (4, 5)}
+    assert len(store.trend(STUDENT)) == 2
+
+
+def test_duplicate_file_is_skipped(store):
+    store.ingest(STUDENT, _att(A=(8, 10)), b"same", date(2026, 2, 1))
+    outcome = store.ingest(STUDENT, _att(A=(9, 11)), b"same", date(2026, 2, 2))
+
+    assert outcome["duplicate"]
+    assert _counts(store.latest(STUDENT)) == {"A": (8, 10)}
+
+
+def test_only_changes_are_stored(store):
+    store.ingest(STUDENT, _att(A=(8, 10), B=(4, 5)), b"feb-1", date(2026, 2, 1))
+    outcome = store.ingest(STUDENT, _att(A=(9, 11), B=(4, 5)), b"feb-8", date(2026, 2, 8))
+
+    assert outcome["changed"] == 1
+    assert _counts(store.latest(STUDENT)) == {"A": (9, 11), "B": (4, 5)}
+
+
+def test_backfill_keeps_every_snapshot(store):
+    # The Feb 8 changes were stored against Feb 1 and are rewritten
+    # against the Feb 5 export slotted in between
+    snapshots = {
+        date(2026, 2, 1): {"A": (8, 10), "B": (4, 5)},
+        date(2026, 2, 8): {"A": (10, 12), "B": (4, 5)},
+        date(2026, 2, 5): {"A": (9, 11)}
+    }
+    for day, counts in snapshots.items():
+        store.ingest(STUDENT, _att(**counts), day.isoformat().encode(), day)
+
+    for day, counts in snapshots.items():
+        assert _counts(store.latest(STUDENT, as_of=day)) == counts
+
+    assert store.trend(STUDENT, "B")["B"].isna().tolist() == [False, True, False]
@@ -0,0 +1,42 @@
+"""
+The attendance PDF is parsed from its summary page only, so per-date
+detail pages that repeat course codes never add or duplicate rows.
+"""
+
+import io
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks import synthetic  # noqa: E402
+from utils import upload_jobs  # noqa: E402
+from utils.pdf_reader import attendance_pdf_to_df  # noqa: E402
+
+
+def test_detail_pages_are_ignored():
+    expected = synthetic.attendance_frame()
+
+    att = attendance_pdf_to_df(io.BytesIO(synthetic.attendance_pdf(detail_pages=2)))
+
+    assert att["code"].tolist() == expected["code"].tolist()
+    assert att["total"].tolist() == expected["total"].tolist()
+    assert att["attended"].tolist() == expected["attended"].tolist()
+
+
+def test_parse_job_reports_steps():
+    steps = []
+
+    att = attendance_pdf_to_df(
+        io.BytesIO(synthetic.attendance_pdf(detail_pages=1)),
+        on_step=lambda progress, stage: steps.append(progress)
+    )
+
+    assert len(att) == len(synthetic.attendance_frame())
+    assert steps == sorted(steps) and steps[-1] < 1
+
+    job = upload_jobs.ParseJob("key", "ATTENDANCE.PDF", synthetic.attendance_pdf(detail_pages=1))
+    assert len(job.result(timeout=60)) == len(att)
+    assert job.progress == 1.0
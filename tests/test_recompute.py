@@ -0,0 +1,97 @@
+"""
+Incremental calendar / timetable edits (core.recompute via
+artefacts.apply_change) must give the same subject totals as rebuilding
+the cohort from the edited calendar.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core import artefacts  # noqa: E402
+from core.calendar_logic import CALENDAR_PATH, build_calendar, load_calendar  # noqa: E402
+from core.registry import default_registry, entry_nbytes  # noqa: E402
+
+GROUP = "Group A"
+SETTINGS = ["SEMESTER_START", "SEMESTER_END", "HOLIDAYS", "WORKING_SATURDAYS", "MID_SEM_DAYS"]
+
+
+@pytest.fixture
+def entry():
+    artefacts.clear()
+    yield artefacts.cohort(GROUP)
+    artefacts.clear()
+
+
+def _edited(calendar, holidays=(), working_saturdays=None):
+    settings = {name: calendar[name] for name in SETTINGS}
+    settings["HOLIDAYS"] = set(settings["HOLIDAYS"]) | set(holidays)
+    settings["WORKING_SATURDAYS"] = {**settings["WORKING_SATURDAYS"], **(working_saturdays or {})}
+    return build_calendar(settings)
+
+
+def _rebuilt_totals(calendar, timetable):
+    entry = artefacts.cohort(GROUP)
+    entry["calendar"], entry["timetable"], entry["derived"] = calendar, timetable, {}
+    return dict(artefacts.subject_totals(GROUP))
+
+
+@pytest.mark.parametrize("edit", [
+    {"working_saturdays": {"2026-01-31": "Monday"}},
+    {"working_saturdays": {"2026-03-14": "Test"}},
+    {"holidays": ["2026-01-31"]},
+    {"holidays": ["2026-02-03", "2026-02-04"]}
+], ids=["follow-monday", "test-day", "holiday-on-working-saturday", "weekday-holidays"])
+def test_calendar_edit_matches_rebuild(entry, edit):
+    timetable = entry["timetable"]
+    new_calendar = _edited(entry["calendar"], **edit)
+
+    artefacts.apply_change(GROUP, calendar=new_calendar)
+    patched = dict(artefacts.subject_totals(GROUP))
+
+    assert patched == _rebuilt_totals(new_calendar, timetable)
+
+
+def test_timetable_edit_matches_rebuild(entry):
+    calendar = entry["calendar"]
+    timetable = entry["timetable"]
+
+    # Move the first Monday class to Tuesday
+    edited = timetable.copy()
+    first_monday = edited.index[edited["day"] == "Mon"][0]
+    edited.loc[first_monday, "day"] = "Tue"
+
+    artefacts.apply_change(GROUP, timetable=edited)
+    patched = dict(artefacts.subject_totals(GROUP))
+
+    assert patched == _rebuilt_totals(calendar, edited)
+
+
+def test_edited_entry_is_accounted_and_pinned(entry, monkeypatch):
+    registry = default_registry()
+    edited = entry["timetable"].copy()
+    edited.loc[edited.index[edited["day"] == "Mon"][0], "day"] = "Tue"
+    edited = edited.iloc[:-3]
+
+    artefacts.apply_change(GROUP, timetable=edited)
+
+    assert entry["nbytes"] == entry_nbytes(entry)
+    assert registry.nbytes == sum(e["nbytes"] for e in registry._entries.values())
+
+    # Loading another cohort over budget must not drop the edit
+    monkeypatch.setattr(registry, "budget_bytes", 1)
+    for group in artefacts.groups():
+        artefacts.cohort(group)
+
+    assert artefacts.cohort(GROUP) is entry
+    assert artefacts.group_timetable(GROUP) is edited
+
+
+def test_uncached_calendar_is_a_fresh_copy():
+    shared = load_calendar(CALENDAR_PATH)
+    assert load_calendar(CALENDAR_PATH, cache=False) is not shared
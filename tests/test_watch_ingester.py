@@ -0,0 +1,95 @@
+"""
+utils.watch_ingester ingests each student's exports oldest first, and a
+late export of an older state never replaces the priority results.
+"""
+
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks import synthetic  # noqa: E402
+from utils.history_store import HistoryStore  # noqa: E402
+from utils.watch_ingester import WatchIngester  # noqa: E402
+
+STUDENT = "23BCS10001"
+
+
+@pytest.fixture
+def ingester(tmp_path):
+    exports = tmp_path / "exports"
+    exports.mkdir()
+
+    ingester = WatchIngester(exports, store=HistoryStore(tmp_path / "history.sqlite3"), workers=2, settle=0)
+    yield ingester
+    ingester.close()
+
+
+def _export(ingester, name, taken_at, seed):
+    path = ingester.directory / name
+    path.write_bytes(synthetic.attendance_xlsx(seed=seed))
+    os.utime(path, (taken_at.timestamp(), taken_at.timestamp()))
+    return synthetic.attendance_frame(seed=seed)
+
+
+def _totals(att):
+    return att["total"].astype(int).tolist()
+
+
+def test_same_scan_is_ingested_oldest_first(ingester):
+    _export(ingester, f"{STUDENT}_b.xlsx", datetime(2026, 2, 1, 9), seed=1)
+    newest = _export(ingester, f"{STUDENT}_a.xlsx", datetime(2026, 2, 1, 18), seed=2)
+
+    assert ingester.scan() == 2
+    assert ingester.drain(60)
+
+    assert ingester.stats()["stale"] == 0
+    assert _totals(ingester.results[STUDENT]) == _totals(newest)
+    assert _totals(ingester.store.latest(STUDENT)) == _totals(newest)
+    assert len(ingester.store.trend(STUDENT)) == 2
+
+
+def test_late_export_is_history_only(ingester):
+    newest = _export(ingester, f"{STUDENT}_feb8.xlsx", datetime(2026, 2, 8), seed=1)
+    ingester.scan()
+    assert ingester.drain(60)
+
+    _export(ingester, f"{STUDENT}_feb5.xlsx", datetime(2026, 2, 5), seed=2)
+    ingester.scan()
+    assert ingester.drain(60)
+
+    assert ingester.stats()["stale"] == 1
+    assert _totals(ingester.results[STUDENT]) == _totals(newest)
+    assert _totals(ingester.store.latest(STUDENT)) == _totals(newest)
+
+
+def test_vanished_file_is_counted_as_failed(ingester, monkeypatch):
+    _export(ingester, f"{STUDENT}_gone.xlsx", datetime(2026, 2, 1), seed=1)
+    kept = _export(ingester, f"{STUDENT}_kept.xlsx", datetime(2026, 2, 2), seed=2)
+
+    read_bytes = Path.read_bytes
+
+    def racing_read(path):
+        # Removed by the ERP between the directory listing and the read
+        if path.name.endswith("_gone.xlsx"):
+            path.unlink()
+        return read_bytes(path)
+
+    monkeypatch.setattr(Path, "read_bytes", racing_read)
+
+    assert ingester.scan() == 1
+    assert ingester.drain(60)
+
+    stats = ingester.stats()
+    assert stats["failed"] == 1 and "_gone.xlsx" in stats["last_error"]
+    assert _totals(ingester.results[STUDENT]) == _totals(kept)
+
+    # The next scan forgets the removed file
+    ingester.scan()
+    assert [path.name for path in ingester._seen] == [f"{STUDENT}_kept.xlsx"]
@@ -1,5 +1,7 @@
 import pandas as pd
 
+from utils.schema import normalize_attendance
+
 def parse_attendance(file):
     df = pd.read_excel(file, engine="openpyxl")
 
@@ -11,4 +13,4 @@ def parse_attendance(file):
     ]].copy()
 
     clean.columns = ["code", "total", "attended", "percent"]
-    return clean
+    return normalize_attendance(clean)
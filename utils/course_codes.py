@@ -0,0 +1,97 @@
+import os
+import re
+
+import pandas as pd
+
+# ==============================
+# COURSE CODE PATTERNS
+# ==============================
+# Course codes look like <intake year><3 letters>-<number>, e.g. 25CSH-114.
+# One precompiled pattern per intake (or programme) is combined into a
+# single alternation, so a mixed-intake cohort is parsed in one pass.
+#
+# ATTENDWISE_INTAKES=24,25   intake years to recognise (default: 25)
+
+INTAKES = [
+    year.strip()
+    for year in os.environ.get("ATTENDWISE_INTAKES", "25").split(",")
+    if year.strip()
+]
+
+CODE_PATTERNS = {year: rf"{year}[A-Z]{{3}}-\d+" for year in INTAKES}
+
+
+def compile_patterns(patterns):
+    """
+    Returns (anchored, anywhere) compiled regexes matching any of
+    `patterns` (name → regex). Group 1 is the course code.
+    """
+
+    alternation = "|".join(f"(?:{p})" for p in patterns.values())
+    return re.compile(rf"^({alternation})"), re.compile(rf"({alternation})")
+
+
+_MATCH, _SEARCH = compile_patterns(CODE_PATTERNS)
+
+
+def register_pattern(name, regex):
+    """
+    Adds (or replaces) a code pattern, e.g. for another programme.
+    """
+
+    global _MATCH, _SEARCH
+
+    CODE_PATTERNS[name] = regex
+    _MATCH, _SEARCH = compile_patterns(CODE_PATTERNS)
+
+
+# ==============================
+# EXTRACTION
+# ==============================
+
+def match_code(text):
+    """
+    Course code at the start of `text` (a timetable cell), or None.
+    """
+
+    if text is None or pd.isna(text):
+        return None
+
+    match = _MATCH.match(str(text))
+    return match.group(1) if match else None
+
+
+def search_code(text):
+    """
+    First course code anywhere in `text` (e.g. a PDF line), or None.
+    """
+
+    match = _SEARCH.search(text)
+    return match.group(1) if match else None
+
+
+def find_codes(text):
+    """
+    Every course code in a text blob, in order of appearance.
+    """
+
+    return _SEARCH.findall(text)
+
+
+def extract_codes(values, anchored=True):
+    """
+    Vectorized code extraction for a Series of cells.
+    Returns an object Series aligned with `values`: the code, or None
+    for empty cells and cells without a code.
+    """
+
+    values = pd.Series(values)
+    text = values[values.notna()].astype(str)
+
+    # str.extract searches and keeps the first match; the anchored
+    # pattern starts with ^, matching match_code
+    pattern = _MATCH if anchored else _SEARCH
+    codes = text.str.extract(pattern.pattern, expand=False)
+
+    codes = codes.reindex(values.index).astype(object)
+    return codes.where(codes.notna(), None)
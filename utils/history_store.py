@@ -0,0 +1,297 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import UTC, datetime
+from datetime import time as time_type
+from pathlib import Path
+
+import pandas as pd
+
+from utils.schema import normalize_attendance
+
+# ==============================
+# ATTENDANCE HISTORY STORE
+# ==============================
+# Parsed uploads are kept in a local SQLite file so returning students
+# skip the upload and trends can be drawn across visits.
+#
+# uploads holds one row per ingested file, stamped with the time the
+# export was taken. upload_changes holds, per upload, only the subjects
+# whose counts changed since the student's previous upload in timestamp
+# order; a subject missing from an upload gets a row with NULL counts.
+# The state at any upload is the newest change per code up to it, so
+# exports can arrive in any order: an upload slotted in between two
+# others also rewrites the changes of the one after it. Several exports
+# from the same day are separate uploads; ties on the timestamp go to
+# the one ingested last.
+# An uploaded file is ingested once per student, keyed by its SHA-256.
+#
+# Timestamps are stored as UTC ISO strings; naive datetimes are taken
+# as local time and a plain date as its midnight.
+#
+# ATTENDWISE_HISTORY_DB   database path (default: data/history.sqlite3)
+
+DB_PATH = Path(os.environ.get(
+    "ATTENDWISE_HISTORY_DB",
+    Path(__file__).resolve().parent.parent / "data" / "history.sqlite3"
+))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    id          INTEGER PRIMARY KEY,
+    student     TEXT NOT NULL,
+    hash        TEXT NOT NULL,
+    taken_at    TEXT NOT NULL,
+    name        TEXT,
+    UNIQUE (student, hash)
+);
+
+CREATE INDEX IF NOT EXISTS uploads_student ON uploads (student, taken_at, id);
+
+CREATE TABLE IF NOT EXISTS upload_changes (
+    upload      INTEGER NOT NULL REFERENCES uploads (id),
+    code        TEXT NOT NULL,
+    position    INTEGER NOT NULL,
+    total       INTEGER,
+    attended    INTEGER,
+    PRIMARY KEY (upload, code)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS upload_changes_code ON upload_changes (code);
+"""
+
+# Uploads of a student up to (taken_at, id), in order
+UPLOADS_UNTIL = "u.student = ? AND (u.taken_at < ? OR (u.taken_at = ? AND u.id <= ?))"
+
+STATE_SQL = f"""
+SELECT code, total, attended
+FROM (
+    SELECT c.code, c.position, c.total, c.attended,
+           ROW_NUMBER() OVER (PARTITION BY c.code ORDER BY u.taken_at DESC, u.id DESC) AS newest
+    FROM upload_changes c
+    JOIN uploads u ON u.id = c.upload
+    WHERE {UPLOADS_UNTIL}
+)
+WHERE newest = 1 AND total IS NOT NULL
+ORDER BY position
+"""
+
+NEXT_UPLOAD_SQL = """
+SELECT id, taken_at
+FROM uploads
+WHERE student = ? AND (taken_at > ? OR (taken_at = ? AND id > ?))
+ORDER BY taken_at, id
+LIMIT 1
+"""
+
+# Sorts after every stored timestamp and id
+END = ("9999", 2 ** 63 - 1)
+
+
+def file_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _timestamp(value):
+    # Sortable UTC text for a datetime or date
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, time_type.min)
+
+    return value.astimezone(UTC).isoformat(timespec="microseconds")
+
+
+def _as_of(as_of):
+    # (taken_at, id) bound; a plain date covers the whole day
+    if as_of is None:
+        return END
+    if not isinstance(as_of, datetime):
+        as_of = datetime.combine(as_of, time_type.max)
+
+    return _timestamp(as_of), END[1]
+
+
+def _state(conn, student, bound):
+    # code -> (total, attended) as of the upload at `bound`, in upload order
+    taken_at, upload = bound
+    rows = conn.execute(STATE_SQL, (student, taken_at, taken_at, upload))
+    return {code: (total, attended) for code, total, attended in rows}
+
+
+def _changes(upload, state, previous):
+    # upload_changes rows turning `previous` into `state`
+    rows = [
+        (upload, code, position, total, attended)
+        for position, (code, (total, attended)) in enumerate(state.items())
+        if previous.get(code) != (total, attended)
+    ]
+    rows += [(upload, code, -1, None, None) for code in previous if code not in state]
+    return rows
+
+
+def _as_frame(rows):
+    return normalize_attendance(pd.DataFrame(rows, columns=["code", "total", "attended"]))
+
+
+class HistoryStore:
+    """
+    Snapshots of parsed attendance (code, total, attended) per student.
+    Connections are opened per call, so one store can be shared by
+    every session thread.
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        # Durable enough under WAL, and avoids an fsync per ingest
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def latest(self, student, as_of=None):
+        """
+        Latest attendance for `student` (as of `as_of`, a date or
+        datetime; default: all of it) in the parser's layout: code,
+        total, attended, percent. Empty if nothing is stored.
+        """
+
+        with closing(self._connect()) as conn:
+            state = _state(conn, student, _as_of(as_of))
+
+        return _as_frame([(code, total, attended) for code, (total, attended) in state.items()])
+
+    def has_file(self, student, digest):
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT 1 FROM uploads WHERE student = ? AND hash = ?", (student, digest)
+            ).fetchone()
+
+        return row is not None
+
+    def ingest(self, student, att, data, taken_at=None, name=None):
+        """
+        Stores a parsed upload (`att`, from the raw bytes `data`) as the
+        snapshot taken at `taken_at` (a datetime or date; default: now).
+        A file already ingested for this student is skipped.
+
+        Returns {"duplicate": bool, "latest": bool, "changed": rows
+        written for this upload}; latest is False when a newer snapshot
+        was already stored.
+        """
+
+        taken_at = _timestamp(taken_at or datetime.now(UTC))
+        digest = file_hash(data)
+
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO uploads (student, hash, taken_at, name) VALUES (?, ?, ?, ?)",
+                (student, digest, taken_at, name)
+            )
+
+            if not cursor.rowcount:
+                return {"duplicate": True, "latest": False, "changed": 0}
+
+            upload = cursor.lastrowid
+            following = conn.execute(NEXT_UPLOAD_SQL, (student, taken_at, taken_at, upload)).fetchone()
+
+            # Both read before this upload has rows, so they are the
+            # states on either side of it
+            previous = _state(conn, student, (taken_at, upload))
+            after = None if following is None else _state(conn, student, (following[1], following[0]))
+
+            state = {
+                code: (total, attended)
+                for code, total, attended in zip(att["code"], att["total"].astype(int), att["attended"].astype(int))
+            }
+            rows = _changes(upload, state, previous)
+            conn.executemany("INSERT INTO upload_changes VALUES (?, ?, ?, ?, ?)", rows)
+
+            if following is not None:
+                # Backfill: the next upload's changes were relative to `previous`
+                conn.execute("DELETE FROM upload_changes WHERE upload = ?", (following[0],))
+                conn.executemany("INSERT INTO upload_changes VALUES (?, ?, ?, ?, ?)", _changes(following[0], after, state))
+
+        return {"duplicate": False, "latest": following is None, "changed": len(rows)}
+
+    def trend(self, student, code=None):
+        """
+        Attendance per upload for `student` (one subject or all), as a
+        timestamp × code DataFrame of percentages, forward-filled
+        between the uploads a subject changed.
+        """
+
+        # Every upload is a row, even one that changed nothing
+        join = "c.upload = u.id" if code is None else "c.upload = u.id AND c.code = ?"
+        params = [student] if code is None else [code, student]
+        query = (
+            "SELECT u.id, u.taken_at, c.code, c.total, c.attended "
+            f"FROM uploads u LEFT JOIN upload_changes c ON {join} "
+            "WHERE u.student = ? ORDER BY u.taken_at, u.id"
+        )
+
+        with closing(self._connect()) as conn:
+            rows = pd.DataFrame(
+                conn.execute(query, params).fetchall(),
+                columns=["upload", "taken_at", "code", "total", "attended"]
+            )
+
+        uploads = rows.drop_duplicates("upload").set_index("upload")["taken_at"]
+        rows = rows.dropna(subset=["code"])
+
+        # Dropped subjects (NULL counts) are -1 while filling, then NaN
+        rows["percent"] = (rows["attended"] / rows["total"].where(rows["total"] > 0) * 100).fillna(0.0)
+        rows.loc[rows["total"].isna(), "percent"] = -1.0
+
+        trend = rows.pivot(index="upload", columns="code", values="percent").reindex(uploads.index).ffill()
+        trend = trend.where(trend >= 0)
+
+        # Uploads sharing a timestamp: the one ingested last wins
+        trend.index = pd.to_datetime(uploads.to_numpy())
+        trend = trend[~trend.index.duplicated(keep="last")]
+        trend.columns.name = "code"
+
+        return trend
+
+    def code_history(self, code, as_of=None):
+        """
+        Every student's changes to `code` up to `as_of`, oldest first,
+        for cohort views.
+        """
+
+        taken_at, _ = _as_of(as_of)
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT u.student, u.taken_at, c.total, c.attended "
+                "FROM upload_changes c JOIN uploads u ON u.id = c.upload "
+                "WHERE c.code = ? AND u.taken_at <= ? ORDER BY u.taken_at, u.id",
+                (code, taken_at)
+            ).fetchall()
+
+        return pd.DataFrame(rows, columns=["student", "taken_at", "total", "attended"])
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_store():
+    """
+    Process-wide store at DB_PATH.
+    """
+
+    global _default
+
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = HistoryStore()
+
+    return _default
@@ -2,22 +2,38 @@ import pdfplumber
 import pandas as pd
 import re
 
-def attendance_pdf_to_df(pdf_file):
+from utils.course_codes import search_code
+from utils.schema import normalize_attendance
+
+NUMBER_PATTERN = re.compile(r"\d+\.\d+|\d+")
+
+
+def attendance_pdf_to_df(pdf_file, on_step=None):
+    """
+    Attendance rows from the report's summary (first) page; later pages
+    hold per-date detail and are not read. `on_step(progress, stage)` is
+    called between the open, extract and parse steps; an exception it
+    raises stops the parse.
+    """
+
+    step = on_step or (lambda progress, stage: None)
     rows = []
 
+    step(0.1, "Opening PDF")
     with pdfplumber.open(pdf_file) as pdf:
+        step(0.3, "Reading summary page")
         text = pdf.pages[0].extract_text()
 
+    step(0.8, "Checking attendance rows")
+
     for line in text.split("\n"):
         # Match course code
-        code_match = re.search(r"(25[A-Z]{3}-\d+)", line)
-        numbers = re.findall(r"\d+\.\d+|\d+", line)
+        code = search_code(line)
+        numbers = NUMBER_PATTERN.findall(line)
 
-        if not code_match or len(numbers) < 3:
+        if not code or len(numbers) < 3:
             continue
 
-        code = code_match.group(1)
-
         # From PDF structure:
         # Eligible Delivered = second last number
         # Eligible Attended = third last number
@@ -28,7 +44,7 @@ def attendance_pdf_to_df(pdf_file):
 
         rows.append([code, total, attended, percent])
 
-    return pd.DataFrame(
+    return normalize_attendance(pd.DataFrame(
         rows,
         columns=["code", "total", "attended", "percent"]
-    )
+    ))
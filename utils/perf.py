@@ -0,0 +1,163 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import nullcontext
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+
+# ==============================
+# HOT-PATH INSTRUMENTATION
+# ==============================
+# Stage timers and counters for one Streamlit rerun.
+# Each rerun runs on its own script thread, so the current
+# rerun's measurements live in thread-local storage.
+#
+# Enable with ATTENDWISE_PERF=1 (or ?perf=1 in the app URL).
+# Set ATTENDWISE_PERF_LOG=<path> to append every rerun to a JSONL file.
+
+ENV_ENABLED = os.environ.get("ATTENDWISE_PERF", "") not in ("", "0")
+LOG_PATH = os.environ.get("ATTENDWISE_PERF_LOG")
+
+HISTORY_SIZE = 200
+
+_NULL = nullcontext()
+_local = threading.local()
+
+
+def enabled():
+    return getattr(_local, "enabled", False)
+
+
+class _Stage:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        # Nested or repeated stages with the same name accumulate
+        _local.stages[self.name] += time.perf_counter() - self.start
+        return False
+
+
+def stage(name):
+    """
+    Context manager timing a named stage of the current rerun.
+    Returns a shared no-op context when instrumentation is off.
+    """
+
+    if not getattr(_local, "enabled", False):
+        return _NULL
+    return _Stage(name)
+
+
+def timed(name):
+    """
+    Decorator form of stage().
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not getattr(_local, "enabled", False):
+                return fn(*args, **kwargs)
+            with _Stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def count(name, n=1):
+    """
+    Increments a named counter for the current rerun.
+    """
+
+    if getattr(_local, "enabled", False):
+        _local.counters[name] += n
+
+
+# ==============================
+# RERUN LIFECYCLE
+# ==============================
+
+def start_rerun(is_enabled=ENV_ENABLED):
+    """
+    Resets measurements at the top of a rerun.
+    """
+
+    _local.enabled = bool(is_enabled)
+    _local.stages = defaultdict(float)
+    _local.counters = defaultdict(int)
+    _local.started = time.perf_counter()
+
+
+def finish_rerun(history, session_id=None):
+    """
+    Closes the current rerun: appends its stage timings (seconds) to
+    `history` (a deque owned by the session) and to the JSONL log
+    if one is configured. Returns the rerun record, or None when off.
+    """
+
+    if not enabled():
+        return None
+
+    record = {
+        "ts": time.time(),
+        "session": session_id,
+        "total": time.perf_counter() - _local.started,
+        "stages": dict(_local.stages),
+        "counters": dict(_local.counters)
+    }
+    history.append(record)
+
+    if LOG_PATH:
+        with open(LOG_PATH, "a", encoding="utf-8") as log_file:
+            log_file.write(json.dumps(record) + "\n")
+
+    return record
+
+
+def new_history():
+    return deque(maxlen=HISTORY_SIZE)
+
+
+def summarize(history):
+    """
+    Per-stage table for the Performance panel:
+    last rerun wall time plus rolling p50/p95 across reruns (ms).
+    """
+
+    if not history:
+        return pd.DataFrame(columns=["Stage", "Last (ms)", "p50 (ms)", "p95 (ms)", "Reruns"])
+
+    names = ["total"] + sorted({name for record in history for name in record["stages"]})
+    last = history[-1]
+    rows = []
+
+    for name in names:
+        samples = np.array([
+            record["total"] if name == "total" else record["stages"][name]
+            for record in history
+            if name == "total" or name in record["stages"]
+        ]) * 1000
+
+        last_value = last["total"] if name == "total" else last["stages"].get(name)
+
+        rows.append({
+            "Stage": name,
+            "Last (ms)": round(last_value * 1000, 1) if last_value is not None else None,
+            "p50 (ms)": round(float(np.percentile(samples, 50)), 1),
+            "p95 (ms)": round(float(np.percentile(samples, 95)), 1),
+            "Reruns": len(samples)
+        })
+
+    return pd.DataFrame(rows)
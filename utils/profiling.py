@@ -0,0 +1,93 @@
+import cProfile
+import os
+from pathlib import Path
+
+# ==============================
+# PER-RERUN PROFILING (OPT-IN)
+# ==============================
+# Profiles one whole execution of app.py and saves it under
+# <PROFILE_DIR>/<session>_<rerun>.prof (cProfile, open with snakeviz
+# or pstats) or .html (pyinstrument, if ATTENDWISE_PROFILER=pyinstrument).
+#
+# ATTENDWISE_PROFILE=1               profile every rerun
+# ATTENDWISE_PROFILE_ALLOW_QUERY=1   also honour ?profile=1 per session (off by
+#                                    default: it lets visitors write to disk)
+# ATTENDWISE_PROFILE_DIR             output directory (default: profiles/)
+# ATTENDWISE_PROFILE_KEEP            how many recent profiles to keep (default: 20)
+
+ENV_ENABLED = os.environ.get("ATTENDWISE_PROFILE", "") not in ("", "0")
+ALLOW_QUERY = os.environ.get("ATTENDWISE_PROFILE_ALLOW_QUERY", "") not in ("", "0")
+PROFILE_DIR = Path(os.environ.get("ATTENDWISE_PROFILE_DIR", "profiles"))
+KEEP = int(os.environ.get("ATTENDWISE_PROFILE_KEEP", "20"))
+BACKEND = os.environ.get("ATTENDWISE_PROFILER", "cprofile").lower()
+
+
+def requested(query_value):
+    """
+    Whether to profile this rerun, given the ?profile= query value.
+    """
+
+    return ENV_ENABLED or (ALLOW_QUERY and query_value == "1")
+
+
+def start_profile():
+    """
+    Starts a profiler for the current script thread.
+    Falls back to cProfile when pyinstrument is not installed.
+    """
+
+    if BACKEND == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            pass
+        else:
+            profiler = Profiler()
+            profiler.start()
+            return profiler
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def stop_profile(profiler, session_id, rerun_id, profile_dir=None, keep=None):
+    """
+    Stops `profiler`, writes it to disk and rotates old profiles.
+    Returns the saved file path.
+    """
+
+    profile_dir = Path(profile_dir or PROFILE_DIR)
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    stem = f"{session_id}_{rerun_id:05d}"
+
+    if isinstance(profiler, cProfile.Profile):
+        profiler.disable()
+        path = profile_dir / f"{stem}.prof"
+        profiler.dump_stats(path)
+    else:
+        profiler.stop()
+        path = profile_dir / f"{stem}.html"
+        path.write_text(profiler.output_html(), encoding="utf-8")
+
+    rotate_profiles(profile_dir, KEEP if keep is None else keep)
+    return path
+
+
+def rotate_profiles(profile_dir, keep):
+    """
+    Deletes all but the `keep` most recent profiles in `profile_dir`.
+    """
+
+    profiles = sorted(
+        (p for p in Path(profile_dir).iterdir() if p.suffix in (".prof", ".html")),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True
+    )
+
+    for old in profiles[max(keep, 0):]:
+        try:
+            old.unlink()
+        except FileNotFoundError:
+            # Another session rotated it first
+            pass
@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+
+from utils.subject_map import CATALOGUE
+
+# ==============================
+# FRAME SCHEMAS
+# ==============================
+# Compact dtypes for the frames every engine consumes. normalize_attendance()
+# and normalize_timetable() convert them and check their invariants:
+# - attendance : code (categorical), total / attended (int16), percent (float32)
+# - timetable  : day (categorical, Mon … Sun), time (categorical), code (categorical)
+#
+# Codes share one category set, the subject catalogue's. Frames of known
+# subjects therefore concat and merge without falling back to object
+# dtype, and a groupby on code runs over integer category codes.
+# Codes missing from the catalogue are appended to the categories.
+
+COUNT_DTYPE = np.int16
+PERCENT_DTYPE = np.float32
+
+DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+DAY_DTYPE = pd.CategoricalDtype(DAYS, ordered=True)
+
+ATTENDANCE_COLUMNS = ["code", "total", "attended", "percent"]
+TIMETABLE_COLUMNS = ["day", "time", "code"]
+
+
+_KNOWN_CODES = frozenset(CATALOGUE["dtype"].categories)
+
+
+class SchemaError(ValueError):
+    pass
+
+
+def code_dtype(codes=()):
+    """
+    The shared code categories, extended by any of `codes` not in the
+    subject catalogue.
+    """
+
+    known = CATALOGUE["dtype"]
+    extra = sorted({code for code in codes if isinstance(code, str)} - _KNOWN_CODES)
+
+    return known if not extra else pd.CategoricalDtype(list(known.categories) + extra)
+
+
+def _codes(codes):
+    # Categorical over code_dtype(), built from positions instead of
+    # re-hashing every value
+    dtype = code_dtype(codes)
+    return pd.Categorical.from_codes(dtype.categories.get_indexer(codes), dtype=dtype)
+
+
+def _strip(values):
+    # Codes as stripped strings; missing values are kept
+    return np.array([str(value).strip() if pd.notna(value) else value for value in values], dtype=object)
+
+
+def _counts(values, column):
+    values = np.asarray(pd.to_numeric(values, errors="coerce"), dtype=np.float64)
+
+    if np.isnan(values).any():
+        raise SchemaError(f"{column}: missing or non-numeric counts")
+    if (values % 1 != 0).any():
+        raise SchemaError(f"{column}: counts must be whole numbers")
+    if (values < 0).any() or (values > np.iinfo(COUNT_DTYPE).max).any():
+        raise SchemaError(f"{column}: counts out of range")
+
+    return values.astype(COUNT_DTYPE)
+
+
+# ==============================
+# ATTENDANCE
+# ==============================
+
+def normalize_attendance(df):
+    """
+    Parsed attendance (code, total, attended[, percent]) in the compact
+    schema. Rows without a course code (totals or footer lines) are
+    dropped; percent is derived from the counts where missing and
+    rounded to 2 decimals (what float32 holds for values up to 100).
+
+    Raises SchemaError if a count is missing, fractional, negative or
+    out of int16 range, attended exceeds total, a percent is outside
+    0–100, or a code appears twice.
+    """
+
+    missing = [column for column in ATTENDANCE_COLUMNS[:3] if column not in df]
+    if missing:
+        raise SchemaError(f"attendance is missing columns {', '.join(missing)}")
+
+    codes = _strip(df["code"].to_numpy(dtype=object))
+    keep = pd.notna(codes) & (codes != "")
+    codes = codes[keep]
+
+    total = _counts(df["total"].to_numpy()[keep], "total")
+    attended = _counts(df["attended"].to_numpy()[keep], "attended")
+
+    if (attended > total).any():
+        raise SchemaError("attended cannot exceed total")
+
+    if len(set(codes)) != len(codes):
+        duplicated = pd.unique(codes[pd.Series(codes).duplicated().to_numpy()])
+        raise SchemaError(f"duplicate course codes {', '.join(map(str, duplicated))}")
+
+    derived = np.where(total > 0, np.round(attended / np.maximum(total, 1) * 100, 2), 0.0)
+    if "percent" in df:
+        percent = np.asarray(pd.to_numeric(df["percent"].to_numpy()[keep], errors="coerce"), dtype=np.float64)
+        percent = np.where(np.isnan(percent), derived, percent)
+    else:
+        percent = derived
+
+    if ((percent < 0) | (percent > 100)).any():
+        raise SchemaError("percent must be between 0 and 100")
+
+    return pd.DataFrame({
+        "code": _codes(codes),
+        "total": total,
+        "attended": attended,
+        "percent": np.round(percent, 2).astype(PERCENT_DTYPE)
+    })
+
+
+def empty_attendance():
+    return normalize_attendance(pd.DataFrame(columns=ATTENDANCE_COLUMNS))
+
+
+# ==============================
+# TIMETABLE
+# ==============================
+
+def normalize_timetable(df):
+    """
+    Long-form timetable (day, time, code) in the compact schema. Day
+    names are matched on their first three letters ("monday" → Mon);
+    times keep their order of first appearance.
+
+    Raises SchemaError on a missing column, an unknown day or a
+    missing code.
+    """
+
+    missing = [column for column in TIMETABLE_COLUMNS if column not in df]
+    if missing:
+        raise SchemaError(f"timetable is missing columns {', '.join(missing)}")
+
+    day = pd.Categorical(df["day"].astype(str).str.strip().str[:3].str.title(), dtype=DAY_DTYPE)
+    if pd.isna(day).any():
+        unknown = df["day"][pd.isna(day)].unique()
+        raise SchemaError(f"unknown timetable days {', '.join(map(str, unknown))}")
+
+    if df["code"].isna().any():
+        raise SchemaError("timetable rows without a course code")
+
+    time = df["time"].astype(object)
+
+    return pd.DataFrame({
+        "day": day,
+        "time": pd.Categorical(time, categories=pd.unique(time.dropna())),
+        "code": _codes(_strip(df["code"].to_numpy(dtype=object)))
+    })
@@ -1,11 +1,121 @@
-SUBJECT_MAP = {
-    "25CSH-102": "Computer Eco-System",
-    "25CSH-114": "Data Structures and Algorithms-I",
-    "25CSH-119": "Programming in Python",
-    "25CSR-121": "Project Based Learning-II",
-    "25CST-116": "Network Security",
-    "25CST-123": "English Communication-II",
-    "25DCP-151": "Soft Skills-I",
-    "25MTT-108": "Linear Algebra and Vector Calculus",
-    "25UCT-103": "Universal Human Values",
-}
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# ==============================
+# SUBJECT CATALOGUE
+# ==============================
+# Course metadata loaded from data/subjects.csv (columns: code, name, is_lab).
+# Set ATTENDWISE_SUBJECTS=<path> to use another catalogue.
+#
+# Codes missing from the catalogue are shown as-is and are treated as
+# labs only if the code itself contains "lab" (the old name-based rule).
+
+SUBJECTS_PATH = Path(os.environ.get(
+    "ATTENDWISE_SUBJECTS",
+    Path(__file__).resolve().parent.parent / "data" / "subjects.csv"
+))
+
+TRUE_VALUES = {"1", "true", "yes", "y"}
+
+
+def load_catalogue(path=SUBJECTS_PATH):
+    """
+    Reads a subject catalogue and builds its lookup indexes:
+    - codes / names : object arrays in file order
+    - is_lab        : bool array
+    - dtype         : CategoricalDtype over the codes
+    - name_of       : code → name
+    - code_of       : name → code (first code with that name)
+    - lab_of        : code → is_lab
+    Raises ValueError on duplicate codes.
+    """
+
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    df["code"] = df["code"].str.strip()
+    df["name"] = df["name"].str.strip()
+
+    duplicated = df["code"][df["code"].duplicated()]
+    if not duplicated.empty:
+        raise ValueError(f"{path}: duplicate subject codes {', '.join(duplicated.unique())}")
+
+    if "is_lab" in df:
+        is_lab = df["is_lab"].str.strip().str.lower().isin(TRUE_VALUES).to_numpy()
+    else:
+        is_lab = df["name"].str.lower().str.contains("lab", regex=False).to_numpy()
+
+    codes = df["code"].to_numpy(dtype=object)
+    names = df["name"].to_numpy(dtype=object)
+
+    code_of = {}
+    for code, name in zip(codes, names):
+        code_of.setdefault(name, code)
+
+    return {
+        "codes": codes,
+        "names": names,
+        "is_lab": is_lab,
+        "dtype": pd.CategoricalDtype(codes),
+        "name_of": dict(zip(codes, names)),
+        "code_of": code_of,
+        "lab_of": dict(zip(codes, is_lab.tolist()))
+    }
+
+
+CATALOGUE = load_catalogue()
+
+# code → name (kept for existing callers)
+SUBJECT_MAP = CATALOGUE["name_of"]
+
+
+# ==============================
+# LOOKUPS
+# ==============================
+
+def subject_name(code):
+    return SUBJECT_MAP.get(code, code)
+
+
+def subject_code(name):
+    """
+    Course code for a subject name (or the input itself, if it is
+    already a code or unknown).
+    """
+
+    return CATALOGUE["code_of"].get(name, name)
+
+
+def is_lab_subject(code):
+    lab = CATALOGUE["lab_of"].get(code)
+    return "lab" in str(code).lower() if lab is None else lab
+
+
+def subject_categories(codes):
+    """
+    Codes as a Categorical over the catalogue (unknown codes → NaN, code -1).
+    """
+
+    return pd.Categorical(pd.Series(codes, dtype=object), dtype=CATALOGUE["dtype"])
+
+
+def subject_names(codes):
+    """
+    Vectorized code → subject name lookup (unknown codes kept as-is).
+    """
+
+    codes = np.asarray(pd.Series(codes, dtype=object), dtype=object)
+    index = subject_categories(codes).codes
+    return np.where(index >= 0, CATALOGUE["names"][index], codes)
+
+
+def lab_mask(codes):
+    """
+    Vectorized is_lab_subject.
+    """
+
+    codes = np.asarray(pd.Series(codes, dtype=object), dtype=object)
+    index = subject_categories(codes).codes
+    fallback = np.array(["lab" in str(c).lower() for c in codes], dtype=bool)
+    return np.where(index >= 0, CATALOGUE["is_lab"][index], fallback)
@@ -1,26 +1,32 @@
 import pandas as pd
-import re
+
+from utils.course_codes import extract_codes, match_code
+from utils.schema import normalize_timetable
+
+DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri"]
+
 
 def extract_code(cell):
-    if pd.isna(cell):
-        return None
-    match = re.match(r"(25[A-Z]{3}-\d+)", str(cell))
-    return match.group(1) if match else None
+    return match_code(cell)
+
 
 def parse_timetable(file):
     df = pd.read_excel(file, engine="openpyxl")
 
-    days = ["Mon", "Tue", "Wed", "Thu", "Fri"]
-    schedule = []
+    days = [day for day in DAYS if day in df.columns]
+
+    # One row per (slot, day) cell, slot by slot as in the grid
+    cells = df[days].stack(future_stack=True) if days else pd.Series(dtype=object)
+    codes = extract_codes(cells.reset_index(drop=True))
+    found = codes.notna().to_numpy()
+
+    if not found.any():
+        return normalize_timetable(pd.DataFrame(columns=["day", "time", "code"]))
 
-    for _, row in df.iterrows():
-        for day in days:
-            code = extract_code(row.get(day))
-            if code:
-                schedule.append({
-                    "day": day,
-                    "time": row["Timing"],
-                    "code": code
-                })
+    slot_idx = cells.index.get_level_values(0)[found]
 
-    return pd.DataFrame(schedule)
+    return normalize_timetable(pd.DataFrame({
+        "day": cells.index.get_level_values(1)[found].to_numpy(dtype=object),
+        "time": df["Timing"].loc[slot_idx].to_numpy(dtype=object),
+        "code": codes[found].to_numpy(dtype=object)
+    }))
@@ -0,0 +1,101 @@
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.attendance_parser import parse_attendance
+from utils.pdf_reader import attendance_pdf_to_df
+
+# ==============================
+# BACKGROUND ATTENDANCE PARSING
+# ==============================
+# Uploaded attendance files are parsed on a shared worker pool so the
+# app can show progress instead of blocking the whole render.
+# A session keeps one job at a time; submitting a new file cancels
+# the one still in flight.
+
+SUPPORTED_TYPES = (".xlsx", ".pdf")
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="attendance-parse")
+
+
+def is_supported(name):
+    return name.lower().endswith(SUPPORTED_TYPES)
+
+
+def parse_attendance_bytes(name, data, on_step=None):
+    """
+    Parsed attendance (code, total, attended, percent) from an uploaded
+    or exported file's bytes; `name` picks the XLSX or PDF path.
+    `on_step` is passed on to the PDF reader.
+    """
+
+    buffer = io.BytesIO(data)
+
+    if name.lower().endswith(".xlsx"):
+        return parse_attendance(buffer)
+    return attendance_pdf_to_df(buffer, on_step=on_step)
+
+
+class ParseCancelled(Exception):
+    pass
+
+
+class ParseJob:
+    """
+    One attendance upload being parsed in the background.
+    `progress` (0 → 1, per PDF parsing step) and `stage` can be read
+    from any thread.
+    """
+
+    def __init__(self, key, name, data):
+        self.key = key
+        self.name = name
+        self.progress = 0.0
+        self.stage = "Queued"
+        self._cancelled = threading.Event()
+        self._future = _executor.submit(self._run, data)
+
+    def _step(self, progress, stage):
+        # Cancellation is checked between steps; a step already
+        # running (text extraction, or a whole workbook) finishes first.
+        if self._cancelled.is_set():
+            raise ParseCancelled(self.name)
+
+        self.progress = progress
+        self.stage = stage
+
+    def _run(self, data):
+        self._step(0.0, "Reading file")
+        att = parse_attendance_bytes(self.name, data, on_step=self._step)
+
+        self._step(1.0, "Done")
+        return att
+
+    def cancel(self):
+        self._cancelled.set()
+        self._future.cancel()
+
+    def done(self):
+        return self._future.done()
+
+    def result(self, timeout=None):
+        """
+        Parsed attendance (code, total, attended, percent).
+        Raises ParseCancelled if the job was cancelled.
+        """
+
+        if self._future.cancelled():
+            raise ParseCancelled(self.name)
+        return self._future.result(timeout)
+
+
+def submit_parse(key, name, data, previous=None):
+    """
+    Starts parsing `data` (the uploaded file's bytes) and cancels
+    `previous` if it is still running.
+    """
+
+    if previous is not None and not previous.done():
+        previous.cancel()
+
+    return ParseJob(key, name, data)
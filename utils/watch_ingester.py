@@ -0,0 +1,294 @@
+import argparse
+import heapq
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from core.priority import compute_priority
+from utils.history_store import default_store, file_hash
+from utils.subject_map import is_lab_subject
+from utils.upload_jobs import is_supported, parse_attendance_bytes
+
+# ==============================
+# WATCH-FOLDER INGESTION
+# ==============================
+# Long-running ingester for the ERP's attendance exports. The directory
+# is polled (no inotify dependency). Each new or modified file is hashed
+# and skipped if it is already stored for its student. New files are
+# parsed on a process pool (PDF extraction is CPU-bound) and written to
+# the history store (utils.history_store). The priority results of
+# that one student are then refreshed, so the cohort view stays current
+# without a nightly full recompute.
+#
+# Files are named <roll number>[_anything].pdf|.xlsx; the snapshot is
+# stamped with the file's modification time. Different students are
+# parsed in parallel, but each student's files go through one at a time,
+# oldest first. A file older than the student's stored latest snapshot
+# is kept as history only; it does not replace the priority results.
+#
+#   python -m utils.watch_ingester /srv/erp-exports
+#
+# ATTENDWISE_INGEST_WORKERS    parser processes (default: CPU count)
+# ATTENDWISE_INGEST_INTERVAL   seconds between scans (default: 2)
+
+WORKERS = int(os.environ.get("ATTENDWISE_INGEST_WORKERS", os.cpu_count() or 1))
+INTERVAL = float(os.environ.get("ATTENDWISE_INGEST_INTERVAL", "2"))
+
+# Files modified more recently than this may still be being written
+SETTLE_SECONDS = 1.0
+
+RESULT_COLUMNS = ["student", "code", "attended", "total", "percent", "needed", "priority"]
+
+
+def student_from_path(path):
+    return Path(path).stem.split("_")[0]
+
+
+def student_results(student, att):
+    """
+    Priority engine output for one student's parsed attendance, one row
+    per subject.
+    """
+
+    rows = []
+    for code, attended, total in zip(att["code"], att["attended"].astype(int), att["total"].astype(int)):
+        info = compute_priority(attended, total, is_lab_subject(code))
+        rows.append([student, code, attended, total, info["percent"], info["needed"], info["priority"]])
+
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+
+class WatchIngester:
+    """
+    Polls `directory` and ingests attendance exports into `store`.
+    scan() is one pass; run() repeats it until stopped. Counters are
+    available from stats() at any time.
+    """
+
+    def __init__(self, directory, store=None, workers=WORKERS, settle=SETTLE_SECONDS, student_of=student_from_path):
+        self.directory = Path(directory)
+        self.store = store or default_store()
+        self.settle = settle
+        self.student_of = student_of
+
+        self.results = {}
+        self.counters = {
+            "seen": 0,
+            "duplicates": 0,
+            "ingested": 0,
+            "unchanged": 0,
+            "stale": 0,
+            "failed": 0,
+            "rows_changed": 0
+        }
+        self.last_error = None
+        self.started = time.monotonic()
+
+        self._seen = {}
+        self._queues = {}
+        self._active = set()
+        self._backlog = 0
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pool = ProcessPoolExecutor(max_workers=workers)
+
+    def scan(self):
+        """
+        Queues every new or modified, settled file. Returns how many
+        were queued for parsing.
+        """
+
+        now = time.time()
+        listed = set()
+        ready = []
+
+        for path in self.directory.iterdir():
+            if not is_supported(path.name):
+                continue
+
+            # The file may be renamed or removed while we look at it
+            try:
+                if not path.is_file():
+                    continue
+                stat = path.stat()
+            except OSError as error:
+                self._record_failure(path, error)
+                continue
+
+            listed.add(path)
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if self._seen.get(path) == signature or now - stat.st_mtime < self.settle:
+                continue
+
+            self._seen[path] = signature
+            ready.append((stat.st_mtime_ns, path))
+
+        # Forget files that are gone
+        self._seen = {path: signature for path, signature in self._seen.items() if path in listed}
+
+        return sum(self._queue(path, mtime_ns) for mtime_ns, path in sorted(ready))
+
+    def _record_failure(self, path, error):
+        with self._lock:
+            self.counters["failed"] += 1
+            self.last_error = f"{Path(path).name}: {error}"
+
+    def _queue(self, path, mtime_ns):
+        try:
+            data = path.read_bytes()
+        except OSError as error:
+            self._record_failure(path, error)
+            return 0
+
+        digest = file_hash(data)
+        student = self.student_of(path)
+
+        with self._lock:
+            self.counters["seen"] += 1
+
+        if self.store.has_file(student, digest):
+            with self._lock:
+                self.counters["duplicates"] += 1
+            return 0
+
+        with self._lock:
+            heapq.heappush(self._queues.setdefault(student, []), (mtime_ns, str(path), data))
+            self._backlog += 1
+
+        self._start_next(student)
+        return 1
+
+    def _start_next(self, student):
+        # One file per student in flight, oldest modification time first
+        with self._lock:
+            queue = self._queues.get(student)
+            if student in self._active or not queue:
+                return
+
+            mtime_ns, path, data = heapq.heappop(queue)
+            if not queue:
+                del self._queues[student]
+            self._active.add(student)
+
+        path = Path(path)
+        taken_at = datetime.fromtimestamp(mtime_ns / 1e9)
+        future = self._pool.submit(parse_attendance_bytes, path.name, data)
+
+        future.add_done_callback(
+            lambda done: self._finish(done, student, path, data, taken_at)
+        )
+
+    def _finish(self, future, student, path, data, taken_at):
+        try:
+            att = future.result()
+            if att.empty:
+                raise ValueError(f"{path.name}: no attendance rows")
+
+            outcome = self.store.ingest(student, att, data, taken_at, path.name)
+            results = student_results(student, att) if outcome["latest"] else None
+        except Exception as error:
+            outcome, results = None, None
+            error_text = f"{path.name}: {error}"
+
+        with self._lock:
+            if outcome is None:
+                self.counters["failed"] += 1
+                self.last_error = error_text
+            elif outcome["duplicate"]:
+                self.counters["duplicates"] += 1
+            else:
+                self.counters["ingested"] += 1
+                self.counters["rows_changed"] += outcome["changed"]
+                if outcome["changed"] == 0:
+                    self.counters["unchanged"] += 1
+                if outcome["latest"]:
+                    self.results[student] = results
+                else:
+                    self.counters["stale"] += 1
+
+            self._active.discard(student)
+            self._backlog -= 1
+            self._idle.notify_all()
+
+        self._start_next(student)
+
+    def drain(self, timeout=None):
+        """
+        Waits until every queued file has been ingested.
+        Returns False on timeout.
+        """
+
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._backlog, timeout)
+
+    def run(self, stop=None, interval=INTERVAL):
+        stop = stop or threading.Event()
+
+        while not stop.is_set():
+            try:
+                self.scan()
+            except OSError as error:
+                # e.g. the directory itself is briefly unavailable
+                self._record_failure(self.directory, error)
+
+            stop.wait(interval)
+
+    def close(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self):
+        """
+        Counters plus backlog (files queued, not yet ingested) and
+        throughput (files ingested per second since start).
+        """
+
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            return {
+                **self.counters,
+                "backlog": self._backlog,
+                "students": len(self.results),
+                "files_per_sec": round(self.counters["ingested"] / max(elapsed, 1e-9), 2),
+                "last_error": self.last_error
+            }
+
+    def cohort_results(self):
+        """
+        Latest priority results of every student ingested so far.
+        """
+
+        with self._lock:
+            frames = list(self.results.values())
+
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=RESULT_COLUMNS)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest attendance exports dropped into a directory.")
+    parser.add_argument("directory")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--interval", type=float, default=INTERVAL)
+    args = parser.parse_args(argv)
+
+    ingester = WatchIngester(args.directory, workers=args.workers)
+    stop = threading.Event()
+    worker = threading.Thread(target=ingester.run, args=(stop, args.interval), daemon=True)
+    worker.start()
+
+    try:
+        while True:
+            time.sleep(max(args.interval, 5))
+            print(ingester.stats(), flush=True)
+    except KeyboardInterrupt:
+        stop.set()
+        worker.join()
+        ingester.close()
+
+
+if __name__ == "__main__":
+    main()